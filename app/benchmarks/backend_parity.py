@@ -0,0 +1,81 @@
+# 추론 백엔드 정확도 일치 / 지연 비교 (PyTorch 기준)
+#   python -m app.benchmarks.backend_parity [이미지 폴더] [--backends onnx,onnx-int8]
+#
+# MODEL_PATH 가 필요하다. 폴더를 생략하면 app/static/uploads 의 이미지를 사용한다.
+# 백엔드별로 이미지마다 탐지된 음식 집합을 torch 결과와 비교하고
+# (정확 일치율, 라벨 F1, 최고 신뢰도 차이) 이미지 1장당 지연을 출력한다.
+
+import argparse
+import glob
+import os
+import statistics
+import time
+
+import cv2
+
+from app.services.ai_service import FoodAIModel
+
+CONF, IOU = 0.25, 0.45
+
+
+def load_images(folder, limit):
+    paths = sorted(
+        p for ext in ("jpg", "jpeg", "png", "webp")
+        for p in glob.glob(os.path.join(folder, f"*.{ext}"))
+    )[:limit]
+    images = [cv2.imread(p, cv2.IMREAD_COLOR) for p in paths]
+    return [img for img in images if img is not None]
+
+
+def run(model, images, repeat):
+    outputs, latencies = [], []
+    for img in images:
+        model.predict_foods(img, conf=CONF, iou=IOU)   # 워밍업
+        for _ in range(repeat):
+            start = time.perf_counter()
+            foods = model.predict_foods(img, conf=CONF, iou=IOU)
+            latencies.append(time.perf_counter() - start)
+        outputs.append({f["name"]: f["confidence"] for f in foods})
+    return outputs, latencies
+
+
+def compare(reference, candidate):
+    exact, f1s, conf_diffs = 0, [], []
+    for ref, cand in zip(reference, candidate):
+        ref_set, cand_set = set(ref), set(cand)
+        exact += ref_set == cand_set
+        tp = len(ref_set & cand_set)
+        denom = len(ref_set) + len(cand_set)
+        f1s.append(1.0 if denom == 0 else 2 * tp / denom)
+        conf_diffs += [abs(ref[n] - cand[n]) for n in ref_set & cand_set]
+    return {
+        "exact_match": round(exact / len(reference), 3),
+        "label_f1": round(statistics.mean(f1s), 3),
+        "max_conf_diff": round(max(conf_diffs), 3) if conf_diffs else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("folder", nargs="?", default="./app/static/uploads")
+    parser.add_argument("--backends", default="onnx,onnx-int8")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    images = load_images(args.folder, args.limit)
+    if not images:
+        raise SystemExit(f"이미지가 없습니다: {args.folder}")
+
+    reference, ref_lat = run(FoodAIModel("torch"), images, args.repeat)
+    ref_ms = statistics.median(ref_lat) * 1000
+    print(f"images={len(images)}  torch p50={ref_ms:.1f}ms")
+
+    for backend in args.backends.split(","):
+        outputs, lat = run(FoodAIModel(backend), images, args.repeat)
+        p50 = statistics.median(lat) * 1000
+        print(f"{backend:<10} p50={p50:.1f}ms  speedup={ref_ms / p50:.2f}x  {compare(reference, outputs)}")
+
+
+if __name__ == "__main__":
+    main()
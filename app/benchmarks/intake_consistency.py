@@ -0,0 +1,167 @@
+# 동시 저장 시 누적 테이블 정합성 확인 (불일치 시 exit 1)
+#   python -m app.benchmarks.intake_consistency
+#   python -m app.benchmarks.intake_consistency --requests 200 --concurrency 40
+#
+# 임시 DB 에 유저를 시드한 뒤 /meal/analyze (+ /meal/analyze/batch) 를 동시에 호출하고
+# daily_intakes / period_intakes 가 meal_reports 를 SUM ... GROUP BY 한 값과 같은지 비교한다.
+# 탐지기는 stub 백엔드 (STUB_LATENCY_MS 만큼 지연) → 요청들이 DB 단계에서 겹치도록 함
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+FIELDS = ("meal_count", "total_calories", "carbohydrate", "protein", "fat", "sugar")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=80)
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--batch-every", type=int, default=5, help="N 번째 요청마다 배치 (0 = 사용 안 함)")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+async def fire(args, corpus):
+    import httpx
+
+    from app.main import app
+
+    ok = {"analyze": 0, "batch": 0}
+    errors = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # 앱 예외 (SQLite 잠금 대기 초과 등) 는 500 으로 받음 → 롤백된 요청은 누적에도 없어야 함
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async def one(i, client):
+        rng = random.Random(args.seed * 1000 + i)
+        # JPEG 끝(EOI) 뒤 바이트는 디코드에 영향 없고 해시만 바뀜 → 요청마다 다른 식사
+        content = rng.choice(corpus) + rng.randbytes(8)
+        async with semaphore:
+            if args.batch_every and i % args.batch_every == 0:
+                name = "batch"
+                r = await client.post(
+                    "/meal/analyze/batch",
+                    files=[("files", ("a.jpg", content, "image/jpeg")),
+                           ("files", ("b.jpg", content + b"b", "image/jpeg"))],
+                    data={"times": ["08:10", "12:40"]},
+                )
+            else:
+                name = "analyze"
+                r = await client.post(
+                    "/meal/analyze",
+                    files={"file": ("meal.jpg", content, "image/jpeg")},
+                    data={"time": "12:40"},
+                )
+        if r.status_code == 200:
+            ok[name] += 1
+        else:
+            errors[r.status_code] = errors.get(r.status_code, 0) + 1
+
+    async with app.router.lifespan_context(app):
+        clients = [
+            httpx.AsyncClient(
+                transport=transport, base_url="http://check",
+                cookies={"session_id": f"bench-user-{u}"}, timeout=httpx.Timeout(120.0),
+            )
+            for u in range(args.users)
+        ]
+        try:
+            await asyncio.gather(*(one(i, clients[i % args.users]) for i in range(args.requests)))
+        finally:
+            for client in clients:
+                await client.aclose()
+    return ok, errors
+
+
+def _same(a, b):
+    return all(abs((a[f] or 0) - (b[f] or 0)) < 1e-6 * max(1.0, abs(b[f] or 0)) for f in a)
+
+
+def check():
+    from sqlalchemy import select
+
+    from app.database.connection import SessionLocal
+    from app.database.models.intake import DailyIntake, PeriodIntake
+    from app.services.daily_intake import period_rows
+    from app.services.meal_queries import daily_totals
+
+    db = SessionLocal()
+    try:
+        expected_daily = {
+            (row.user_id, row.date): {f: getattr(row, f) for f in FIELDS}
+            for row in db.execute(daily_totals()).all()
+        }
+        actual_daily = {
+            (row.user_id, row.date): {f: getattr(row, f) for f in FIELDS}
+            for row in db.execute(select(DailyIntake)).scalars()
+        }
+        expected_period = {
+            (row["user_id"], row["period"], row["start"]):
+                {f: row[f] for f in ("day_count", *FIELDS)}
+            for row in period_rows(
+                (user_id, day, *(v[f] for f in FIELDS))
+                for (user_id, day), v in expected_daily.items()
+            )
+        }
+        actual_period = {
+            (row.user_id, row.period, row.start):
+                {f: getattr(row, f) for f in ("day_count", *FIELDS)}
+            for row in db.execute(select(PeriodIntake)).scalars()
+        }
+    finally:
+        db.close()
+
+    mismatches = []
+    for name, expected, actual in (
+        ("daily_intakes", expected_daily, actual_daily),
+        ("period_intakes", expected_period, actual_period),
+    ):
+        for key in sorted(set(expected) | set(actual)):
+            if key not in actual or key not in expected or not _same(actual[key], expected[key]):
+                mismatches.append(f"{name} {key}: 누적 {actual.get(key)} / SUM {expected.get(key)}")
+    return expected_daily, mismatches
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 앱 import 전에 환경 설정
+    tmp = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp.name}"
+    os.environ.setdefault("MODEL_BACKEND", "stub")
+    os.environ.setdefault("MODEL_LOAD", "eager")
+    os.environ.setdefault("STUB_LATENCY_MS", "20")
+
+    from app.benchmarks.loadtest import make_corpus, seed_database
+    from app.services.upload_service import UPLOAD_DIR
+
+    # 오늘 식사 3끼씩 기록된 상태에서 시작 (기존 행 갱신 + 새 행 생성 모두 확인)
+    seed_database(args.users, 0, args.seed)
+    corpus = make_corpus(4, args.seed)
+
+    before = set(os.listdir(UPLOAD_DIR))
+    try:
+        ok, errors = asyncio.run(fire(args, corpus))
+    finally:
+        for name in set(os.listdir(UPLOAD_DIR)) - before:
+            os.remove(os.path.join(UPLOAD_DIR, name))
+
+    expected, mismatches = check()
+    meals = sum(v["meal_count"] for v in expected.values())
+    print(f"[INFO] analyze {ok['analyze']}건 / batch {ok['batch']}건 성공, 오류 {errors or 0}, "
+          f"meal_reports {meals}건")
+    os.remove(tmp.name)
+
+    if mismatches:
+        print("[WARN] 누적 테이블 불일치:\n  " + "\n  ".join(mismatches))
+        sys.exit(1)
+    print("[INFO] daily_intakes / period_intakes = meal_reports 합계 (일치)")
+
+
+if __name__ == "__main__":
+    main()
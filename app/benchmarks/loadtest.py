@@ -0,0 +1,414 @@
+# 부하 테스트 (네트워크 / 모델 가중치 없이 노트북에서 실행)
+#   python -m app.benchmarks.loadtest                          # 임시 DB 시드 + 앱 프로세스 내 실행
+#   python -m app.benchmarks.loadtest --out run.json           # 결과 JSON 저장
+#   python -m app.benchmarks.loadtest --compare base.json      # 이전 결과와 비교 (회귀 시 exit 1)
+#   python -m app.benchmarks.loadtest --url http://localhost:8000 --no-seed   # 띄워 둔 서버 대상
+#
+# 구성
+#   - 탐지기: MODEL_BACKEND=stub (STUB_LATENCY_MS / STUB_LATENCY_PER_IMAGE_MS / STUB_LABELS)
+#   - 이미지: 시드 고정 합성 JPEG --images 장 (--unique-images 면 요청마다 해시가 달라 캐시 미적중)
+#   - DB: 유저 --users 명 x --months 개월 식단 기록 (하루 3끼, 항목 3개), 같은 --seed 면 같은 데이터
+#   - 부하: --concurrency 개 워커가 --duration 초 동안 --mix 비율로 엔드포인트 호출
+#   - 결과: 엔드포인트별 p50 / p95 / p99 (ms), 처리량 (req/s), 오류 수
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+DEFAULT_MIX = "analyze=1,list=3,dashboard=3,report=2"
+ENDPOINTS = ("analyze", "list", "dashboard", "report")
+MEAL_TIMES = ("08:10", "12:40", "19:05")
+REGRESSION_TOLERANCE = 0.15
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="대상 서버 (생략 시 앱을 프로세스 안에서 실행)")
+    parser.add_argument("--db", help="SQLite 파일 경로 (생략 시 임시 파일)")
+    parser.add_argument("--no-seed", action="store_true", help="DB 시드 생략 (기존 DB / 원격 서버)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument("--unique-images", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="초")
+    parser.add_argument("--warmup", type=float, default=2.0, help="집계에서 빼는 앞 구간 (초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    return parser.parse_args(argv)
+
+
+def parse_mix(raw):
+    weights = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            sys.exit(f"알 수 없는 엔드포인트: {name} (가능: {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+# -----------------------------
+# 합성 이미지 (시드 고정)
+# -----------------------------
+def make_corpus(count, seed):
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for _ in range(count):
+        h, w = int(rng.integers(720, 1200)), int(rng.integers(960, 1600))
+        img = np.full((h, w, 3), rng.integers(150, 240, 3), dtype=np.uint8)
+        for _ in range(int(rng.integers(3, 7))):
+            center = (int(rng.integers(0, w)), int(rng.integers(0, h)))
+            color = tuple(int(v) for v in rng.integers(0, 255, 3))
+            cv2.circle(img, center, int(rng.integers(60, 300)), color, -1)
+        img = cv2.add(img, rng.integers(0, 16, img.shape, dtype=np.uint8))
+        corpus.append(cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 88])[1].tobytes())
+    return corpus
+
+
+# -----------------------------
+# DB 시드
+#  - 첫 번째 유저가 앱이 조회하는 유저 (세션 쿠키 bench-user-0)
+#  - 일별 / 주별 / 월별 누적은 rebuild_daily_intake 로 한 번에 생성
+# -----------------------------
+def seed_database(users, months, seed):
+    from sqlalchemy import delete, insert, select
+
+    from app.database.connection import SessionLocal, engine
+    from app.database.migrations import init_db
+    from app.database.models.intake import DailyIntake, PeriodIntake
+    from app.database.models.job import AnalysisJobRecord
+    from app.database.models.meal import MealItem, MealReport
+    from app.database.models.user import User
+    from app.services.daily_intake import rebuild_daily_intake
+    from app.services.nutrition_service import nutrition_catalog
+    from app.services.user import apply_targets
+
+    init_db(engine)
+
+    rng = random.Random(seed)
+    foods = [(name, nutrition_catalog.get(name)) for name in nutrition_catalog.names()]
+    today = date.today()
+    days = months * 30
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        db.execute(delete(AnalysisJobRecord))
+        db.execute(delete(PeriodIntake))
+        db.execute(delete(DailyIntake))
+        db.execute(delete(MealItem))
+        db.execute(delete(MealReport))
+        db.execute(delete(User))
+        db.commit()
+
+        for i in range(users):
+            user = User(
+                session_id=f"bench-user-{i}",
+                name=f"bench{i}",
+                age=rng.randint(20, 60),
+                gender=rng.choice(("male", "female")),
+                height=rng.uniform(155, 190),
+                weight=rng.uniform(48, 95),
+                activity=rng.choice(("sedentary", "low-active", "active", "very-active")),
+                completed=True,
+            )
+            db.add(apply_targets(user))
+        db.commit()
+        user_ids = db.execute(select(User.id).order_by(User.id)).scalars().all()
+
+        next_id = 1
+        for user_id in user_ids:
+            reports, items = [], []
+            for d in range(days, -1, -1):
+                day = today - timedelta(days=d)
+                for meal_time in MEAL_TIMES:
+                    picked = rng.sample(foods, 3)
+                    totals = [0.0] * 5
+                    for position, (name, info) in enumerate(picked):
+                        values = (
+                            info.calories_kcal, info.carbohydrates_g, info.protein_g,
+                            info.fat_g, info.sugars_g,
+                        )
+                        totals = [a + b for a, b in zip(totals, values)]
+                        items.append({
+                            "meal_id": next_id, "position": position, "name": name,
+                            "confidence": round(rng.uniform(0.4, 0.95), 3),
+                            "calories": values[0], "carbohydrate": values[1],
+                            "protein": values[2], "fat": values[3], "sugar": values[4],
+                        })
+                    reports.append({
+                        "id": next_id, "user_id": user_id,
+                        "meal_date": day, "meal_time": datetime.strptime(meal_time, "%H:%M").time(),
+                        "date": day.isoformat(), "time": meal_time,
+                        "total_calories": round(totals[0], 1),
+                        "carbohydrate": round(totals[1], 1), "protein": round(totals[2], 1),
+                        "fat": round(totals[3], 1), "sugar": round(totals[4], 1),
+                        "feedback": "벤치마크용 시드 데이터", "image_url": None,
+                    })
+                    next_id += 1
+            db.execute(insert(MealReport), reports)
+            db.execute(insert(MealItem), items)
+        db.commit()
+        rebuild_daily_intake(db)
+    finally:
+        db.close()
+
+    print(
+        f"[INFO] 시드 완료: 유저 {users}명, 식단 {next_id - 1:,}건 "
+        f"({time.perf_counter() - started:.1f}s)", file=sys.stderr,
+    )
+
+
+# -----------------------------
+# 부하 생성
+# -----------------------------
+class Recorder:
+    def __init__(self, warmup_until):
+        self.warmup_until = warmup_until
+        self.latencies = {name: [] for name in ENDPOINTS}
+        self.errors = {name: {} for name in ENDPOINTS}
+        self.first = None
+        self.last = None
+
+    def record(self, name, started, status):
+        now = time.perf_counter()
+        if started < self.warmup_until:
+            return
+        self.first = started if self.first is None else min(self.first, started)
+        self.last = now if self.last is None else max(self.last, now)
+        if status >= 400 or status == 0:
+            key = str(status)
+            self.errors[name][key] = self.errors[name].get(key, 0) + 1
+        else:
+            self.latencies[name].append(now - started)
+
+
+async def collect_report_ids(client):
+    ids = []
+    cursor = None
+    while len(ids) < 500:
+        params = {"limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        r = await client.get("/meal/history", params=params)
+        if r.status_code != 200:
+            break
+        body = r.json()
+        ids += [m["id"] for m in body["meals"]]
+        cursor = body.get("next_cursor")
+        if not cursor:
+            break
+    return ids
+
+
+async def run_load(client, args, corpus, report_ids):
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    started = time.perf_counter()
+    recorder = Recorder(started + args.warmup)
+    deadline = started + args.warmup + args.duration
+
+    async def call(name, rng):
+        if name == "analyze":
+            content = rng.choice(corpus)
+            if args.unique_images:
+                # JPEG 끝(EOI) 뒤 바이트는 디코드에 영향 없고 해시만 바뀜
+                content += rng.randbytes(8)
+            return await client.post(
+                "/meal/analyze",
+                files={"file": ("meal.jpg", content, "image/jpeg")},
+                data={"time": rng.choice(MEAL_TIMES)},
+            )
+        if name == "list":
+            return await client.get("/meal/list")
+        if name == "dashboard":
+            return await client.get("/users/main/dashboard")
+        return await client.get(f"/meal/report/{rng.choice(report_ids)}")
+
+    async def worker(index):
+        rng = random.Random(args.seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            if name == "report" and not report_ids:
+                continue
+            t0 = time.perf_counter()
+            try:
+                status = (await call(name, rng)).status_code
+            except Exception as e:
+                print(f"[WARN] {name} 요청 실패: {e!r}", file=sys.stderr)
+                status = 0
+            recorder.record(name, t0, status)
+
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return recorder
+
+
+def summarize(recorder, args):
+    elapsed = (recorder.last - recorder.first) if recorder.first is not None else 0.0
+    endpoints = {}
+    all_latencies = []
+    for name in ENDPOINTS:
+        lat = recorder.latencies[name]
+        errors = sum(recorder.errors[name].values())
+        if not lat and not errors:
+            continue
+        all_latencies += lat
+        endpoints[name] = _stats(lat, errors, elapsed)
+        endpoints[name]["error_codes"] = recorder.errors[name]
+    total_errors = sum(e["errors"] for e in endpoints.values())
+    return {
+        "config": {
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": args.mix,
+            "users": args.users,
+            "months": args.months,
+            "images": args.images,
+            "unique_images": args.unique_images,
+            "seed": args.seed,
+            "stub_latency_ms": float(os.getenv("STUB_LATENCY_MS", "30")),
+            "stub_latency_per_image_ms": float(os.getenv("STUB_LATENCY_PER_IMAGE_MS", "5")),
+        },
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": endpoints,
+        "total": _stats(all_latencies, total_errors, elapsed),
+    }
+
+
+def _stats(latencies, errors, elapsed):
+    count = len(latencies)
+    if count:
+        p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+        mean = float(np.mean(latencies)) * 1000
+    else:
+        p50 = p95 = p99 = mean = 0.0
+    return {
+        "count": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(mean, 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+    }
+
+
+# -----------------------------
+# 이전 결과와 비교: p95 가 tolerance 이상 늘거나 처리량이 그만큼 줄면 회귀
+# -----------------------------
+def compare(result, baseline, tolerance):
+    regressions = []
+    changed = sorted(
+        k for k in result["config"] if result["config"][k] != baseline.get("config", {}).get(k)
+    )
+    if changed:
+        print(f"[WARN] 설정이 다른 실행과 비교합니다: {', '.join(changed)}", file=sys.stderr)
+    print(f"\n{'endpoint':<10} | {'p95 base':>9} | {'p95 now':>9} | {'rps base':>9} | {'rps now':>9}",
+          file=sys.stderr)
+    for name, now in {**result["endpoints"], "total": result["total"]}.items():
+        base = baseline["total"] if name == "total" else baseline.get("endpoints", {}).get(name)
+        if not base:
+            continue
+        print(f"{name:<10} | {base['p95_ms']:>9.1f} | {now['p95_ms']:>9.1f} | "
+              f"{base['rps']:>9.1f} | {now['rps']:>9.1f}", file=sys.stderr)
+        if base["p95_ms"] and now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} → {now['p95_ms']} ms")
+        if base["rps"] and now["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {base['rps']} → {now['rps']}")
+    return regressions
+
+
+async def run(args, corpus):
+    import httpx
+
+    cookies = {"session_id": "bench-user-0"}
+    timeout = httpx.Timeout(60.0)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, cookies=cookies, timeout=timeout) as client:
+            report_ids = await collect_report_ids(client)
+            return await run_load(client, args, corpus, report_ids)
+
+    from app.main import app
+
+    # ASGITransport 는 lifespan 을 실행하지 않으므로 직접 실행 (모델 로딩 / 종료 처리)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", cookies=cookies, timeout=timeout
+        ) as client:
+            report_ids = await collect_report_ids(client)
+            return await run_load(client, args, corpus, report_ids)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 앱 import 전에 환경 설정 (프로세스 내 실행일 때만 의미 있음)
+    if not args.url:
+        if args.db:
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+        elif not os.getenv("DATABASE_URL"):
+            tmp = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+            os.environ["DATABASE_URL"] = f"sqlite:///{tmp.name}"
+        os.environ.setdefault("MODEL_BACKEND", "stub")
+        os.environ.setdefault("MODEL_LOAD", "eager")
+
+    if not args.no_seed:
+        if args.url:
+            sys.exit("--url 대상은 서버 쪽 DB 를 시드할 수 없습니다. --no-seed 와 함께 사용하세요.")
+        seed_database(args.users, args.months, args.seed)
+
+    corpus = make_corpus(args.images, args.seed)
+
+    upload_dir = None
+    before = set()
+    if not args.url:
+        from app.services.upload_service import UPLOAD_DIR
+        upload_dir = UPLOAD_DIR
+        before = set(os.listdir(upload_dir))
+
+    try:
+        recorder = asyncio.run(run(args, corpus))
+    finally:
+        # 프로세스 내 실행에서 생긴 업로드 / 썸네일은 삭제
+        if upload_dir is not None:
+            for name in set(os.listdir(upload_dir)) - before:
+                os.remove(os.path.join(upload_dir, name))
+
+    result = summarize(recorder, args)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print("\n[WARN] 회귀:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+        print("\n[INFO] 회귀 없음", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# /meal/history 페이지네이션 벤치마크
+#   python -m app.benchmarks.meal_history
+#
+# 유저 1명의 식단 기록을 SIZES 만큼 만든 뒤 같은 깊이의 페이지를 비교한다.
+#   offset : ORDER BY ... LIMIT n OFFSET k (앞 행을 모두 건너뜀)
+#   keyset : meal_history(after=커서) (인덱스에서 바로 이어서 읽음)
+# DATABASE_URL 을 지정하지 않으면 임시 SQLite DB 를 사용한다.
+
+import os
+import tempfile
+import timeit
+from datetime import date, time, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _tmp = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}"
+
+from sqlalchemy import delete, insert, text
+
+from app.database.connection import Base, SessionLocal, engine
+from app.database.migrations import run_migrations
+from app.database.models.meal import MealReport
+from app.database.models.user import User
+from app.services.meal_queries import meal_history
+
+SIZES = [1_000, 10_000, 50_000]
+PAGE = 20
+REPEAT = 20
+
+
+def seed(db, user_id, count):
+    db.execute(delete(MealReport).where(MealReport.user_id == user_id))
+    start = date.today() - timedelta(days=count // 3 + 1)
+    rows = []
+    for i in range(count):
+        day = start + timedelta(days=i // 3)
+        t = time(7 + (i % 3) * 5, i % 60)
+        rows.append({
+            "user_id": user_id, "meal_date": day, "meal_time": t,
+            "date": day.isoformat(), "time": t.strftime("%H:%M"),
+            "total_calories": 500.0, "carbohydrate": 70.0, "protein": 20.0,
+            "fat": 15.0, "sugar": 8.0, "feedback": "피드백 " * 50,
+        })
+    db.execute(insert(MealReport), rows)
+    db.commit()
+
+
+def offset_page(db, user_id, offset):
+    stmt = (
+        meal_history(user_id, limit=PAGE)
+        .limit(PAGE)
+        .offset(offset)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def keyset_page(db, user_id, after):
+    return db.execute(meal_history(user_id, after=after, limit=PAGE)).scalars().all()
+
+
+def main():
+    import app.database.models.intake  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    db = SessionLocal()
+    user = User(session_id="bench-history", completed=True)
+    db.add(user)
+    db.commit()
+
+    print(f"{'reports':>8} | {'depth':>6} | {'offset (ms)':>11} | {'keyset (ms)':>11}")
+    for size in SIZES:
+        seed(db, user.id, size)
+        for depth in (0, size // 2, size - PAGE):
+            # depth 번째 행 바로 앞의 커서
+            after = None
+            if depth:
+                row = offset_page(db, user.id, depth - 1)[0]
+                after = (row.meal_date, row.meal_time, row.id)
+
+            assert [r.id for r in offset_page(db, user.id, depth)] == \
+                   [r.id for r in keyset_page(db, user.id, after)][:PAGE]
+
+            off = timeit.timeit(lambda: offset_page(db, user.id, depth), number=REPEAT) / REPEAT
+            key = timeit.timeit(lambda: keyset_page(db, user.id, after), number=REPEAT) / REPEAT
+            print(f"{size:>8} | {depth:>6} | {off * 1000:>11.2f} | {key * 1000:>11.2f}")
+            db.expunge_all()
+
+    if engine.dialect.name == "sqlite":
+        stmt = meal_history(user.id, after=(date.today(), time(12, 0), 1), limit=PAGE)
+        sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+        print("\nkeyset plan:")
+        with engine.connect() as conn:
+            for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql)):
+                print("  ", row[-1])
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
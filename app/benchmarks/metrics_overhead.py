@@ -0,0 +1,105 @@
+# 계측 오버헤드 벤치마크
+#   python -m app.benchmarks.metrics_overhead
+#
+#   1) Histogram.observe 1회
+#   2) StageTimer.stage 컨텍스트 1회 (perf_counter 2회 + dict + observe)
+#   3) 요청 1건당 RequestMetricsMiddleware 추가 비용 (빈 라우트를 ASGI 로 직접 호출)
+#   4) DB 쿼리 1건당 엔진 이벤트 추가 비용 (메모리 SQLite SELECT 1)
+
+import asyncio
+import timeit
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.services.metrics import (
+    Histogram, RequestMetricsMiddleware, StageTimer, instrument_engine,
+)
+
+N = 200_000
+REQUESTS = 20_000
+QUERIES = 20_000
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def bench_request(app):
+    scope = {
+        "type": "http", "method": "GET", "path": "/ping", "raw_path": b"/ping",
+        "query_string": b"", "headers": [], "root_path": "", "scheme": "http",
+        "server": ("test", 80), "client": ("test", 1), "http_version": "1.1",
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def run():
+        for _ in range(REQUESTS):
+            await app(dict(scope), receive, send)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())   # 워밍업
+        return min(
+            timeit.repeat(lambda: loop.run_until_complete(run()), number=1, repeat=3)
+        ) / REQUESTS * 1e6
+    finally:
+        loop.close()
+
+
+def make_app(instrumented):
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {}
+
+    if instrumented:
+        app.add_middleware(RequestMetricsMiddleware)
+    return app
+
+
+def bench_query(instrumented):
+    engine = create_engine("sqlite://")
+    if instrumented:
+        instrument_engine(engine, "bench")
+    with engine.connect() as conn:
+        stmt = text("SELECT 1")
+        return per_call_us(lambda: conn.execute(stmt).scalar(), QUERIES)
+
+
+def main():
+    hist = Histogram("bench_seconds", "bench", ("stage",))
+    observe = per_call_us(lambda: hist.observe(0.0123, "decode"), N)
+
+    stages = StageTimer()
+
+    def stage():
+        with stages.stage("decode"):
+            pass
+
+    stage_us = per_call_us(stage, N)
+
+    plain = bench_request(make_app(False))
+    timed = bench_request(make_app(True))
+    q_plain = bench_query(False)
+    q_timed = bench_query(True)
+
+    print(f"{'what':<28} | {'us/op':>8}")
+    print(f"{'Histogram.observe':<28} | {observe:>8.3f}")
+    print(f"{'StageTimer.stage':<28} | {stage_us:>8.3f}")
+    print(f"{'request (no middleware)':<28} | {plain:>8.2f}")
+    print(f"{'request (middleware)':<28} | {timed:>8.2f}  (+{timed - plain:.2f})")
+    print(f"{'query (no hooks)':<28} | {q_plain:>8.2f}")
+    print(f"{'query (hooks)':<28} | {q_timed:>8.2f}  (+{q_timed - q_plain:.2f})")
+    print(f"\n/meal/analyze 1건 ≈ 단계 10개 + 쿼리 ~15개 + 요청 1개 → "
+          f"약 {10 * stage_us + 15 * (q_timed - q_plain) + (timed - plain):.0f} us 추가")
+
+
+if __name__ == "__main__":
+    main()
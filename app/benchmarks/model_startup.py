@@ -0,0 +1,66 @@
+# 모델 시작 / 첫 요청 지연 측정
+#   python -m app.benchmarks.model_startup            # 워밍업 on / off 비교
+#
+# MODEL_PATH 가 필요하다. 각 모드는 새 프로세스에서 측정한다
+# (torch import / 가중치 로딩 비용이 이미 지불된 상태를 피하기 위해).
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = [
+    ("load only (no warmup)", {"MODEL_WARMUP": "false"}),
+    ("load + warmup", {"MODEL_WARMUP": "true"}),
+]
+
+CHILD = r"""
+import json, time
+t0 = time.perf_counter()
+import app.routers.meal  # 라우터 import 에 모델 로딩이 포함되지 않아야 함
+t_import = time.perf_counter() - t0
+
+import cv2, numpy as np
+from app.services.model_manager import model_manager
+
+t1 = time.perf_counter()
+model_manager.load()
+t_load = time.perf_counter() - t1
+
+img = np.random.default_rng(0).integers(0, 255, (1080, 1440, 3), dtype=np.uint8)
+lat = []
+for _ in range(5):
+    t = time.perf_counter()
+    model_manager.model.predict_batch([img], conf=0.25, iou=0.45)
+    lat.append(time.perf_counter() - t)
+
+print(json.dumps({
+    "router_import_s": round(t_import, 3),
+    "load_s": round(t_load, 3),
+    "warmup_s": model_manager.warmup_seconds and round(model_manager.warmup_seconds, 3),
+    "startup_total_s": round(time.perf_counter() - t0 - sum(lat), 3),
+    "first_request_ms": round(lat[0] * 1000, 1),
+    "steady_request_ms": round(sorted(lat[1:])[len(lat[1:]) // 2] * 1000, 1),
+}))
+"""
+
+
+def main():
+    if not os.getenv("MODEL_PATH"):
+        sys.exit("MODEL_PATH 환경 변수가 필요합니다.")
+
+    for name, env in MODES:
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD],
+            env={**os.environ, **env},
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        result["process_s"] = round(time.perf_counter() - start, 3)
+        print(f"{name:<32} {json.dumps(result)}")
+
+
+if __name__ == "__main__":
+    main()
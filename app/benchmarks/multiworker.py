@@ -0,0 +1,157 @@
+# 멀티 워커 메모리 / 처리량 벤치마크 (gunicorn.conf.py 와 같은 순서로 fork)
+#   python -m app.benchmarks.multiworker                      # 워커 1, 2, 4개 x preload on / off
+#   python -m app.benchmarks.multiworker --workers 1,2,4,8 --seconds 10
+#
+# MODEL_BACKEND=torch + MODEL_PATH 를 주면 실제 모델로 측정한다.
+# 기본값은 stub 백엔드 + STUB_WEIGHTS_MB=256 (가중치 메모리만 흉내, 추론 지연 0)
+#   → 처리량은 디코드 / 리사이즈 등 모델 외 CPU 비용 기준이 된다.
+#
+# 설정마다 새 프로세스에서
+#   preload : 마스터에서 model_manager.preload() + gc.freeze() 후 fork, 워커는 load() (워밍업만)
+#   per-worker : 마스터는 로딩하지 않고 fork, 워커마다 load()
+# 워커들이 동시에 (prepare_image + predict_batch) 를 --seconds 동안 반복한 뒤
+# /proc/self/smaps_rollup 으로 RSS / PSS / USS 를 읽는다.
+#   PSS 합계 = 마스터 포함 실제로 쓰는 메모리 (공유 페이지는 나눠서 계산)
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("MODEL_BACKEND", "stub")
+os.environ.setdefault("STUB_WEIGHTS_MB", "256")
+os.environ.setdefault("STUB_LATENCY_MS", "0")
+os.environ.setdefault("STUB_LATENCY_PER_IMAGE_MS", "0")
+os.environ.setdefault("MODEL_WARMUP", "true")
+
+
+def memory_mb():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": round(fields.get("Rss", 0), 1),
+        "pss_mb": round(fields.get("Pss", 0), 1),
+        "uss_mb": round(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0), 1),
+    }
+
+
+def sample_image():
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    img = np.full((1080, 1440, 3), 180, dtype=np.uint8)
+    for _ in range(6):
+        center = (int(rng.integers(0, 1440)), int(rng.integers(0, 1080)))
+        cv2.circle(img, center, int(rng.integers(80, 300)), tuple(int(v) for v in rng.integers(0, 255, 3)), -1)
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def worker(index, workers, start_barrier, done_barrier, seconds, content, results):
+    from app.services.image_preprocess import prepare_image
+    from app.services.model_manager import model_manager
+
+    # gunicorn.conf.py post_fork 와 동일
+    model_manager.set_threads(max(1, multiprocessing.cpu_count() // workers))
+    started = time.perf_counter()
+    model_manager.load()
+    load_seconds = time.perf_counter() - started
+
+    start_barrier.wait()
+    images = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        prepared = prepare_image(content)
+        model_manager.model.predict_batch([prepared.array], conf=0.25, iou=0.45, dedup=True)
+        prepared.release()
+        images += 1
+
+    # 모든 워커가 살아 있는 상태에서 측정해야 공유 페이지가 PSS 에 나눠 반영됨
+    done_barrier.wait()
+    results.put({"index": index, "images": images, "load_s": load_seconds, **memory_mb()})
+    done_barrier.wait()
+
+
+def run_config(workers, preload, seconds):
+    import gc
+
+    from app.services.model_manager import model_manager
+
+    master_load = 0.0
+    if preload:
+        started = time.perf_counter()
+        model_manager.preload()
+        master_load = time.perf_counter() - started
+        gc.freeze()
+
+    ctx = multiprocessing.get_context("fork")
+    start_barrier = ctx.Barrier(workers)
+    done_barrier = ctx.Barrier(workers + 1)   # 마스터도 같은 시점에 측정
+    results = ctx.Queue()
+    content = sample_image()
+
+    procs = [
+        ctx.Process(target=worker, args=(i, workers, start_barrier, done_barrier, seconds, content, results))
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    done_barrier.wait()
+    master = memory_mb()
+    done_barrier.wait()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    return {
+        "workers": workers,
+        "preload": preload,
+        "master_load_s": round(master_load, 3),
+        "worker_load_s": round(max(r["load_s"] for r in rows), 3),
+        "rss_mb_per_worker": round(sum(r["rss_mb"] for r in rows) / workers, 1),
+        "uss_mb_per_worker": round(sum(r["uss_mb"] for r in rows) / workers, 1),
+        "master_pss_mb": master["pss_mb"],
+        "pss_mb_total": round(sum(r["pss_mb"] for r in rows) + master["pss_mb"], 1),
+        "images_per_s": round(sum(r["images"] for r in rows) / seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--run", nargs=2, metavar=("WORKERS", "PRELOAD"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_config(int(args.run[0]), args.run[1] == "1", args.seconds)))
+        return
+
+    backend = os.environ["MODEL_BACKEND"]
+    print(f"backend={backend} cores={multiprocessing.cpu_count()} "
+          f"stub_weights_mb={os.environ['STUB_WEIGHTS_MB'] if backend == 'stub' else '-'}")
+    print(f"{'workers':>7} | {'mode':>10} | {'RSS/worker':>10} | {'USS/worker':>10} | "
+          f"{'PSS all':>9} | {'img/s':>7} | {'worker load (s)':>15}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        for preload in (False, True):
+            out = subprocess.run(
+                [sys.executable, "-m", "app.benchmarks.multiworker",
+                 "--seconds", str(args.seconds), "--run", str(workers), "1" if preload else "0"],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            r = json.loads(out)
+            mode = "preload" if preload else "per-worker"
+            print(f"{workers:>7} | {mode:>10} | {r['rss_mb_per_worker']:>10.1f} | "
+                  f"{r['uss_mb_per_worker']:>10.1f} | {r['pss_mb_total']:>9.1f} | "
+                  f"{r['images_per_s']:>7.1f} | {r['worker_load_s']:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# 멀티 워커 일관성 확인 (gunicorn 으로 띄운 서버 대상)
+#   python -m app.benchmarks.loadtest --db bench.sqlite3 --duration 1      # DB 시드
+#   DATABASE_URL=sqlite:///bench.sqlite3 MODEL_BACKEND=stub WEB_CONCURRENCY=4 \
+#       gunicorn -c gunicorn.conf.py app.main:app
+#   python -m app.benchmarks.multiworker_consistency --url http://127.0.0.1:8000
+#
+# 요청마다 새 연결을 열어 (keep-alive 없음) 워커가 골고루 받도록 한 뒤
+#   1) 비동기 분석 작업: 제출 → 상태 조회 / SSE 를 다른 연결로 반복 (404 / 끝나지 않은 스트림 = 실패)
+#   2) 대시보드 / 목록: 조회로 캐시를 채운 뒤 저장 → 이후 모든 조회에 저장한 식사가 보여야 함
+# 어긋난 응답이 있으면 exit 1
+
+import argparse
+import json
+import sys
+import time
+
+import httpx
+
+from app.benchmarks.loadtest import make_corpus
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--session", default="bench-user-0", help="시드된 유저 세션 쿠키")
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--reads", type=int, default=20, help="저장 전후 조회 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def request(args, method, path, **kwargs):
+    # 매번 새 연결 → gunicorn 이 아무 워커에게나 배정
+    with httpx.Client(base_url=args.url, cookies={"session_id": args.session}, timeout=60) as client:
+        return client.request(method, path, **kwargs)
+
+
+def check_jobs(args, corpus):
+    failures = []
+    for i in range(args.jobs):
+        r = request(
+            args, "POST", "/meal/analyze", params={"mode": "async"},
+            files={"file": ("meal.jpg", corpus[i % len(corpus)], "image/jpeg")},
+            data={"time": "21:00"},
+        )
+        if r.status_code != 202:
+            failures.append(f"job submit {r.status_code}")
+            continue
+        job_id = r.json()["job_id"]
+
+        # 스트림은 끝날 때까지 (제출한 워커가 아니면 DB 폴링)
+        with httpx.Client(base_url=args.url, cookies={"session_id": args.session}, timeout=60) as client:
+            with client.stream("GET", f"/meal/jobs/{job_id}/events") as s:
+                events = [line for line in s.iter_lines() if line.startswith("event:")]
+        if s.status_code != 200 or not events or events[-1] not in ("event: done", "event: failed"):
+            failures.append(f"job {job_id} events {s.status_code} {events}")
+
+        for _ in range(args.reads // 4 or 1):
+            r = request(args, "GET", f"/meal/jobs/{job_id}")
+            if r.status_code != 200 or r.json()["status"] != "done":
+                failures.append(f"job {job_id} status {r.status_code}")
+    return failures
+
+
+def check_fresh_reads(args, corpus):
+    failures = []
+    for path, count in (
+        ("/users/main/dashboard", lambda body: body["totalCalories"]),
+        ("/meal/list", len),
+    ):
+        # 저장 전 조회로 각 워커의 캐시를 채움
+        before = {json.dumps(count(request(args, "GET", path).json())) for _ in range(args.reads)}
+        r = request(
+            args, "POST", "/meal/analyze",
+            files={"file": ("meal.jpg", corpus[0], "image/jpeg")}, data={"time": "22:00"},
+        )
+        if r.status_code != 200:
+            failures.append(f"{path} save {r.status_code}")
+            continue
+        after = [count(request(args, "GET", path).json()) for _ in range(args.reads)]
+        stale = [v for v in after if json.dumps(v) in before]
+        if len(before) != 1 or len(set(map(json.dumps, after))) != 1 or stale:
+            failures.append(f"{path} before={sorted(before)} after={after}")
+    return failures
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    corpus = make_corpus(4, args.seed)
+
+    started = time.perf_counter()
+    failures = check_jobs(args, corpus) + check_fresh_reads(args, corpus)
+    print(json.dumps({
+        "jobs": args.jobs,
+        "reads": args.reads,
+        "failures": failures,
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+    }, ensure_ascii=False, indent=2))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
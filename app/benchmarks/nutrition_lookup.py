@@ -0,0 +1,38 @@
+# 영양 정보 조회 마이크로 벤치마크
+#   python -m app.benchmarks.nutrition_lookup
+#
+# 기존 경로: 라벨마다 food_nutrition.json 을 다시 열고 파싱
+# 새 경로 : NutritionCatalog.get_many (메모리 dict, mtime 확인 1회)
+
+import random
+import timeit
+
+from app.services.nutrition_service import (
+    NutritionCatalog, load_nutrition_data, NUTRITION_PATH
+)
+
+LABEL_COUNTS = [1, 3, 5, 10]
+REPEAT = 200
+
+
+def old_lookup(labels):
+    return {name: load_nutrition_data().get(name) for name in labels}
+
+
+def main():
+    catalog = NutritionCatalog(NUTRITION_PATH)
+    names = catalog.names()
+    rng = random.Random(0)
+
+    print(f"{'labels':>6} | {'old (ms)':>10} | {'new (ms)':>10} | {'speedup':>8}")
+    for n in LABEL_COUNTS:
+        labels = rng.sample(names, n)
+
+        old = timeit.timeit(lambda: old_lookup(labels), number=REPEAT) / REPEAT
+        new = timeit.timeit(lambda: catalog.get_many(labels), number=REPEAT) / REPEAT
+
+        print(f"{n:>6} | {old * 1000:>10.3f} | {new * 1000:>10.4f} | {old / new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
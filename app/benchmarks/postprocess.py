@@ -0,0 +1,136 @@
+# 탐지 후처리 + 영양 합산 마이크로 벤치마크
+#   python -m app.benchmarks.postprocess
+#
+# 기존 경로: 박스마다 int(box.cls[0]) / float(box.conf[0]) → dict 로 중복 제거
+#            → 라벨마다 카탈로그 조회 후 스칼라 누적
+# 새 경로 : cls / conf 배열 1회 변환 → dedup_max_confidence
+#            → NutritionCatalog.nutrition_for_classes (gather + dot)
+# torch 가 있으면 tensor 로, 없으면 numpy 배열로 박스를 흉내냄
+#
+# 중복 제거만 따로: 파이썬 루프 vs lexsort (dedup_max_confidence 는 개수로 둘 중 선택)
+
+import random
+import timeit
+
+import numpy as np
+
+from app.services import ai_service
+from app.services.ai_service import dedup_max_confidence
+from app.services.nutrition_service import NutritionCatalog, NUTRITION_PATH
+
+BOX_COUNTS = [5, 50, 300]
+DEDUP_BOX_COUNTS = [1, 3, 5, 10, 20, 40, 50, 100, 300]
+REPEAT = 500
+SERVING = 1.5
+
+try:
+    import torch
+
+    def _tensor(values, dtype):
+        return torch.tensor(values, dtype=torch.float32)
+except ImportError:
+    torch = None
+
+    def _tensor(values, dtype):
+        return np.asarray(values, dtype=dtype)
+
+
+class _Box:
+    def __init__(self, cls_id, conf):
+        self.cls = _tensor([cls_id], np.float32)
+        self.conf = _tensor([conf], np.float32)
+
+
+class _Boxes(list):
+    def __init__(self, cls_ids, confs):
+        super().__init__(_Box(c, f) for c, f in zip(cls_ids, confs))
+        self.cls = _tensor(cls_ids, np.float32)
+        self.conf = _tensor(confs, np.float32)
+
+
+def _to_numpy(t):
+    return t.cpu().numpy() if torch is not None else t
+
+
+def old_path(boxes, names, catalog):
+    dedup = {}
+    for box in boxes:
+        name = names[int(box.cls[0])]
+        conf = float(box.conf[0])
+        if name not in dedup or conf > dedup[name]:
+            dedup[name] = conf
+
+    totals = [0.0] * 5
+    infos = catalog.get_many(dedup)
+    for name in dedup:
+        info = infos.get(name)
+        if not info:
+            continue
+        totals[0] += info.calories_kcal * SERVING
+        totals[1] += info.carbohydrates_g * SERVING
+        totals[2] += info.protein_g * SERVING
+        totals[3] += info.fat_g * SERVING
+        totals[4] += info.sugars_g * SERVING
+    return totals
+
+
+def new_path(boxes, names, catalog):
+    cls_ids = _to_numpy(boxes.cls).astype(np.int64)
+    confs = _to_numpy(boxes.conf).astype(np.float32)
+    cls_ids, confs = dedup_max_confidence(cls_ids, confs)
+    _, totals, _ = catalog.nutrition_for_classes(cls_ids, names, SERVING)
+    return totals.tolist()
+
+
+def dedup_table(rng):
+    # 임계값을 바꿔 가며 같은 함수로 두 경로를 강제
+    def timed(cls_ids, confs, threshold):
+        ai_service.DEDUP_VECTORIZE_MIN_BOXES = threshold
+        return timeit.timeit(lambda: dedup_max_confidence(cls_ids, confs), number=REPEAT * 4) / (REPEAT * 4)
+
+    default = ai_service.DEDUP_VECTORIZE_MIN_BOXES
+    print(f"\ndedup_max_confidence (임계값 {default})")
+    print(f"{'boxes':>6} | {'loop (us)':>10} | {'numpy (us)':>10} | {'chosen':>7}")
+    try:
+        for n in DEDUP_BOX_COUNTS:
+            cls_ids = np.asarray([rng.randrange(40) for _ in range(n)], dtype=np.int64)
+            confs = np.asarray([rng.random() for _ in range(n)], dtype=np.float32)
+
+            ai_service.DEDUP_VECTORIZE_MIN_BOXES = n + 1
+            loop_result = dedup_max_confidence(cls_ids, confs)
+            ai_service.DEDUP_VECTORIZE_MIN_BOXES = 0
+            numpy_result = dedup_max_confidence(cls_ids, confs)
+            assert all((a == b).all() for a, b in zip(loop_result, numpy_result))
+
+            loop = timed(cls_ids, confs, n + 1)
+            vectorized = timed(cls_ids, confs, 0)
+            chosen = "loop" if n < default else "numpy"
+            print(f"{n:>6} | {loop * 1e6:>10.2f} | {vectorized * 1e6:>10.2f} | {chosen:>7}")
+    finally:
+        ai_service.DEDUP_VECTORIZE_MIN_BOXES = default
+
+
+def main():
+    catalog = NutritionCatalog(NUTRITION_PATH)
+    names = dict(enumerate(catalog.names()))
+    rng = random.Random(0)
+    print(f"boxes: {'torch tensor' if torch is not None else 'numpy (torch 없음)'}")
+
+    print(f"{'boxes':>6} | {'old (ms)':>10} | {'new (ms)':>10} | {'speedup':>8}")
+    for n in BOX_COUNTS:
+        cls_ids = [rng.randrange(len(names)) for _ in range(n)]
+        confs = [rng.random() for _ in range(n)]
+        boxes = _Boxes(cls_ids, confs)
+
+        assert np.allclose(old_path(boxes, names, catalog), new_path(boxes, names, catalog))
+
+        old = timeit.timeit(lambda: old_path(boxes, names, catalog), number=REPEAT) / REPEAT
+        new = timeit.timeit(lambda: new_path(boxes, names, catalog), number=REPEAT) / REPEAT
+
+        print(f"{n:>6} | {old * 1000:>10.4f} | {new * 1000:>10.4f} | {old / new:>7.1f}x")
+
+    dedup_table(rng)
+
+
+if __name__ == "__main__":
+    main()
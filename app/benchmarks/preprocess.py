@@ -0,0 +1,73 @@
+# 이미지 전처리 벤치마크 (원본 디코드 vs 축소 디코드)
+#   python -m app.benchmarks.preprocess
+#
+# 크기별 합성 JPEG 으로 decode(+predict) 지연과 프로세스 최대 RSS 를 비교한다.
+# RSS 는 모드마다 새 프로세스에서 측정한다. MODEL_PATH 가 있으면 추론까지 포함한다.
+
+import json
+import os
+import subprocess
+import sys
+
+SIZES = [(1280, 960), (3024, 4032), (4000, 3000)]   # 마지막 두 개는 12MP 폰 사진
+REPEAT = 10
+
+CHILD = r"""
+import io, json, os, resource, sys, time
+import cv2, numpy as np
+
+mode, w, h, repeat = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+rng = np.random.default_rng(0)
+# 노이즈보다 실제 사진에 가까운 부드러운 이미지
+small = rng.integers(0, 255, (h // 16, w // 16, 3), dtype=np.uint8)
+img = cv2.resize(small, (w, h), interpolation=cv2.INTER_CUBIC)
+data = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+del img, small
+
+from app.services.image_preprocess import prepare_image
+
+model = None
+if os.getenv("MODEL_PATH"):
+    from app.services.ai_service import FoodAIModel
+    model = FoodAIModel()
+
+base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+lat = []
+for _ in range(repeat):
+    t = time.perf_counter()
+    if mode == "full":
+        arr = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        shape = arr.shape
+    else:
+        prepared = prepare_image(data)
+        arr, shape = prepared.array, prepared.array.shape
+    if model is not None:
+        model.predict_batch([arr], conf=0.25, iou=0.45)
+    if mode != "full":
+        prepared.release()
+    lat.append(time.perf_counter() - t)
+
+lat.sort()
+print(json.dumps({
+    "decoded_shape": list(shape),
+    "p50_ms": round(lat[len(lat) // 2] * 1000, 2),
+    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024, 1),
+}))
+"""
+
+
+def main():
+    stage = "decode+predict" if os.getenv("MODEL_PATH") else "decode"
+    print(f"stage={stage}, repeat={REPEAT}")
+    for w, h in SIZES:
+        for mode in ("full", "reduced"):
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD, mode, str(w), str(h), str(REPEAT)],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            print(f"{w}x{h:<6} {mode:<8} {json.dumps(json.loads(out))}")
+
+
+if __name__ == "__main__":
+    main()
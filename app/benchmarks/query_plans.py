@@ -0,0 +1,93 @@
+# 핫 쿼리 실행 계획 확인 (인덱스 사용 여부)
+#   python -m app.benchmarks.query_plans
+#
+# DATABASE_URL 을 지정하지 않으면 임시 SQLite DB 에 데이터를 만들어 확인한다.
+# PostgreSQL 이면 EXPLAIN, SQLite 면 EXPLAIN QUERY PLAN 결과를 출력한다.
+
+import os
+import random
+import tempfile
+from datetime import date, time, timedelta
+
+if not os.getenv("DATABASE_URL"):
+    _tmp = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}"
+
+from sqlalchemy import select, text
+
+from app.database.connection import Base, SessionLocal, engine
+from app.database.migrations import run_migrations
+from app.database.models.intake import DailyIntake
+from app.database.models.meal import MealReport
+from app.database.models.user import User
+from app.services.meal_queries import meals_for_day
+
+USERS = 20
+DAYS = 90
+MEALS_PER_DAY = 3
+
+
+def seed(db):
+    if db.query(MealReport).first():
+        return
+    rng = random.Random(0)
+    users = [User(session_id=f"bench-{i}", completed=True) for i in range(USERS)]
+    db.add_all(users)
+    db.flush()
+
+    start = date.today() - timedelta(days=DAYS)
+    reports = []
+    for u in users:
+        for d in range(DAYS):
+            day = start + timedelta(days=d)
+            for m in range(MEALS_PER_DAY):
+                t = time(7 + m * 5, rng.randint(0, 59))
+                reports.append(MealReport(
+                    user_id=u.id, meal_date=day, meal_time=t,
+                    date=day.isoformat(), time=t.strftime("%H:%M"),
+                    total_calories=500.0, carbohydrate=70.0,
+                    protein=20.0, fat=15.0, sugar=8.0,
+                ))
+    db.add_all(reports)
+    db.commit()
+
+
+def explain(conn, stmt):
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    return [" | ".join(str(c) for c in row) for row in conn.execute(text(prefix + sql))]
+
+
+def main():
+    import app.database.models.intake  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    db = SessionLocal()
+    seed(db)
+    user_id = db.query(User.id).first()[0]
+    db.close()
+
+    today = date.today()
+    queries = {
+        "/meal/list (meals_for_day)": meals_for_day(user_id, today),
+        "dashboard / analyze (daily_intakes)": select(DailyIntake).where(
+            DailyIntake.user_id == user_id, DailyIntake.date == today.isoformat()
+        ),
+    }
+
+    with engine.connect() as conn:
+        for name, stmt in queries.items():
+            plan = explain(conn, stmt)
+            uses_index = any(
+                ("INDEX" in line.upper() or "Index" in line) and "SCAN TABLE" not in line.upper()
+                for line in plan
+            )
+            print(f"\n[{name}] index={'YES' if uses_index else 'NO'}")
+            for line in plan:
+                print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
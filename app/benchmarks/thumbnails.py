@@ -0,0 +1,114 @@
+# 목록 화면 이미지 벤치마크 (원본 vs 썸네일)
+#   python -m app.benchmarks.thumbnails
+#
+# 휴대폰 사진 크기(4032x3024) JPEG 을 COUNT 장 만들어 업로드 폴더에 저장하고
+#   1) 업로드 1장당 파생 이미지(THUMBNAIL_SIZES) 생성 시간
+#   2) 목록 화면 1번 로딩 시 전송 바이트 / 시간 (원본 URL vs 썸네일 URL)
+#   3) 재방문 시 (If-None-Match) 304 비율
+# 을 비교한다. 벤치마크가 만든 파일은 끝나면 삭제한다.
+
+import hashlib
+import os
+import time
+
+import cv2
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.image_derivatives import (
+    LIST_IMAGE_SIZE, THUMBNAIL_FORMAT, THUMBNAIL_SIZES,
+    create_derivatives, derivative_path, derivative_url,
+)
+from app.services.static_files import ImmutableStaticFiles
+from app.services.upload_service import UPLOAD_DIR, UPLOAD_URL_PREFIX
+
+COUNT = 12
+SIZE = (3024, 4032)
+
+
+def fake_photo(seed):
+    # 완전 노이즈는 압축이 안 돼 비현실적이므로 그라디언트 + 도형 + 약한 노이즈
+    rng = np.random.default_rng(seed)
+    h, w = SIZE
+    y, x = np.mgrid[0:h, 0:w].astype(np.float32)
+    img = np.empty((h, w, 3), np.uint8)
+    for c in range(3):
+        a, b = rng.uniform(0.02, 0.08, 2)
+        img[..., c] = (127 + 100 * np.sin(x * a / 10 + c) * np.cos(y * b / 10)).astype(np.uint8)
+    for _ in range(20):
+        center = (int(rng.integers(0, w)), int(rng.integers(0, h)))
+        color = tuple(int(v) for v in rng.integers(0, 255, 3))
+        cv2.circle(img, center, int(rng.integers(100, 600)), color, -1)
+    img = cv2.add(img, rng.integers(0, 12, img.shape, dtype=np.uint8))
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 92])[1].tobytes()
+
+
+def fetch_all(client, urls, etags=None):
+    total = 0
+    codes = []
+    started = time.perf_counter()
+    for url in urls:
+        headers = {"If-None-Match": etags[url]} if etags else {}
+        r = client.get(url, headers=headers)
+        total += len(r.content)
+        codes.append(r.status_code)
+    return total, time.perf_counter() - started, codes
+
+
+def main():
+    created = []
+    originals = []
+    gen_times = []
+    try:
+        for i in range(COUNT):
+            content = fake_photo(i)
+            sha = hashlib.sha256(content).hexdigest()
+            path = os.path.join(UPLOAD_DIR, f"{sha}.jpg")
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(content)
+                created.append(path)
+            for size in THUMBNAIL_SIZES:
+                if not os.path.exists(derivative_path(sha, size)):
+                    created.append(derivative_path(sha, size))
+
+            started = time.perf_counter()
+            create_derivatives(sha, content)
+            gen_times.append(time.perf_counter() - started)
+            originals.append(f"{UPLOAD_URL_PREFIX}/{sha}.jpg")
+
+        app = FastAPI()
+        app.mount("/static", ImmutableStaticFiles(directory="app/static"), name="static")
+        client = TestClient(app)
+        thumbs = [derivative_url(u, LIST_IMAGE_SIZE) for u in originals]
+
+        print(f"images: {COUNT} x {SIZE[1]}x{SIZE[0]} JPEG, derivatives: {THUMBNAIL_SIZES} ({THUMBNAIL_FORMAT})")
+        print(f"derivative generation: {np.mean(gen_times) * 1000:.1f} ms/upload "
+              f"(p95 {np.percentile(gen_times, 95) * 1000:.1f} ms)")
+
+        for size in THUMBNAIL_SIZES:
+            urls = [derivative_url(u, size) for u in originals]
+            avg = np.mean([os.path.getsize(os.path.join("app", u.lstrip("/"))) for u in urls])
+            print(f"  {size:>8}: {avg / 1024:8.1f} KiB avg")
+        avg = np.mean([os.path.getsize(os.path.join("app", u.lstrip("/"))) for u in originals])
+        print(f"  {'original':>8}: {avg / 1024:8.1f} KiB avg")
+
+        print(f"\n{'list screen':>12} | {'bytes':>12} | {'time (ms)':>9}")
+        for label, urls in (("original", originals), (LIST_IMAGE_SIZE, thumbs)):
+            fetch_all(client, urls)   # 워밍업 (OS 페이지 캐시)
+            size, seconds, _ = fetch_all(client, urls)
+            print(f"{label:>12} | {size:>12,} | {seconds * 1000:>9.1f}")
+
+        etags = {u: client.get(u).headers["etag"] for u in thumbs}
+        size, seconds, codes = fetch_all(client, thumbs, etags)
+        print(f"{'revisit':>12} | {size:>12,} | {seconds * 1000:>9.1f}  "
+              f"({codes.count(304)}/{len(codes)} x 304)")
+    finally:
+        for path in created:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
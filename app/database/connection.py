@@ -1,14 +1,146 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from dotenv import load_dotenv
 import os
+import threading
+import time
+
+from app.services.metrics import instrument_engine
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# -----------------------------
+# 커넥션 풀 설정
+# -----------------------------
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# SQLite: 다른 커넥션 / 워커의 쓰기 잠금을 기다리는 최대 시간 (드라이버 기본값 5초)
+#   부하가 몰리면 5초를 넘겨 "database is locked" 로 실패하므로 늘려 둠
+DB_SQLITE_TIMEOUT = float(os.getenv("DB_SQLITE_TIMEOUT", "30"))
+
+# async 드라이버 (미지정 시 DATABASE_URL 에서 유추)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url):
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+
+# -----------------------------
+# 풀 사용량 / 체크아웃 대기 시간 측정
+# -----------------------------
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def on_checkout(self, *args):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self, pool):
+        return {
+            "pool_size": getattr(pool, "size", lambda: None)(),
+            "overflow": getattr(pool, "overflow", lambda: None)(),
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "wait_seconds": round(self.wait_total, 6),
+            "timeouts": self.timeouts,
+        }
+
+
+def _timed_pool(base):
+    # 풀에서 커넥션을 꺼낼 때까지 기다린 시간을 기록
+    class TimedPool(base):
+        metrics = None
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except Exception:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            self.metrics.record_wait(time.perf_counter() - start)
+            return conn
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def _engine_options(url, pool_base):
+    # 메모리 sqlite 는 단일 커넥션 풀이라 크기 설정이 의미 없음
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+        return {}
+
+    metrics = PoolMetrics()
+    poolclass = _timed_pool(pool_base)
+    poolclass.metrics = metrics
+    options = {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"timeout": DB_SQLITE_TIMEOUT}
+    return options
+
+
+def _attach_metrics(sync_engine):
+    metrics = getattr(sync_engine.pool, "metrics", None)
+    if metrics is not None:
+        event.listen(sync_engine.pool, "checkout", metrics.on_checkout)
+        event.listen(sync_engine.pool, "checkin", metrics.on_checkin)
+
+
+# -----------------------------
+# 동기 엔진 (스크립트 / 동기 라우트용)
+# -----------------------------
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, QueuePool))
+_attach_metrics(engine)
+instrument_engine(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -19,3 +151,48 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# -----------------------------
+# 비동기 엔진 (async 라우트용, 첫 사용 시 생성)
+# -----------------------------
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            **_engine_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool),
+        )
+        _attach_metrics(_async_engine.sync_engine)
+        instrument_engine(_async_engine.sync_engine, "async")
+        _async_sessionmaker = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _async_sessionmaker()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_metrics():
+    result = {}
+    for name, eng in (("sync", engine), ("async", _async_engine and _async_engine.sync_engine)):
+        if eng is None:
+            continue
+        metrics = getattr(eng.pool, "metrics", None)
+        if metrics is not None:
+            result[name] = metrics.snapshot(eng.pool)
+    return result
@@ -0,0 +1,274 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import bindparam, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.database.connection import Base, engine
+
+# -----------------------------
+# 간단한 스키마 마이그레이션
+#  - create_all 은 새 테이블만 만들고 기존 테이블 컬럼은 바꾸지 않음
+#  - 적용된 마이그레이션 id 는 schema_migrations 테이블에 기록
+#   python -m app.database.migrations
+# -----------------------------
+
+
+def _columns(conn, table):
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _add_columns(conn, table, columns):
+    existing = _columns(conn, table)
+    for name, ddl in columns:
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+# 0001: 유저 권장량 컬럼 추가 + 기존 프로필 백필
+def _0001_user_targets(conn):
+    from app.database.models.user import User
+    from app.services.user import apply_targets
+
+    _add_columns(conn, "users", [
+        ("profile_version", "INTEGER NOT NULL DEFAULT 0"),
+        ("bmr", "FLOAT"),
+        ("bmi", "FLOAT"),
+        ("bmi_status", "VARCHAR"),
+        ("target_calories", "FLOAT"),
+        ("target_carbohydrates", "FLOAT"),
+        ("target_protein", "FLOAT"),
+        ("target_fat", "FLOAT"),
+        ("target_sugars", "FLOAT"),
+    ])
+
+    db = Session(bind=conn)
+    for user in db.query(User).filter(User.target_calories.is_(None)):
+        apply_targets(user)
+    db.flush()
+
+
+# 0002: MealReport 에 user_id / 날짜·시간 타입 컬럼 + 복합 인덱스
+def _0002_meal_report_index(conn):
+    from app.database.models.meal import MealReport
+    from app.database.models.user import User
+
+    _add_columns(conn, "meal_reports", [
+        ("user_id", "INTEGER REFERENCES users (id)"),
+        ("meal_date", "DATE"),
+        ("meal_time", "TIME"),
+    ])
+
+    # 기존 리포트는 단일 유저 시절 데이터 → 첫 완료 유저에게 귀속
+    owner = conn.execute(
+        select(User.id).where(User.completed == True).order_by(User.id).limit(1)
+    ).scalar()
+
+    t = MealReport.__table__
+    rows = conn.execute(
+        select(t.c.id, t.c.date, t.c.time).where(t.c.meal_date.is_(None))
+    ).all()
+    params = []
+    for row_id, day, hhmm in rows:
+        try:
+            meal_date = datetime.strptime(day, "%Y-%m-%d").date()
+            meal_time = datetime.strptime(hhmm, "%H:%M").time()
+        except (TypeError, ValueError):
+            print(f"[WARN] meal_reports.id={row_id} 날짜/시간 형식 오류: {day} {hhmm}")
+            continue
+        params.append({"b_id": row_id, "b_date": meal_date, "b_time": meal_time, "b_user": owner})
+
+    if params:
+        conn.execute(
+            t.update()
+            .where(t.c.id == bindparam("b_id"))
+            .values(meal_date=bindparam("b_date"), meal_time=bindparam("b_time"),
+                    user_id=bindparam("b_user")),
+            params,
+        )
+
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_meal_reports_user_date_time "
+        "ON meal_reports (user_id, meal_date, meal_time)"
+    ))
+
+
+def _json(value):
+    if value is None:
+        return None
+    return json.loads(value) if isinstance(value, str) else value
+
+
+# 0003: macros / items JSON → 숫자 컬럼 + meal_items 테이블
+def _0003_meal_macro_columns(conn):
+    from app.database.models.meal import MealItem, MealReport
+    from app.services.nutrition_service import nutrition_catalog
+
+    _add_columns(conn, "meal_reports", [
+        ("carbohydrate", "FLOAT NOT NULL DEFAULT 0"),
+        ("protein", "FLOAT NOT NULL DEFAULT 0"),
+        ("fat", "FLOAT NOT NULL DEFAULT 0"),
+        ("sugar", "FLOAT NOT NULL DEFAULT 0"),
+    ])
+    MealItem.__table__.create(conn, checkfirst=True)
+
+    legacy = {"items", "macros"} & _columns(conn, "meal_reports")
+    if legacy != {"items", "macros"}:
+        return
+
+    t = MealReport.__table__
+    report_params, item_rows = [], []
+    for row_id, items, macros in conn.execute(
+        text("SELECT id, items, macros FROM meal_reports")
+    ):
+        macros = _json(macros) or {}
+        report_params.append({
+            "b_id": row_id,
+            **{f"b_{key}": float(macros.get(key, {}).get("value", 0) or 0)
+               for key in ("carbohydrate", "protein", "fat", "sugar")},
+        })
+
+        # 예전 항목에는 칼로리만 있으므로 카탈로그 비율로 나머지 영양소 추정
+        for position, item in enumerate(_json(items) or []):
+            calories = float(item.get("calories", 0) or 0)
+            info = nutrition_catalog.get(item.get("name"))
+            factor = calories / info.calories_kcal if info and info.calories_kcal else 0.0
+            item_rows.append({
+                "meal_id": row_id,
+                "position": position,
+                "name": item.get("name", ""),
+                "confidence": None,
+                "calories": calories,
+                "carbohydrate": round(info.carbohydrates_g * factor, 1) if info else 0.0,
+                "protein": round(info.protein_g * factor, 1) if info else 0.0,
+                "fat": round(info.fat_g * factor, 1) if info else 0.0,
+                "sugar": round(info.sugars_g * factor, 1) if info else 0.0,
+            })
+
+    if report_params:
+        conn.execute(
+            t.update()
+            .where(t.c.id == bindparam("b_id"))
+            .values(**{key: bindparam(f"b_{key}")
+                       for key in ("carbohydrate", "protein", "fat", "sugar")}),
+            report_params,
+        )
+    if item_rows:
+        conn.execute(MealItem.__table__.insert(), item_rows)
+
+    conn.execute(text("ALTER TABLE meal_reports DROP COLUMN items"))
+    conn.execute(text("ALTER TABLE meal_reports DROP COLUMN macros"))
+
+
+# 0004: 키셋 페이지네이션용으로 인덱스 끝에 id 추가
+#   (SQLite 는 rowid 가 암묵적으로 포함되지만 PostgreSQL 은 아님)
+def _0004_meal_report_history_index(conn):
+    conn.execute(text("DROP INDEX IF EXISTS ix_meal_reports_user_date_time"))
+    conn.execute(text(
+        "CREATE INDEX ix_meal_reports_user_date_time "
+        "ON meal_reports (user_id, meal_date, meal_time, id)"
+    ))
+
+
+# daily_intakes → period_intakes (period_intakes 가 비어 있을 때만)
+def _backfill_period_intakes(conn):
+    from app.services.daily_intake import PERIOD_COLUMNS, period_rows
+
+    if conn.execute(text("SELECT 1 FROM period_intakes LIMIT 1")).first():
+        return
+
+    rows = period_rows(conn.execute(text(
+        f"SELECT user_id, date, {', '.join(PERIOD_COLUMNS)} FROM daily_intakes"
+    )))
+    if rows:
+        names = ["user_id", "period", "start", "day_count", *PERIOD_COLUMNS]
+        conn.execute(text(
+            f"INSERT INTO period_intakes ({', '.join(names)}) "
+            f"VALUES ({', '.join(':' + n for n in names)})"
+        ), rows)
+
+
+# 0004a: 기존 meal_reports 로부터 일 / 주 / 월 누적을 다시 계산
+#   0005 보다 먼저 실행돼야 0005 가 빈 daily_intakes 로 백필하지 않음
+#   0005 가 이미 적용된 DB 도 누락분이 있을 수 있으므로 비어 있는지와 상관없이 재계산
+def _0004a_daily_intakes_backfill(conn):
+    from app.database.models.intake import DailyIntake, PeriodIntake
+    from app.services.daily_intake import insert_daily_totals
+
+    DailyIntake.__table__.create(conn, checkfirst=True)
+    PeriodIntake.__table__.create(conn, checkfirst=True)
+    conn.execute(text("DELETE FROM daily_intakes"))
+    conn.execute(insert_daily_totals())
+    conn.execute(text("DELETE FROM period_intakes"))
+    _backfill_period_intakes(conn)
+
+
+# 0005: 주 / 월 누적 테이블 + 기존 daily_intakes 로부터 백필
+def _0005_period_intakes(conn):
+    from app.database.models.intake import PeriodIntake
+
+    PeriodIntake.__table__.create(conn, checkfirst=True)
+    _backfill_period_intakes(conn)
+
+
+# 0006: 예전 검사 (활동량 "" / 나이 0 이면 None) 로 권장량이 비어 있는 프로필 다시 계산
+def _0006_user_targets_defaults(conn):
+    from app.database.models.user import User
+    from app.services.user import apply_targets
+
+    db = Session(bind=conn)
+    for user in db.query(User).filter(User.completed == True, User.target_calories.is_(None)):
+        apply_targets(user)
+    db.flush()
+
+
+MIGRATIONS = [
+    ("0001_user_targets", _0001_user_targets),
+    ("0002_meal_report_index", _0002_meal_report_index),
+    ("0003_meal_macro_columns", _0003_meal_macro_columns),
+    ("0004_meal_report_history_index", _0004_meal_report_history_index),
+    ("0004a_daily_intakes_backfill", _0004a_daily_intakes_backfill),
+    ("0005_period_intakes", _0005_period_intakes),
+    ("0006_user_targets_defaults", _0006_user_targets_defaults),
+]
+
+
+def run_migrations(bind=engine):
+    with bind.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations (id VARCHAR PRIMARY KEY)"
+        ))
+        applied = {row[0] for row in conn.execute(text("SELECT id FROM schema_migrations"))}
+
+    for migration_id, migrate in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        # 마이그레이션 1개 = 트랜잭션 1개
+        with bind.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (id) VALUES (:id)"),
+                {"id": migration_id},
+            )
+        print(f"[INFO] 마이그레이션 적용: {migration_id}")
+
+
+# 테이블 생성 + 마이그레이션 (import 시점이 아니라 시작 단계에서 1회)
+#   gunicorn: 마스터 on_starting (워커 fork 전, 워커들이 동시에 실행하지 않도록)
+#   단독 실행 (uvicorn 등): app lifespan 시작 시
+def init_db(bind=engine):
+    # 모든 모델을 등록한 뒤 테이블 생성
+    from app.database.models import meal, user, intake, job  # noqa: F401
+
+    Base.metadata.create_all(bind=bind)
+    run_migrations(bind)
+
+    # SQLite 파일 DB: WAL 로 전환 (DB 파일에 저장됨)
+    #   워커 여러 개가 작업 상태 / 식사를 쓰는 동안에도 다른 워커의 읽기가 막히지 않음
+    if bind.dialect.name == "sqlite" and bind.url.database not in (None, "", ":memory:"):
+        with bind.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+
+if __name__ == "__main__":
+    init_db()
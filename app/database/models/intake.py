@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, UniqueConstraint
+from app.database.connection import Base
+
+class DailyIntake(Base):
+    __tablename__ = "daily_intakes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_daily_intakes_user_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(String, nullable=False)
+    meal_count = Column(Integer, nullable=False, default=0)
+    total_calories = Column(Float, nullable=False, default=0.0)
+    carbohydrate = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    sugar = Column(Float, nullable=False, default=0.0)
+
+
+# 주 / 월 단위 누적 (DailyIntake 와 같은 트랜잭션에서 함께 갱신)
+#   period = "week" (start = 월요일) / "month" (start = 1일)
+class PeriodIntake(Base):
+    __tablename__ = "period_intakes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "start", name="uq_period_intakes_user_period_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    period = Column(String, nullable=False)
+    start = Column(String, nullable=False)
+    day_count = Column(Integer, nullable=False, default=0)    # 식사가 기록된 날 수
+    meal_count = Column(Integer, nullable=False, default=0)
+    total_calories = Column(Float, nullable=False, default=0.0)
+    carbohydrate = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    sugar = Column(Float, nullable=False, default=0.0)
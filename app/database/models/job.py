@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey, Index
+from app.database.connection import Base
+
+
+# 비동기 분석 작업 (services/analysis_jobs) 상태 / 결과
+#   작업을 받은 워커가 상태가 바뀔 때마다 갱신, 다른 워커는 조회 / SSE 를 여기서 읽음
+class AnalysisJobRecord(Base):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        # 오래된 작업 정리 (finished 없으면 created 기준)
+        Index("ix_analysis_jobs_created", "created"),
+    )
+
+    id = Column(String, primary_key=True)          # uuid hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    state = Column(String, nullable=False)         # queued / running / done / failed
+    created = Column(Float, nullable=False)        # epoch 초
+    finished = Column(Float, nullable=True)
+    timings = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(JSON, nullable=True)
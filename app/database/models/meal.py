@@ -1,14 +1,59 @@
-from sqlalchemy import Column, Integer, String, Float, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, Time, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from app.database.connection import Base
 
+MACRO_KEYS = ("sugar", "carbohydrate", "protein", "fat")
+
 class MealReport(Base):
     __tablename__ = "meal_reports"
+    __table_args__ = (
+        # 목록 / 일별 조회: user_id + meal_date 로 찾고 meal_time 순으로 정렬
+        # 기록 페이지네이션: (meal_date, meal_time, id) 키셋 커서
+        Index("ix_meal_reports_user_date_time", "user_id", "meal_date", "meal_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    meal_date = Column(Date, nullable=True)
+    meal_time = Column(Time, nullable=True)
+    # 응답용 문자열 (YYYY-MM-DD / HH:MM)
     date = Column(String, nullable=False)
     time = Column(String, nullable=False)
-    items = Column(JSON, nullable=False)
     total_calories = Column(Float, nullable=False)
-    macros = Column(JSON, nullable=False)
+    carbohydrate = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    sugar = Column(Float, nullable=False, default=0.0)
     feedback = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+
+    meal_items = relationship(
+        "MealItem",
+        order_by="MealItem.position",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+    )
+
+    # 기존 API 응답 형태 유지용
+    @property
+    def macros(self):
+        return {key: {"value": getattr(self, key), "unit": "g"} for key in MACRO_KEYS}
+
+    @property
+    def items(self):
+        return [{"name": i.name, "calories": i.calories} for i in self.meal_items]
+
+
+class MealItem(Base):
+    __tablename__ = "meal_items"
+
+    id = Column(Integer, primary_key=True)
+    meal_id = Column(Integer, ForeignKey("meal_reports.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False, default=0)
+    name = Column(String, nullable=False)
+    confidence = Column(Float, nullable=True)
+    calories = Column(Float, nullable=False, default=0.0)
+    carbohydrate = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    sugar = Column(Float, nullable=False, default=0.0)
@@ -14,3 +14,13 @@ class User(Base):
     activity = Column(String, nullable=True)
     completed = Column(Boolean, default=False)
 
+    # 프로필 저장 시 계산해 두는 권장량 (services/user.apply_targets)
+    profile_version = Column(Integer, nullable=False, default=0)
+    bmr = Column(Float, nullable=True)
+    bmi = Column(Float, nullable=True)
+    bmi_status = Column(String, nullable=True)
+    target_calories = Column(Float, nullable=True)
+    target_carbohydrates = Column(Float, nullable=True)
+    target_protein = Column(Float, nullable=True)
+    target_fat = Column(Float, nullable=True)
+    target_sugars = Column(Float, nullable=True)
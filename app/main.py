@@ -1,10 +1,38 @@
-from fastapi.staticfiles import StaticFiles
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.connection import Base, engine
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.database.connection import pool_metrics
+from app.database.migrations import init_db
 from app.routers import user, main, meal
+from app.services.model_manager import model_manager
+from app.services.analysis_jobs import analysis_jobs
+from app.services.response_cache import response_cache
+from app.services.feedback_loader import feedback_catalog
+from app.services.session_user import profile_cache
+from app.services.static_files import ImmutableStaticFiles
+from app.services import image_derivatives
+from app.services.metrics import registry, RequestMetricsMiddleware
 
-app = FastAPI()
+
+#모델 수명 관리 (MODEL_LOAD=eager 면 요청 받기 전에 로딩 + 워밍업)
+#  DB 테이블 생성 / 마이그레이션도 여기서 (gunicorn 은 마스터가 미리 실행하고 DB_INIT_ON_STARTUP=false)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("DB_INIT_ON_STARTUP", "true").lower() in ("1", "true", "yes"):
+        await run_in_threadpool(init_db)
+    if model_manager.mode == "eager":
+        await run_in_threadpool(model_manager.load)
+    yield
+    await analysis_jobs.shutdown()
+    # 진행 중인 썸네일 생성은 끝날 때까지 기다림
+    await image_derivatives.drain()
+    model_manager.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 #쿠키 기반 인증을 위한 CORS 설정
 app.add_middleware(
@@ -14,18 +42,92 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+#요청 지연 히스토그램 (라우트 템플릿별)
+app.add_middleware(RequestMetricsMiddleware)
 
 #라우터 등록
 app.include_router(user.router)
 app.include_router(main.router)
 app.include_router(meal.router)
 
-#DB 테이블 생성 (미들웨어와 라우터 등록 이후)
-Base.metadata.create_all(bind=engine)
-
 @app.get("/")
 def root():
     return {"message": "FastAPI server is running 🚀"}
 
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+#모델 준비 상태 (로드 + 워밍업 완료 시 200, 아니면 503)
+@app.get("/health/ready")
+def readiness():
+    status = model_manager.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+#정적 파일 (업로드 / 썸네일은 해시 기반 ETag + immutable 캐시)
+static_files = ImmutableStaticFiles(directory="app/static")
+
+
+#Prometheus 스크레이프용 (단계 / DB 쿼리 / 요청 지연 히스토그램 + 큐 / 캐시 / 풀 상태)
+#  캐시 / 풀 / 큐 수치는 각 모듈의 stats() 를 스크레이프 시점에 읽음
+#  워커 프로세스마다 따로 집계됨 (analysis_jobs 도 이 워커가 받은 작업 기준)
+registry.gauge(
+    "inference_pending", "Images waiting for decode or inference.",
+    lambda: model_manager.scheduler.pending if model_manager.scheduler else None,
+)
+registry.gauge(
+    "analysis_jobs", "Async analysis jobs by state.",
+    lambda: {(k,): analysis_jobs.stats()[k] for k in ("queued", "running")}, ("state",),
+)
+registry.gauge(
+    "thumbnails_pending", "Uploads waiting for background thumbnail generation.",
+    image_derivatives.pending,
+)
+registry.stats(
+    "model", "Model load state", model_manager.status,
+    gauges=("ready", "load_seconds", "warmup_seconds", "first_request_seconds"),
+)
+registry.stats(
+    "inference", "Inference micro-batches",
+    lambda: model_manager.scheduler.stats() if model_manager.scheduler else None,
+    counters=("batches", "images"),
+)
+registry.stats(
+    "detection_cache", "Detection result cache",
+    lambda: model_manager.detection_cache.stats() if model_manager.detection_cache else None,
+    counters=("memory_hits", "disk_hits", "misses", "evictions", "expirations"),
+    gauges=("entries", "bytes"),
+)
+registry.stats(
+    "analysis_jobs", "Async analysis jobs", analysis_jobs.stats,
+    counters=("completed", "failed"), gauges=("stored",),
+)
+registry.stats(
+    "db_pool", "DB connection pool", lambda: {(name,): m for name, m in pool_metrics().items()},
+    counters=("checkouts", "timeouts", "wait_seconds"),
+    gauges=("checked_out", "peak_checked_out", "pool_size", "overflow"),
+    labelnames=("engine",),
+)
+registry.stats(
+    "response_cache", "JSON response cache", response_cache.stats,
+    counters=("hits", "misses", "not_modified", "bytes_saved", "invalidations"),
+    gauges=("entries",),
+)
+registry.stats(
+    "profile_cache", "Session profile cache", profile_cache.stats,
+    counters=("hits", "misses", "invalidations"), gauges=("entries",),
+)
+registry.stats(
+    "feedback_catalog", "Substitute catalog", feedback_catalog.stats,
+    counters=("reloads", "lookups"), gauges=("entries",),
+)
+registry.stats(
+    "static_files", "Static image responses", static_files.stats,
+    counters=("responses", "not_modified", "bytes_served", "bytes_saved"),
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+app.mount("/static", static_files, name="static")
@@ -1,70 +1,56 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import date
 from app.database.connection import get_db
-from app.database.models.user import User
 
-from app.services.ai_service import FoodAIModel
-from app.services.nutrition_service import get_nutrition_for_food
-from app.database.connection import SessionLocal
-from app.database.models.meal import MealReport
+from app.database.connection import get_async_db
+from app.services.daily_intake import day_meal_count, get_daily_intake
+from app.services.meal_queries import meals_for_day
+from app.services.response_cache import response_cache
+from app.services.image_derivatives import derivative_url, LIST_IMAGE_SIZE
+from app.services.trends import build_trends
+from app.services.session_user import load_session_user, load_session_user_async
 
 router = APIRouter()
 
-# BMR 계산 함수
-def calculate_bmr(gender, weight, height, age, activity):
-    if not all([gender, weight, height, age, activity]):
-        return None
-
-    if gender == "male":
-        bmr = 66.47 + (13.75 * weight) + (5 * height) - (6.76 * age)
-    else:
-        bmr = 655.1 + (9.56 * weight) + (1.85 * height) - (4.68 * age)
-
-    activity_factor = {
-        "sedentary": 1.2,
-        "low-active": 1.375,
-        "active": 1.55,
-        "very-active": 1.725
-    }.get(activity, 1.2)
-
-    return round(bmr * activity_factor)
-
 
 @router.get("/users/main/dashboard")
-def get_dashboard(db: Session = Depends(get_db)):
-    # 1) 유저 정보 조회
-    user = db.query(User).filter(User.completed == True).first()
+def get_dashboard(
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(load_session_user),
+):
+    # 1) 유저 정보 (세션 쿠키 → 프로필 캐시, 미적중 시 session_id 로 조회)
     if not user:
         return {"error": "Profile not found"}
 
-    # 2) 권장 칼로리 계산
-    recommended_calories = calculate_bmr(
-        user.gender, user.weight, user.height, user.age, user.activity
-    )
-
-    # 3) 오늘 식단 조회 (MealReport)
+    # 2) 오늘 누적 섭취량 조회 (DailyIntake 1행)
     today = date.today().strftime("%Y-%m-%d")
-    today_reports = (
-        db.query(MealReport)
-        .filter(MealReport.date == today)
-        .all()
+    intake = get_daily_intake(db, user.id, today)
+
+    # 같은 날 / 같은 프로필 / 같은 식사 수면 응답이 같음
+    #   식사 수는 방금 DB 에서 읽은 값이라 다른 워커가 저장한 식사도 바로 반영됨
+    cache_key = ("dashboard", user.id, today, user.profile_version, intake.meal_count if intake else 0)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return response_cache.respond(request, cached)
+
+    # 3) 권장 칼로리 (프로필 저장 시 계산된 값)
+    recommended_calories = (
+        round(user.target_calories) if user.target_calories is not None else None
     )
 
-    # 4) 오늘 총 섭취량 계산
-    total_calories = sum(r.total_calories for r in today_reports)
-    total_carb = sum(r.macros["carbohydrate"]["value"] for r in today_reports)
-    total_protein = sum(r.macros["protein"]["value"] for r in today_reports)
-    total_fat = sum(r.macros["fat"]["value"] for r in today_reports)
-
-    # 5) AMDR 기준 목표치
-    carb_ratio = 0.60
-    protein_ratio = 0.15
-    fat_ratio = 0.25
+    # 4) 오늘 총 섭취량
+    total_calories = intake.total_calories if intake else 0
+    total_carb = intake.carbohydrate if intake else 0
+    total_protein = intake.protein if intake else 0
+    total_fat = intake.fat if intake else 0
 
-    carb_goal = round(recommended_calories * carb_ratio / 4)
-    protein_goal = round(recommended_calories * protein_ratio / 4)
-    fat_goal = round(recommended_calories * fat_ratio / 9)
+    # 5) AMDR 기준 목표치 (analyze 피드백과 같은 값)
+    carb_goal = round(user.target_carbohydrates or 0)
+    protein_goal = round(user.target_protein or 0)
+    fat_goal = round(user.target_fat or 0)
 
     # 6) progress(하루 권장 칼로리 대비 섭취율)
     progress = round((total_calories / recommended_calories) * 100) if recommended_calories else 0
@@ -84,39 +70,72 @@ def get_dashboard(db: Session = Depends(get_db)):
         }
     }
 
-    return dashboard
+    return response_cache.respond(request, response_cache.put(cache_key, dashboard))
 
 
 
-# 식단 리스트 API
-    
-@router.get("/meal/list")
-async def get_meal_list():
-    db = SessionLocal()
+# 영양 추이 API (일 / 주 / 월, 누적 테이블 기반)
+@router.get("/users/main/trends")
+def get_trends(
+    days: int = Query(30, ge=1, le=366),
+    weeks: int = Query(12, ge=1, le=104),
+    months: int = Query(6, ge=1, le=36),
+    db: Session = Depends(get_db),
+    user=Depends(load_session_user),
+):
+    if not user:
+        return {"error": "Profile not found"}
+
+    return build_trends(db, user, date.today(), days=days, weeks=weeks, months=months)
 
-    today = date.today().strftime("%Y-%m-%d")
 
-    # 오늘 날짜만 + 시간 오름차순 정렬
-    reports = (
-        db.query(MealReport)
-        .filter(MealReport.date == today)
-        .order_by(MealReport.time.asc())
-        .all()
-    )
 
-    db.close()
+# 식단 리스트 API
+    
+@router.get("/meal/list")
+async def get_meal_list(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(load_session_user_async),
+):
+    if not user:
+        return []
+
+    # 캐시 키에 오늘 식사 수 (DB 값) 포함 → 저장 전에 조회한 목록이 저장 후에 캐시돼도
+    #   식사 수가 달라 다시 읽히지 않음 (다른 워커가 저장한 경우도 동일)
+    today = date.today()
+    day = today.strftime("%Y-%m-%d")
+    meal_count = (await db.execute(day_meal_count(user.id, day))).scalar() or 0
+    cache_key = ("meal_list", user.id, day, meal_count)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return response_cache.respond(request, cached)
+
+    # 오늘 날짜만 + 시간 오름차순 정렬 (user_id, meal_date, meal_time 인덱스)
+    result = await db.execute(meals_for_day(user.id, today))
+    reports = result.scalars().all()
 
     results = []
+    thumbnails_pending = False
     for r in reports:
+        image = derivative_url(r.image_url, LIST_IMAGE_SIZE)
+        # 썸네일이 아직 생성 중이면 원본 URL 로 대체됨
+        thumbnails_pending = thumbnails_pending or (bool(r.image_url) and image == r.image_url)
         results.append({
             "id": r.id,
             "time": f"{r.date}T{r.time}:00",         # dayjs 호환 ISO 포맷
-            "image": f"http://localhost:8000{r.image_url}" if r.image_url else "",
-            "menu": [item["name"] for item in r.items],
-            "carbohydrate": r.macros["carbohydrate"]["value"],
-            "protein": r.macros["protein"]["value"],
-            "fat": r.macros["fat"]["value"],
+            # 목록 카드는 썸네일, 원본은 image_original
+            "image": f"http://localhost:8000{image}" if r.image_url else "",
+            "image_original": f"http://localhost:8000{r.image_url}" if r.image_url else "",
+            "menu": [item.name for item in r.meal_items],
+            "carbohydrate": r.carbohydrate,
+            "protein": r.protein,
+            "fat": r.fat,
             "total_calories": r.total_calories
         })
 
-    return results
+    # 원본 URL 이 들어간 목록은 캐시하지 않음 (/meal/report 와 같은 방식)
+    #   → 썸네일이 생기면 다음 요청에서 썸네일 URL 로 바뀜
+    if thumbnails_pending:
+        return response_cache.respond(request, response_cache.build(results))
+    return response_cache.respond(request, response_cache.put(cache_key, results))
@@ -1,252 +1,623 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from datetime import datetime
-import cv2, os
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from datetime import date, datetime
+from typing import List, Optional
+import base64
+import json
+import os
+import time as timer
 import numpy as np
-from sqlalchemy.orm import Session
-
-from app.services.ai_service import FoodAIModel
-from app.services.nutrition_service import get_nutrition_for_food
-from app.database.connection import SessionLocal
-from app.database.models.meal import MealReport
-from app.database.models.user import User
-
-from app.services.feedback_loader import recommendation_detail
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.services.inference_scheduler import SchedulerOverloaded, ImageDecodeError
+from app.services.model_manager import model_manager
+from app.services.analysis_jobs import analysis_jobs, JobQueueFull
+from app.services.upload_service import (
+    store_upload, discard_upload, EmptyUploadError, UploadTooLargeError, InvalidImageError
+)
+from app.services.image_derivatives import (
+    generate_in_background, derivative_url, image_urls, LIST_IMAGE_SIZE
+)
+from app.services.nutrition_service import nutrition_catalog
+from app.services.response_cache import response_cache, IMMUTABLE
+from app.services.metrics import StageTimer
+from app.database.connection import AsyncSessionLocal, get_async_db
+from app.database.models.meal import MealReport, MealItem
+from app.services.session_user import UserProfile, require_session_user
+from app.services.daily_intake import get_daily_intake, add_meal_to_daily_intake
+from app.services.meal_queries import meal_history
+
+from app.services.feedback_loader import feedback_catalog
+from app.services.feedback_rules import top_deviations
 from app.services.nutrition_logic import (
-    calculate_bmr, calculate_tdee, calculate_bmi, diff_pct,
+    diff_pct,
     recommend_exercise, generate_coach_text,
     recommend_by_detail, format_substitutes
 )
 
 router = APIRouter(prefix="/meal", tags=["meal"])
 
+# /meal/analyze/batch 한 번에 받는 최대 이미지 수
+BATCH_MAX_IMAGES = int(os.getenv("MEAL_BATCH_MAX_IMAGES", "8"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# /meal/history 기본 / 최대 페이지 크기
+HISTORY_PAGE_SIZE = int(os.getenv("MEAL_HISTORY_PAGE_SIZE", "20"))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("MEAL_HISTORY_MAX_PAGE_SIZE", "100"))
+# fields 로 추가 요청할 수 있는 항목 (기본 응답에는 제외)
+HISTORY_OPTIONAL_FIELDS = ("items", "feedback")
+
+
 # -----------------------------
-# 모델 초기화
+# 공통 계산
 # -----------------------------
-try:
-    ai_model = FoodAIModel()
-    print("[INFO] AI 모델 초기화 완료")
-except Exception as e:
-    ai_model = None
-    print(f"[WARN] AI model init failed: {e}")
+# 탐지 결과 → 응답용 items, 저장용 MealItem, 합계 (칼로리, 탄, 단, 지, 당), macros
+def build_nutrition(detections, serving):
+    class_ids = np.fromiter(
+        (d["class_id"] for d in detections), dtype=np.int64, count=len(detections)
+    )
+    # class id 로 영양 행렬 gather → serving 가중 합
+    per_item, totals, known = nutrition_catalog.nutrition_for_classes(
+        class_ids, model_manager.model.names, serving
+    )
+
+    items = []
+    meal_items = []
+    for position, (d, row, has_info) in enumerate(zip(detections, per_item.tolist(), known.tolist())):
+        cal, carb, prot, fat, sug = (round(v, 1) for v in row)
+        items.append({"name": d["name"], "calories": cal if has_info else 0})
+        meal_items.append(MealItem(
+            position=position,
+            name=d["name"],
+            confidence=d["confidence"],
+            calories=cal,
+            carbohydrate=carb,
+            protein=prot,
+            fat=fat,
+            sugar=sug,
+        ))
+
+    total_cal, total_carb, total_prot, total_fat, total_sugar = totals = totals.tolist()
+    macros = {
+        "sugar": {"value": round(total_sugar, 1), "unit": "g"},
+        "carbohydrate": {"value": round(total_carb, 1), "unit": "g"},
+        "protein": {"value": round(total_prot, 1), "unit": "g"},
+        "fat": {"value": round(total_fat, 1), "unit": "g"},
+    }
+    return items, meal_items, totals, macros
+
 
+# 오늘 누적 섭취량 (칼로리, 탄, 단, 지, 당) 기준 코칭 문구
+FEEDBACK_NUTRIENTS = ("calories", "carbohydrates", "protein", "fat", "sugars")
 
-UPLOAD_DIR = "./app/static/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def build_feedback(user, day_totals, time):
+    # 권장량은 프로필 저장 시 계산해 둔 값 사용 (대시보드와 동일)
+    #   계산하지 못한 항목 (None) 은 비교에서 제외
+    targets = (
+        user.target_calories,
+        user.target_carbohydrates,
+        user.target_protein,
+        user.target_fat,
+        user.target_sugars,
+    )
+    recommended = {
+        nutrient: (total, target)
+        for nutrient, total, target in zip(FEEDBACK_NUTRIENTS, day_totals, targets)
+        if target is not None
+    }
+
+    diff_pct_map = {n: diff_pct(total, target) for n, (total, target) in recommended.items()}
+    diff_g = {n: total - target for n, (total, target) in recommended.items()}
+
+    bmi, bmi_status = user.bmi, user.bmi_status
+    exercise_text = (
+        recommend_exercise(diff_g["calories"], user.activity) if "calories" in diff_g else ""
+    )
+
+    # meal_time 분류
+    meal_time = "breakfast" if time < "10:00" else \
+                "lunch" if time < "15:00" else "dinner"
+
+    # 편차 상위 항목은 한 번만 골라 코칭 문구 / 대체식에서 같이 사용
+    top = top_deviations(diff_pct_map)
+    substitutes = recommend_by_detail(diff_g, feedback_catalog, meal_time)
+    substitute_text = format_substitutes(diff_pct_map, substitutes, top=top)
+
+    return (
+        generate_coach_text(diff_pct_map, bmi, bmi_status, exercise_text, top=top)
+        + "\n" + substitute_text
+    )
+
+
+def new_report(user, day, time, time_value, totals, macros, meal_items, feedback, image_url):
+    return MealReport(
+        user_id=user.id,
+        meal_date=day,
+        meal_time=time_value,
+        date=day.strftime("%Y-%m-%d"),
+        time=time,
+        total_calories=round(totals[0], 1),
+        carbohydrate=macros["carbohydrate"]["value"],
+        protein=macros["protein"]["value"],
+        fat=macros["fat"]["value"],
+        sugar=macros["sugar"]["value"],
+        meal_items=meal_items,
+        feedback=feedback,
+        image_url=image_url,
+    )
+
+
+# 저장된 리포트 값 (칼로리, 탄, 단, 지, 당) — 일별 누적에 더하는 값
+def stored_totals(report):
+    return (report.total_calories, report.carbohydrate, report.protein, report.fat, report.sugar)
+
+
+async def get_scheduler_or_500():
+    # 모델은 main.py lifespan 에서 로딩 (MODEL_LOAD=lazy 면 여기서 최초 로딩)
+    scheduler = await model_manager.get_scheduler()
+    if scheduler is None:
+        raise HTTPException(
+            status_code=500,
+            detail="AI 모델 초기화 실패. MODEL_PATH 확인 필요."
+        )
+    return scheduler
 
 
 # -----------------------------
 # /meal/analyze
+#  - mode=async 면 업로드 저장 후 바로 job_id 반환 (202)
+#    → /meal/jobs/{job_id} 폴링 또는 /meal/jobs/{job_id}/events (SSE) 구독
 # -----------------------------
 @router.post("/analyze")
 async def analyze_meal(
     file: UploadFile = File(...),
     time: str = Form(...),
     serving: float = Form(1.0),
+    mode: str = Query("sync"),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserProfile = Depends(require_session_user),
 ):
+    if mode not in ("sync", "async"):
+        raise HTTPException(400, "mode 는 sync 또는 async 입니다.")
 
-    if ai_model is None:
-        raise HTTPException(
-            status_code=500,
-            detail="AI 모델 초기화 실패. MODEL_PATH 확인 필요."
-        )
+    scheduler = await get_scheduler_or_500()
 
-    # 1) 이미지 저장
-    content = await file.read()
-    if not content:
+    # 시간 검증 (async 모드에서도 큐에 넣기 전에 확인)
+    try:
+        meal_time_value = datetime.strptime(time, "%H:%M").time()
+    except ValueError:
+        raise HTTPException(400, "시간 형식 오류 (예: 08:25)")
+
+    # 1) 이미지 저장 (내용 해시 기준, 같은 이미지는 재저장 X)
+    stages = StageTimer()
+    try:
+        with stages.stage("upload_read"):
+            upload = await store_upload(file)
+    except EmptyUploadError:
         raise HTTPException(400, "빈 파일입니다.")
+    except UploadTooLargeError:
+        raise HTTPException(413, "이미지 용량이 너무 큽니다.")
+    except InvalidImageError:
+        raise HTTPException(400, "이미지를 디코드할 수 없습니다.")
 
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(content)
+    if mode == "async":
+        try:
+            job = await analysis_jobs.submit(
+                run_analysis_job, scheduler, user, upload, time, meal_time_value, serving,
+                user_id=user.id,
+            )
+        except JobQueueFull:
+            raise HTTPException(503, "요청이 많아 잠시 후 다시 시도해주세요.")
+        return JSONResponse({
+            "job_id": job.id,
+            "status": job.state,
+            "status_url": f"/meal/jobs/{job.id}",
+            "events_url": f"/meal/jobs/{job.id}/events",
+        }, status_code=202)
+
+    return await analyze_upload(
+        db, scheduler, user, upload, time, meal_time_value, serving, timings=stages.timings
+    )
 
-    image_url = f"/static/uploads/{file.filename}"
 
-    np_buf = np.frombuffer(content, np.uint8)
-    img_bgr = cv2.imdecode(np_buf, cv2.IMREAD_COLOR)
-    if img_bgr is None:
-        raise HTTPException(400, "이미지를 디코드할 수 없습니다.")
+# 백그라운드 작업용: 요청 세션이 닫힌 뒤 실행되므로 세션을 따로 엶
+#   user 는 요청 시점에 확인한 프로필 (UserProfile 이라 세션과 무관하게 사용 가능)
+async def run_analysis_job(scheduler, user, upload, time, meal_time_value, serving, timings):
+    async with AsyncSessionLocal() as db:
+        return await analyze_upload(
+            db, scheduler, user, upload, time, meal_time_value, serving, timings=timings
+        )
 
-    # 2) AI 예측
-    detections = ai_model.predict_foods(img_bgr, conf=0.25, iou=0.45)
+
+# 저장된 업로드 1장 → 추론 / 영양 / 피드백 / DB 저장 (단계별 소요 시간은 timings 에 기록)
+async def analyze_upload(db, scheduler, user, upload, time, meal_time_value, serving, timings=None):
+    stages = StageTimer(timings)
+    image_url = upload.url
+
+    # 2) AI 예측 (디코드 + 추론은 스케줄러 스레드 풀에서 실행)
+    try:
+        with stages.stage("inference"):
+            detections = await scheduler.analyze(
+                upload.content, conf=0.25, iou=0.45, image_hash=upload.sha256
+            )
+        model_manager.record_request(stages.timings["inference"])
+    except ImageDecodeError:
+        await run_in_threadpool(discard_upload, upload)
+        raise HTTPException(400, "이미지를 디코드할 수 없습니다.")
+    except SchedulerOverloaded:
+        raise HTTPException(503, "요청이 많아 잠시 후 다시 시도해주세요.")
     if not detections:
         raise HTTPException(200, "음식을 인식하지 못했습니다.")
 
-    dedup = {}
-    for d in detections:
-        name = d["name"]
-        conf = d["confidence"]
-        if name not in dedup or conf > dedup[name]["confidence"]:
-            dedup[name] = d
-    predicted_labels = list(dedup.keys())
-
-    # 3) DB 세션 시작 (단 1회)
-    db: Session = SessionLocal()
-
-    # 유저 정보 가져오기 (단일 유저)
-    user = db.query(User).filter(User.completed == True).first()
-    if not user:
-        db.close()
-        raise HTTPException(404, "유저 정보가 없습니다.")
-
-    sex = user.gender
-    age = user.age
-    height = user.height
-    weight = user.weight
-    activity = user.activity
-
-    # 4) 영양 계산
-    total_cal = total_carb = total_prot = total_fat = total_sugar = 0.0
-    items = []
-
-    for name in predicted_labels:
-        info = get_nutrition_for_food(name)
-        if info:
-            cal = float(info.get("calories_kcal", 0)) * serving
-            carb = float(info.get("carbohydrates_g", 0)) * serving
-            prot = float(info.get("protein_g", 0)) * serving
-            fat = float(info.get("fat_g", 0)) * serving
-            sug = float(info.get("sugars_g", 0)) * serving
-
-            total_cal += cal
-            total_carb += carb
-            total_prot += prot
-            total_fat += fat
-            total_sugar += sug
-
-            items.append({"name": name, "calories": round(cal, 1)})
-        else:
-            items.append({"name": name, "calories": 0})
+    # 4) 영양 계산 (스케줄러 결과는 이미 음식별 최고 신뢰도 1개로 정리돼 있음)
+    with stages.stage("nutrition"):
+        items, meal_items, totals, macros = build_nutrition(detections, serving)
 
-    macros = {
-        "sugar": {"value": round(total_sugar, 1), "unit": "g"},
-        "carbohydrate": {"value": round(total_carb, 1), "unit": "g"},
-        "protein": {"value": round(total_prot, 1), "unit": "g"},
-        "fat": {"value": round(total_fat, 1), "unit": "g"},
-    }
-    
     # ===============================================================
     # 5) 오늘 누적 섭취량 계산 (추가)
     # ===============================================================
-    today = datetime.now().strftime("%Y-%m-%d")
+    now = datetime.now()
+    date_part = now.strftime("%Y-%m-%d")
 
-    today_reports = (
-        db.query(MealReport)
-        .filter(MealReport.date == today)
-        .all()
-    )
-
-    prev_total_cal = sum(r.total_calories for r in today_reports)
-    prev_total_carb = sum(r.macros["carbohydrate"]["value"] for r in today_reports)
-    prev_total_prot = sum(r.macros["protein"]["value"] for r in today_reports)
-    prev_total_fat = sum(r.macros["fat"]["value"] for r in today_reports)
-    prev_total_sugar = sum(r.macros["sugar"]["value"] for r in today_reports)
+    with stages.stage("day_total"):
+        intake = await db.run_sync(get_daily_intake, user.id, date_part)
+    prev_totals = stored_totals(intake) if intake else (0.0,) * 5
 
     # 오늘 총 섭취량 = 기존 누적 + 이번 식사
-    day_total_cal = prev_total_cal + total_cal
-    day_total_carb = prev_total_carb + total_carb
-    day_total_prot = prev_total_prot + total_prot
-    day_total_fat = prev_total_fat + total_fat
-    day_total_sugar = prev_total_sugar + total_sugar
-
+    day_totals = [prev + cur for prev, cur in zip(prev_totals, totals)]
 
     # 5) AI 리포트 생성
-    bmr = calculate_bmr(sex, weight, height, age)
-    tdee = calculate_tdee(bmr, activity)
+    with stages.stage("feedback"):
+        feedback = build_feedback(user, day_totals, time)
 
-    recommended = {
-        "calories": tdee,
-        "carbohydrates": tdee * 0.60 / 4,
-        "protein": tdee * 0.15 / 4,
-        "fat": tdee * 0.25 / 9,
-        "sugars": tdee * 0.10 / 4,
-    }
+    # 6) DB 저장
+    with stages.stage("commit"):
+        report = new_report(
+            user, now.date(), time, meal_time_value, totals, macros, meal_items, feedback, image_url
+        )
 
-    diff_pct_map = {
-        "calories": diff_pct(day_total_cal, recommended["calories"]),
-        "carbohydrates": diff_pct(day_total_carb, recommended["carbohydrates"]),
-        "protein": diff_pct(day_total_prot, recommended["protein"]),
-        "fat": diff_pct(day_total_fat, recommended["fat"]),
-        "sugars": diff_pct(day_total_sugar, recommended["sugars"]),
-    }
+        db.add(report)
+        # 일별 누적 합계도 같은 트랜잭션에서 갱신
+        await db.run_sync(
+            add_meal_to_daily_intake, user.id, date_part,
+            calories=report.total_calories,
+            carbohydrate=macros["carbohydrate"]["value"],
+            protein=macros["protein"]["value"],
+            fat=macros["fat"]["value"],
+            sugar=macros["sugar"]["value"],
+        )
+        await db.commit()
+        # 이 유저의 오늘 대시보드 / 식단 리스트 항목 정리 (캐시 키의 식사 수가 바뀌어 어차피 다시 읽지 않음)
+        response_cache.invalidate_day(user.id, date_part)
 
-    diff_g = {
-        "calories": day_total_cal - recommended["calories"],
-        "carbohydrates": day_total_carb - recommended["carbohydrates"],
-        "protein": day_total_prot - recommended["protein"],
-        "fat": day_total_fat - recommended["fat"],
-        "sugars": day_total_sugar - recommended["sugars"],
+    # 썸네일 / 미리보기는 저장된 리포트만 백그라운드 생성 (응답은 기다리지 않음)
+    generate_in_background(upload)
+
+    return {
+        "success": True,
+        "meal_id": report.id,
+        "image_url": image_url,
+        "images": image_urls(image_url),
+        "date": date_part,
+        "meals": [{"id": report.id, "time": time, "items": items}],
+        "total_calories": round(totals[0], 1),
+        "macros": macros,
+        "feedback": feedback,
     }
 
 
-    bmi, bmi_status = calculate_bmi(weight, height)
-    exercise_text = recommend_exercise(diff_g["calories"], activity)
+# ---------------------------------------------------
+# /meal/jobs/{job_id}  (비동기 분석 상태 / 결과)
+#   본인 작업만 조회 가능 (다른 유저의 job_id 는 404)
+#   상태는 DB 에 있으므로 작업을 받지 않은 워커에서도 조회됨
+# ---------------------------------------------------
+@router.get("/jobs/{job_id}")
+async def get_analysis_job(job_id: str, user: UserProfile = Depends(require_session_user)):
+    job = await analysis_jobs.get(job_id, user.id)
+    if job is None:
+        raise HTTPException(404, "작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+
+# 상태가 바뀔 때마다 SSE 로 전달, done / failed 이벤트 후 스트림 종료
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str, user: UserProfile = Depends(require_session_user)):
+    job = await analysis_jobs.get(job_id, user.id)
+    if job is None:
+        raise HTTPException(404, "작업을 찾을 수 없습니다.")
+
+    def sse(snapshot):
+        payload = json.dumps(snapshot, ensure_ascii=False)
+        return f"event: {snapshot['status']}\ndata: {payload}\n\n"
+
+    async def events():
+        async for snapshot in analysis_jobs.watch(job, SSE_KEEPALIVE_SECONDS):
+            if snapshot is None:
+                # 프록시가 연결을 끊지 않도록 주기적으로 주석 전송
+                yield ": keep-alive\n\n"
+                continue
+            yield sse(snapshot)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    # meal_time 분류
-    meal_time = "breakfast" if time < "10:00" else \
-                "lunch" if time < "15:00" else "dinner"
 
-    substitutes = recommend_by_detail(diff_g, recommendation_detail, meal_time)
-    substitute_text = format_substitutes(diff_pct_map, substitutes)
+# -----------------------------
+# /meal/analyze/batch  (여러 장 / 오프라인 동기화)
+#  - files[i] 의 식사 시간은 times[i], 날짜는 dates[i] (생략 시 오늘)
+#  - 추론은 스케줄러 배치 1회, 누적 섭취량은 날짜 / 시간 순으로 이어서 계산
+#  - 성공한 식사는 한 트랜잭션으로 저장, 실패한 항목은 results 에 사유 반환
+# -----------------------------
+def batch_error(index, file, status, detail):
+    return {
+        "index": index,
+        "success": False,
+        "filename": file.filename,
+        "status": status,
+        "detail": detail,
+    }
 
-    feedback = (
-        generate_coach_text(diff_pct_map, bmi, bmi_status, exercise_text)
-        + "\n" + substitute_text
-    )
 
-    # 6) 시간 검증
-    try:
-        datetime.strptime(time, "%H:%M")
-    except ValueError:
-        db.close()
-        raise HTTPException(400, "시간 형식 오류 (예: 08:25)")
+@router.post("/analyze/batch")
+async def analyze_meal_batch(
+    files: List[UploadFile] = File(...),
+    times: List[str] = Form(...),
+    dates: Optional[List[str]] = Form(None),
+    serving: float = Form(1.0),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserProfile = Depends(require_session_user),
+):
+    if len(files) > BATCH_MAX_IMAGES:
+        raise HTTPException(413, f"한 번에 최대 {BATCH_MAX_IMAGES}장까지 업로드할 수 있습니다.")
+    if len(times) != len(files) or (dates is not None and len(dates) != len(files)):
+        raise HTTPException(400, "files / times / dates 개수가 같아야 합니다.")
+
+    scheduler = await get_scheduler_or_500()
+
+    results = [None] * len(files)
+    entries = []
+
+    # 1) 시간 검증 + 이미지 저장
+    today = datetime.now().date()
+    for i, file in enumerate(files):
+        try:
+            time_value = datetime.strptime(times[i], "%H:%M").time()
+            day = datetime.strptime(dates[i], "%Y-%m-%d").date() if dates else today
+        except ValueError:
+            results[i] = batch_error(i, file, 400, "날짜 / 시간 형식 오류 (예: 2024-05-01, 08:25)")
+            continue
+
+        try:
+            upload = await store_upload(file)
+        except EmptyUploadError:
+            results[i] = batch_error(i, file, 400, "빈 파일입니다.")
+            continue
+        except UploadTooLargeError:
+            results[i] = batch_error(i, file, 413, "이미지 용량이 너무 큽니다.")
+            continue
+        except InvalidImageError:
+            results[i] = batch_error(i, file, 400, "이미지를 디코드할 수 없습니다.")
+            continue
+
+        entries.append({
+            "index": i, "file": file, "upload": upload,
+            "day": day, "time": times[i], "time_value": time_value,
+        })
+
+    # 2) AI 예측 (모든 이미지를 같은 배치로)
+    outcomes = []
+    if entries:
+        try:
+            started = timer.perf_counter()
+            outcomes = await scheduler.analyze_many(
+                [e["upload"].content for e in entries], conf=0.25, iou=0.45,
+                image_hashes=[e["upload"].sha256 for e in entries],
+            )
+            model_manager.record_request(timer.perf_counter() - started)
+        except SchedulerOverloaded:
+            raise HTTPException(503, "요청이 많아 잠시 후 다시 시도해주세요.")
+
+    analyzed = []
+    for entry, detections in zip(entries, outcomes):
+        if isinstance(detections, ImageDecodeError):
+            await run_in_threadpool(discard_upload, entry["upload"])
+            results[entry["index"]] = batch_error(
+                entry["index"], entry["file"], 400, "이미지를 디코드할 수 없습니다."
+            )
+        elif isinstance(detections, Exception):
+            print(f"[WARN] 배치 추론 실패: {detections!r}")
+            results[entry["index"]] = batch_error(
+                entry["index"], entry["file"], 500, "AI 추론 중 오류가 발생했습니다."
+            )
+        elif not detections:
+            results[entry["index"]] = batch_error(
+                entry["index"], entry["file"], 200, "음식을 인식하지 못했습니다."
+            )
+        else:
+            analyzed.append((entry, detections))
+
+    # 3) 날짜 / 시간 순으로 영양 계산 + 누적 섭취량 + 피드백
+    analyzed.sort(key=lambda a: (a[0]["day"], a[0]["time_value"]))
+
+    running = {}   # 날짜 → 지금까지 누적 (칼로리, 탄, 단, 지, 당)
+    added = {}     # 날짜 → [식사 수, 이번 배치에서 더할 합계]
+    saved = []
+    for entry, detections in analyzed:
+        date_part = entry["day"].strftime("%Y-%m-%d")
+        if date_part not in running:
+            intake = await db.run_sync(get_daily_intake, user.id, date_part)
+            running[date_part] = stored_totals(intake) if intake else (0.0,) * 5
+            added[date_part] = [0, (0.0,) * 5]
+
+        items, meal_items, totals, macros = build_nutrition(detections, serving)
+        day_totals = [prev + cur for prev, cur in zip(running[date_part], totals)]
+        feedback = build_feedback(user, day_totals, entry["time"])
+
+        report = new_report(
+            user, entry["day"], entry["time"], entry["time_value"],
+            totals, macros, meal_items, feedback, entry["upload"].url,
+        )
+        values = stored_totals(report)
+        running[date_part] = tuple(a + b for a, b in zip(running[date_part], values))
+        added[date_part][0] += 1
+        added[date_part][1] = tuple(a + b for a, b in zip(added[date_part][1], values))
+        saved.append((entry, report, items, macros))
+
+    # 4) DB 저장 (한 트랜잭션, 일별 누적은 날짜당 1회 갱신)
+    if saved:
+        db.add_all([report for _, report, _, _ in saved])
+        for date_part, (meals, (cal, carb, prot, fat, sugar)) in added.items():
+            await db.run_sync(
+                add_meal_to_daily_intake, user.id, date_part,
+                calories=cal, carbohydrate=carb, protein=prot, fat=fat, sugar=sugar,
+                meals=meals,
+            )
+        await db.commit()
+        for date_part in added:
+            response_cache.invalidate_day(user.id, date_part)
+        # 썸네일은 저장된 식사만 백그라운드 생성
+        for entry, _, _, _ in saved:
+            generate_in_background(entry["upload"])
+
+    for entry, report, items, macros in saved:
+        results[entry["index"]] = {
+            "index": entry["index"],
+            "success": True,
+            "meal_id": report.id,
+            "image_url": report.image_url,
+            "images": image_urls(report.image_url),
+            "date": report.date,
+            "meals": [{"id": report.id, "time": report.time, "items": items}],
+            "total_calories": report.total_calories,
+            "macros": macros,
+            "feedback": report.feedback,
+        }
 
-    date_part = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "success": bool(saved),
+        "saved": len(saved),
+        "failed": len(files) - len(saved),
+        "results": results,
+    }
 
-    # 7) DB 저장
-    report = MealReport(
-        date=date_part,
-        time=time,
-        items=items,
-        total_calories=round(total_cal, 1),
-        macros=macros,
-        feedback=feedback,
-        image_url=image_url,
-    )
 
-    db.add(report)
-    db.commit()
-    db.refresh(report)
-    db.close()
+# ---------------------------------------------------
+# /meal/history  (기간 필터 + 키셋 페이지네이션, 최신순)
+#  - cursor: 이전 응답의 next_cursor (마지막 행의 날짜 / 시간 / id)
+#  - fields=items,feedback 을 줘야 항목 상세 / 피드백 포함
+# ---------------------------------------------------
+def encode_cursor(report):
+    raw = f"{report.meal_date.isoformat()}|{report.meal_time.isoformat()}|{report.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, time_value, meal_id = raw.split("|")
+        return (
+            date.fromisoformat(day),
+            datetime.strptime(time_value, "%H:%M:%S").time(),
+            int(meal_id),
+        )
+    except ValueError:
+        raise HTTPException(400, "잘못된 cursor 입니다.")
+
+
+@router.get("/history")
+async def get_meal_history(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserProfile = Depends(require_session_user),
+):
+    limit = min(limit, HISTORY_MAX_PAGE_SIZE)
+    selected = {f.strip() for f in fields.split(",") if f.strip()} if fields else set()
+    unknown = selected - set(HISTORY_OPTIONAL_FIELDS)
+    if unknown:
+        raise HTTPException(400, f"알 수 없는 fields: {', '.join(sorted(unknown))}")
+    after = decode_cursor(cursor) if cursor else None
+
+    result = await db.execute(meal_history(
+        user.id, start=start, end=end, after=after, limit=limit,
+        with_items="items" in selected, with_feedback="feedback" in selected,
+    ))
+    reports = result.scalars().all()
+    has_more = len(reports) > limit
+    reports = reports[:limit]
+
+    meals = []
+    for r in reports:
+        meal = {
+            "id": r.id,
+            "date": r.date,
+            "time": r.time,
+            "total_calories": r.total_calories,
+            "carbohydrate": r.carbohydrate,
+            "protein": r.protein,
+            "fat": r.fat,
+            "sugar": r.sugar,
+            "image_url": r.image_url,
+            "thumbnail_url": derivative_url(r.image_url, LIST_IMAGE_SIZE),
+        }
+        if "items" in selected:
+            meal["items"] = r.items
+        if "feedback" in selected:
+            meal["feedback"] = r.feedback
+        meals.append(meal)
 
     return {
-        "success": True,
-        "meal_id": report.id,
-        "image_url": image_url,
-        "date": date_part,
-        "meals": [{"id": report.id, "time": time, "items": items}],
-        "total_calories": round(total_cal, 1),
-        "macros": macros,
-        "feedback": feedback,
+        "meals": meals,
+        "limit": limit,
+        "next_cursor": encode_cursor(reports[-1]) if has_more else None,
     }
 
 
 # ---------------------------------------------------
 # /meal/report/{meal_id}
 # ---------------------------------------------------
+# 저장 후 바뀌지 않으므로 immutable 캐시 (DB 조회 / 직렬화 1회)
+#   본인 리포트만 조회 가능 (다른 유저의 meal_id 는 404), 캐시 키에도 유저 포함
 @router.get("/report/{meal_id}")
-async def get_meal_report(meal_id: int):
-    db = SessionLocal()
-    report = db.query(MealReport).filter(MealReport.id == meal_id).first()
-    db.close()
+async def get_meal_report(
+    meal_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserProfile = Depends(require_session_user),
+):
+    cache_key = ("report", user.id, meal_id)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return response_cache.respond(request, cached)
+
+    result = await db.execute(
+        select(MealReport).where(MealReport.id == meal_id, MealReport.user_id == user.id)
+    )
+    report = result.scalars().first()
 
     if not report:
         raise HTTPException(404, "리포트를 찾을 수 없습니다.")
 
-    return {
+    payload = {
         "date": report.date,
         "meals": [{"id": report.id, "time": report.time, "items": report.items}],
         "total_calories": report.total_calories,
         "macros": report.macros,
         "feedback": report.feedback,
         "image_url": report.image_url,
+        "images": image_urls(report.image_url),
     }
+    # 썸네일이 아직 없으면 (예전 업로드 / 생성 중) 원본 URL 이 들어가므로
+    # 캐시에 넣지 않고 immutable 로 고정하지도 않음 → 썸네일이 생기면 다음 요청에 반영
+    if report.image_url and report.image_url in payload["images"].values():
+        return response_cache.respond(request, response_cache.build(payload))
+    return response_cache.respond(request, response_cache.put(cache_key, payload, IMMUTABLE))
+
@@ -1,28 +1,260 @@
-from ultralytics import YOLO
+import ast
 import os
+import time
+import zlib
 from dotenv import load_dotenv
 
+import cv2
+import numpy as np
+
+from app.services.image_preprocess import MODEL_IMGSZ
+
 load_dotenv()
 
+# torch | onnx | onnx-int8 | stub
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "torch").lower()
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))   # 0 = ORT 기본값
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "0"))
+# MODEL_BACKEND=stub (부하 테스트 / 벤치마크용, 가중치 / torch 불필요)
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "30"))              # 배치 1회 고정 비용
+STUB_LATENCY_PER_IMAGE_MS = float(os.getenv("STUB_LATENCY_PER_IMAGE_MS", "5"))
+STUB_LABELS = os.getenv("STUB_LABELS", "")                               # 쉼표 구분, 비우면 영양 카탈로그 음식명
+STUB_DETECTIONS = int(os.getenv("STUB_DETECTIONS", "4"))
+# 가중치 메모리 흉내 (멀티 워커 메모리 벤치마크용, 0 이면 할당 안 함)
+STUB_WEIGHTS_MB = int(os.getenv("STUB_WEIGHTS_MB", "0"))
+
+# gunicorn preload (fork 전 로딩) 가능한 백엔드
+#  onnxruntime 은 세션 생성 시 스레드 풀을 띄워서 fork 후 자식에서 쓸 수 없음
+FORK_SAFE_BACKENDS = ("torch", "stub")
+
+
+# -----------------------------
+# 추론 백엔드
+#  predict_batch(images, conf, iou) → 이미지별 (class_ids, confidences) 배열
+# -----------------------------
+class TorchBackend:
+    name = "torch"
+
+    def __init__(self, model_path):
+        # torch 로딩이 무거우므로 실제 모델 생성 시점에 import
+        from ultralytics import YOLO
+        self.model = YOLO(model_path)
+        self.names = self.model.names
+
+    @staticmethod
+    def set_threads(threads):
+        import torch
+        torch.set_num_threads(max(1, threads))
+
+    def predict_batch(self, images, conf, iou):
+        results = self.model(list(images), conf=conf, iou=iou, imgsz=MODEL_IMGSZ, verbose=False)
+        # 박스별 tensor 접근 대신 cls / conf 를 배열로 한 번에 가져옴
+        return [
+            (r.boxes.cls.cpu().numpy().astype(np.int64),
+             r.boxes.conf.cpu().numpy().astype(np.float32))
+            for r in results
+        ]
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, model_path, quantize=False):
+        import onnxruntime as ort
+
+        onnx_path = export_onnx(model_path)
+        if quantize:
+            onnx_path = quantize_onnx(onnx_path)
+            self.name = "onnx-int8"
+        self.path = onnx_path
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+        options.inter_op_num_threads = ORT_INTER_OP_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+        # ultralytics export 가 메타데이터에 names / imgsz 를 남김
+        meta = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(meta["names"]) if "names" in meta else {}
+        imgsz = ast.literal_eval(meta["imgsz"]) if "imgsz" in meta else [MODEL_IMGSZ] * 2
+        self.imgsz = (int(imgsz[0]), int(imgsz[1]))
+
+    def _letterbox(self, img):
+        h, w = img.shape[:2]
+        th, tw = self.imgsz
+        scale = min(th / h, tw / w)
+        nh, nw = int(round(h * scale)), int(round(w * scale))
+        canvas = np.full((th, tw, 3), 114, dtype=np.uint8)
+        top, left = (th - nh) // 2, (tw - nw) // 2
+        canvas[top:top + nh, left:left + nw] = cv2.resize(
+            img, (nw, nh), interpolation=cv2.INTER_LINEAR
+        )
+        return canvas
+
+    def predict_batch(self, images, conf, iou):
+        batch = np.stack([self._letterbox(img) for img in images])
+        # BGR HWC uint8 → RGB CHW float32
+        batch = np.ascontiguousarray(batch[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32)
+        batch /= 255.0
+
+        preds = self.session.run(None, {self.input_name: batch})[0]   # (B, 4 + nc, N)
+        return [self._postprocess(p.T, conf, iou) for p in preds]
+
+    @staticmethod
+    def _postprocess(pred, conf, iou):
+        scores = pred[:, 4:]
+        cls_ids = scores.argmax(axis=1)
+        confs = scores[np.arange(len(scores)), cls_ids]
+        keep = confs >= conf
+        if not keep.any():
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        boxes, cls_ids, confs = pred[keep, :4], cls_ids[keep], confs[keep]
+        # xywh(중심) → xywh(좌상단), 클래스별 NMS
+        boxes = np.column_stack([boxes[:, 0] - boxes[:, 2] / 2, boxes[:, 1] - boxes[:, 3] / 2,
+                                 boxes[:, 2], boxes[:, 3]])
+        idx = cv2.dnn.NMSBoxesBatched(
+            boxes.tolist(), confs.tolist(), cls_ids.tolist(), conf, iou, top_k=300
+        )
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+        order = idx[np.argsort(-confs[idx])]
+        return cls_ids[order].astype(np.int64), confs[order].astype(np.float32)
+
+
+# 결정적 가짜 탐지기
+#  - 같은 이미지면 항상 같은 결과 (픽셀 일부의 CRC 를 시드로 사용)
+#  - 지연은 sleep 으로 흉내 (실제 추론처럼 GIL 을 잡지 않음)
+class StubBackend:
+    name = "stub"
+
+    def __init__(self, model_path=None):
+        labels = [l.strip() for l in STUB_LABELS.split(",") if l.strip()]
+        if not labels:
+            from app.services.nutrition_service import nutrition_catalog
+            labels = nutrition_catalog.names()
+        self.names = dict(enumerate(labels))
+        # 실제 가중치처럼 로딩 시 한 번 쓰고 이후엔 읽기만 함
+        self.weights = np.ones(STUB_WEIGHTS_MB * 1024 * 1024, dtype=np.uint8)
+
+    def predict_batch(self, images, conf, iou):
+        time.sleep((STUB_LATENCY_MS + STUB_LATENCY_PER_IMAGE_MS * len(images)) / 1000)
+        outputs = []
+        for img in images:
+            rng = np.random.default_rng(zlib.crc32(np.ascontiguousarray(img[::16, ::16]).data))
+            k = min(STUB_DETECTIONS, len(self.names))
+            cls_ids = rng.choice(len(self.names), size=k, replace=False).astype(np.int64)
+            confs = rng.uniform(0.3, 0.95, size=k).astype(np.float32)
+            keep = confs >= conf
+            outputs.append((cls_ids[keep], confs[keep]))
+        return outputs
+
+
+def export_onnx(model_path):
+    if model_path.endswith(".onnx"):
+        return model_path
+    onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+    if not os.path.exists(onnx_path):
+        from ultralytics import YOLO
+        print(f"[INFO] ONNX export: {onnx_path}")
+        YOLO(model_path).export(format="onnx", imgsz=MODEL_IMGSZ, dynamic=True)
+    return onnx_path
+
+
+def quantize_onnx(onnx_path):
+    int8_path = os.path.splitext(onnx_path)[0] + ".int8.onnx"
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        print(f"[INFO] ONNX int8 양자화: {int8_path}")
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+    return int8_path
+
+
+# 이 개수 이상일 때만 numpy 경로 (적으면 고정 오버헤드 때문에 파이썬 루프가 빠름)
+#   python -m app.benchmarks.postprocess: 5개 7us vs 21us, 50개 부근에서 역전
+DEDUP_VECTORIZE_MIN_BOXES = 40
+
+
+# class 별 최고 신뢰도 1개만 남김 (신뢰도 내림차순, 같으면 class id 순)
+def dedup_max_confidence(cls_ids, confs):
+    if len(cls_ids) == 0:
+        return cls_ids, confs
+    if len(cls_ids) < DEDUP_VECTORIZE_MIN_BOXES:
+        return _dedup_loop(cls_ids, confs)
+    order = np.lexsort((-confs, cls_ids))
+    cls_sorted = cls_ids[order]
+    first = np.flatnonzero(np.r_[True, cls_sorted[1:] != cls_sorted[:-1]])
+    best = order[first]
+    best = best[np.argsort(-confs[best], kind="stable")]
+    return cls_ids[best], confs[best]
+
+
+def _dedup_loop(cls_ids, confs):
+    cls_list, conf_list = cls_ids.tolist(), confs.tolist()
+    best = {}
+    for i, (cls_id, conf) in enumerate(zip(cls_list, conf_list)):
+        j = best.get(cls_id)
+        if j is None or conf > conf_list[j]:
+            best[cls_id] = i
+    keep = sorted(best.values(), key=lambda i: (-conf_list[i], cls_list[i]))
+    return cls_ids[keep], confs[keep]
+
+
+def create_backend(model_path, backend=MODEL_BACKEND):
+    if backend == "torch":
+        return TorchBackend(model_path)
+    if backend == "onnx":
+        return OnnxBackend(model_path)
+    if backend == "onnx-int8":
+        return OnnxBackend(model_path, quantize=True)
+    if backend == "stub":
+        return StubBackend(model_path)
+    raise ValueError(f"알 수 없는 MODEL_BACKEND: {backend}")
+
+
 class FoodAIModel:
-    def __init__(self):
-        model_path = os.getenv("MODEL_PATH")
+    def __init__(self, backend=MODEL_BACKEND):
+        model_path = os.getenv("MODEL_PATH") or ("stub" if backend == "stub" else None)
         if not model_path:
             raise ValueError("MODEL_PATH not found in .env")
-        self.model = YOLO(model_path)
+        self.backend = create_backend(model_path, backend)
+        self.model = getattr(self.backend, "model", None)
+        self.names = self.backend.names
+        self.version = f"{self._model_version(model_path)}-{self.backend.name}"
 
 
-    def predict_foods(self, image_path, conf=0.2, iou=0.3):
-        results = self.model(image_path, conf=conf, iou=iou)
-        detected_boxes = results[0].boxes
+    # 가중치 파일이 바뀌면 달라지는 값 (탐지 캐시 키에 사용)
+    @staticmethod
+    def _model_version(model_path):
+        try:
+            st = os.stat(model_path)
+        except OSError:
+            return os.path.basename(model_path)
+        return f"{os.path.basename(model_path)}-{st.st_size}-{int(st.st_mtime)}"
 
+
+    def _to_foods(self, cls_ids, confs):
         detected_foods = []
-        for box in detected_boxes:
-            cls_id = int(box.cls[0])
-            cls_name = self.model.names[cls_id]
-            conf_score = float(box.conf[0])
+        for cls_id, conf_score in zip(cls_ids.tolist(), confs.tolist()):
             detected_foods.append({
-                "name": cls_name,
+                "name": self.names[cls_id],
+                "class_id": cls_id,
                 "confidence": round(conf_score, 3)
             })
         return detected_foods
+
+
+    def predict_foods(self, image, conf=0.2, iou=0.3):
+        return self.predict_batch([image], conf=conf, iou=iou)[0]
+
+
+    # 여러 이미지를 한 번의 forward 로 처리 (이미지 순서대로 결과 반환)
+    #  dedup=True 면 음식(class)별 최고 신뢰도 탐지 1개만 반환
+    def predict_batch(self, images, conf=0.2, iou=0.3, dedup=False):
+        outputs = self.backend.predict_batch(images, conf, iou)
+        if dedup:
+            outputs = [dedup_max_confidence(c, f) for c, f in outputs]
+        return [self._to_foods(cls_ids, confs) for cls_ids, confs in outputs]
@@ -0,0 +1,307 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select, update
+
+from app.database.connection import AsyncSessionLocal
+from app.database.models.job import AnalysisJobRecord
+
+load_dotenv()
+
+JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", "2"))
+JOB_MAX_QUEUE = int(os.getenv("ANALYSIS_JOB_MAX_QUEUE", "64"))
+# 끝난 작업을 조회용으로 보관하는 시간 / 개수
+JOB_TTL_SECONDS = float(os.getenv("ANALYSIS_JOB_TTL", "3600"))
+JOB_MAX_KEEP = int(os.getenv("ANALYSIS_JOB_MAX_KEEP", "1000"))
+# 다른 워커가 받은 작업의 SSE 는 DB 를 이 간격으로 다시 읽음
+JOB_POLL_SECONDS = float(os.getenv("ANALYSIS_JOB_POLL_SECONDS", "0.5"))
+# DB 에서 만료된 작업을 지우는 최소 간격
+JOB_DB_PRUNE_SECONDS = float(os.getenv("ANALYSIS_JOB_DB_PRUNE_SECONDS", "60"))
+
+FINISHED_STATES = ("done", "failed")
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+# -----------------------------
+# 분석 작업 조회용 (상태 / 결과)
+#  - user_id: 요청한 유저 (조회 / SSE 는 본인만)
+#  - state: queued → running → done / failed
+#  - timings: 단계별 소요 시간 (초)
+# -----------------------------
+class JobView:
+    def __init__(self, job_id, user_id, state, created, finished=None,
+                 timings=None, result=None, error=None):
+        self.id = job_id
+        self.user_id = user_id
+        self.state = state
+        self.created = created
+        self.finished = finished
+        self.timings = timings or {}
+        self.result = result
+        self.error = error
+
+    @classmethod
+    def from_record(cls, row):
+        return cls(row.id, row.user_id, row.state, row.created, row.finished,
+                   row.timings, row.result, row.error)
+
+    @property
+    def done(self):
+        return self.state in FINISHED_STATES
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.state,
+            "created": self.created,
+            "finished": self.finished,
+            "timings": {k: round(v, 4) for k, v in self.timings.items()},
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+# -----------------------------
+# 이 워커가 실행하는 작업 1건
+#  - handler / args 는 메모리에만 (timings 는 handler 가 채움)
+#  - 상태가 바뀔 때마다 구독 큐(SSE)에 스냅샷 전달
+# -----------------------------
+class AnalysisJob(JobView):
+    def __init__(self, handler, args, user_id=None):
+        super().__init__(uuid.uuid4().hex, user_id, "queued", time.time())
+        self._handler = handler
+        self._args = args
+        self._enqueued = time.perf_counter()
+        self._subscribers = []
+
+    def subscribe(self):
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+
+# -----------------------------
+# 작업 큐 (실행은 프로세스별, 상태는 DB 공유)
+#  - submit 은 바로 job 을 반환, 실제 분석은 받은 워커의 태스크가 순서대로 실행
+#  - 상태가 바뀔 때마다 analysis_jobs 테이블 갱신 → 다른 gunicorn 워커도 조회 / SSE 가능
+#  - 이 워커의 작업은 메모리에서 바로 조회 (TTL / 최대 개수 초과 시 오래된 것부터 삭제)
+#  - DB 의 끝난 작업은 TTL 이 지나면 submit 시 삭제 (JOB_DB_PRUNE_SECONDS 간격)
+#  - 큐 길이 / 단계별 평균 지연은 stats() 로 확인 (워커별)
+# -----------------------------
+class AnalysisJobQueue:
+    def __init__(
+        self,
+        workers=JOB_WORKERS,
+        max_queue=JOB_MAX_QUEUE,
+        ttl_seconds=JOB_TTL_SECONDS,
+        max_keep=JOB_MAX_KEEP,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.ttl = ttl_seconds
+        self.max_keep = max_keep
+
+        self._jobs = OrderedDict()   # job_id -> AnalysisJob (생성 순)
+        self._queue = None
+        self._tasks = []
+
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self._stage_totals = {}      # 단계 → [합계, 횟수]
+        self._db_pruned = 0.0
+
+    async def submit(self, handler, *args, user_id=None):
+        if self._queue is not None and self._queue.qsize() >= self.max_queue:
+            raise JobQueueFull()
+
+        self._ensure_workers()
+        self._prune()
+        job = AnalysisJob(handler, args, user_id)
+        async with AsyncSessionLocal() as db:
+            db.add(AnalysisJobRecord(id=job.id, user_id=user_id, state=job.state, created=job.created))
+            await self._prune_db(db)
+            await db.commit()
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    # 이 워커의 작업은 메모리, 아니면 DB 에서 조회
+    #   다른 유저의 작업은 없는 것과 같게 (None)
+    async def get(self, job_id, user_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self._load(job_id, user_id)
+        if job.user_id != user_id:
+            return None
+        return job
+
+    # SSE 용: 현재 스냅샷 → 상태가 바뀔 때마다 스냅샷, keepalive 초 동안 변화가 없으면 None
+    #   이 워커의 작업은 구독 큐, 다른 워커의 작업은 JOB_POLL_SECONDS 간격으로 DB 조회
+    async def watch(self, job, keepalive):
+        snapshot = job.to_dict()
+        yield snapshot
+        if isinstance(job, AnalysisJob):
+            queue = job.subscribe()
+            try:
+                while not job.done:
+                    try:
+                        yield await asyncio.wait_for(queue.get(), keepalive)
+                    except asyncio.TimeoutError:
+                        yield None
+            finally:
+                job.unsubscribe(queue)
+            return
+
+        idle = 0.0
+        while snapshot["status"] not in FINISHED_STATES:
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            current = await self._load(job.id, job.user_id)
+            if current is None:
+                return
+            if current.state != snapshot["status"]:
+                snapshot = current.to_dict()
+                idle = 0.0
+                yield snapshot
+                continue
+            idle += JOB_POLL_SECONDS
+            if idle >= keepalive:
+                idle = 0.0
+                yield None
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "max_queue": self.max_queue,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "stored": len(self._jobs),
+            "avg_stage_seconds": {
+                stage: round(total / count, 4)
+                for stage, (total, count) in self._stage_totals.items()
+            },
+        }
+
+    # 끝나지 않은 작업은 DB 에 failed 로 남김 (다른 워커에서 계속 queued 로 보이지 않도록)
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._queue = None
+        for job in list(self._jobs.values()):
+            if not job.done:
+                job.error = {"status": 503, "detail": "서버가 종료되어 분석이 취소되었습니다."}
+                await self._set_state(job, "failed")
+
+    # -----------------------------
+    # 내부 구현
+    # -----------------------------
+    def _ensure_workers(self):
+        self._tasks = [t for t in self._tasks if not t.done()]
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        while len(self._tasks) < self.workers:
+            self._tasks.append(loop.create_task(self._worker()))
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.timings["queue_wait"] = time.perf_counter() - job._enqueued
+            self.running += 1
+            await self._set_state(job, "running")
+            started = time.perf_counter()
+            try:
+                job.result = await job._handler(*job._args, timings=job.timings)
+                self.completed += 1
+                state = "done"
+            except HTTPException as e:
+                job.error = {"status": e.status_code, "detail": e.detail}
+                self.failed += 1
+                state = "failed"
+            except Exception as e:
+                print(f"[WARN] 분석 작업 실패 ({job.id}): {e!r}")
+                job.error = {"status": 500, "detail": "분석 중 오류가 발생했습니다."}
+                self.failed += 1
+                state = "failed"
+            finally:
+                self.running -= 1
+                job._args = None   # 업로드 버퍼 등은 바로 해제
+
+            job.timings["total"] = time.perf_counter() - started
+            for stage, seconds in job.timings.items():
+                totals = self._stage_totals.setdefault(stage, [0.0, 0])
+                totals[0] += seconds
+                totals[1] += 1
+            await self._set_state(job, state)
+
+    # 상태 변경: DB 갱신 후 구독자에게 전달
+    #   DB 갱신이 실패해도 이 워커의 조회 / SSE 는 계속 동작
+    async def _set_state(self, job, state):
+        job.state = state
+        if job.done:
+            job.finished = time.time()
+        snapshot = job.to_dict()
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(AnalysisJobRecord)
+                    .where(AnalysisJobRecord.id == job.id)
+                    .values(state=state, finished=job.finished, timings=snapshot["timings"],
+                            result=job.result, error=job.error)
+                )
+                await db.commit()
+        except Exception as e:
+            print(f"[WARN] 분석 작업 상태 저장 실패 ({job.id}): {e!r}")
+        for queue in job._subscribers:
+            queue.put_nowait(snapshot)
+
+    async def _load(self, job_id, user_id):
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(AnalysisJobRecord).where(
+                    AnalysisJobRecord.id == job_id, AnalysisJobRecord.user_id == user_id
+                )
+            )).scalar_one_or_none()
+        return JobView.from_record(row) if row is not None else None
+
+    async def _prune_db(self, db):
+        now = time.time()
+        if now - self._db_pruned < JOB_DB_PRUNE_SECONDS:
+            return
+        self._db_pruned = now
+        # 끝난 작업은 finished, 멈춘 작업 (워커 강제 종료 등) 은 created 기준
+        await db.execute(
+            delete(AnalysisJobRecord).where(
+                func.coalesce(AnalysisJobRecord.finished, AnalysisJobRecord.created) < now - self.ttl
+            )
+        )
+
+    def _prune(self):
+        now = time.time()
+        while self._jobs:
+            job = next(iter(self._jobs.values()))
+            expired = job.done and now - job.finished > self.ttl
+            if not expired and len(self._jobs) < self.max_keep:
+                break
+            if not job.done:
+                # 가장 오래된 작업이 아직 실행 중이면 삭제하지 않음
+                break
+            self._jobs.pop(job.id)
+
+
+analysis_jobs = AnalysisJobQueue()
@@ -0,0 +1,152 @@
+from datetime import date, timedelta
+
+from sqlalchemy import case, insert, select
+from sqlalchemy.orm import Session
+
+from app.database.models.intake import DailyIntake, PeriodIntake
+from app.services.meal_queries import daily_totals
+
+
+def get_daily_intake(db: Session, user_id: int, day: str):
+    return (
+        db.query(DailyIntake)
+        .filter(DailyIntake.user_id == user_id, DailyIntake.date == day)
+        .first()
+    )
+
+
+# 그날 저장된 식사 수 (식사가 저장될 때마다 같은 트랜잭션에서 증가)
+#   대시보드 / 식단 리스트 응답 캐시 키의 버전으로 사용
+def day_meal_count(user_id: int, day: str):
+    return select(DailyIntake.meal_count).where(
+        DailyIntake.user_id == user_id, DailyIntake.date == day
+    )
+
+
+def period_starts(day):
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    week = day - timedelta(days=day.weekday())
+    return {"week": week.isoformat(), "month": day.replace(day=1).isoformat()}
+
+
+PERIOD_COLUMNS = ("meal_count", "total_calories", "carbohydrate", "protein", "fat", "sugar")
+
+
+# INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col
+#   읽고 더해서 쓰는 대신 DB 가 한 문장으로 더하므로 동시 저장에도 누락 없음
+#   (SQLite 는 SELECT ... FOR UPDATE 잠금이 없음)
+def _upsert_add(db: Session, model, keys, values, conflict):
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    table = model.__table__
+    stmt = dialect_insert(table).values(**keys, **values)
+    if dialect == "mysql":
+        added = stmt.inserted
+        return db.execute(stmt.on_duplicate_key_update(
+            {name: table.c[name] + added[name] for name in values}
+        ))
+    added = stmt.excluded
+    return db.execute(stmt.on_conflict_do_update(
+        index_elements=conflict,
+        set_={name: table.c[name] + added[name] for name in values},
+    ))
+
+
+# MealReport 저장과 같은 트랜잭션 안에서 호출 (commit 은 호출한 쪽에서)
+#   일 / 주 / 월 누적을 함께 갱신
+def add_meal_to_daily_intake(
+    db: Session, user_id: int, day: str,
+    calories: float, carbohydrate: float, protein: float, fat: float, sugar: float,
+    meals: int = 1,
+):
+    values = dict(zip(PERIOD_COLUMNS, (meals, calories, carbohydrate, protein, fat, sugar)))
+    _upsert_add(
+        db, DailyIntake, {"user_id": user_id, "date": day}, values, ["user_id", "date"]
+    )
+
+    # 이 날의 첫 식사면 day_count +1
+    #   위 upsert 로 이 트랜잭션이 일별 행을 잡고 있으므로 갱신 후 meal_count == meals 인 쪽은 하나뿐
+    first_meal_of_day = (
+        select(case((DailyIntake.meal_count == meals, 1), else_=0))
+        .where(DailyIntake.user_id == user_id, DailyIntake.date == day)
+        .scalar_subquery()
+    )
+    for period, start in period_starts(day).items():
+        _upsert_add(
+            db, PeriodIntake,
+            {"user_id": user_id, "period": period, "start": start},
+            {"day_count": first_meal_of_day, **values},
+            ["user_id", "period", "start"],
+        )
+
+
+# -----------------------------
+# 기존 MealReport 로부터 전체 재계산 (백필용)
+#   python -m app.services.daily_intake
+# -----------------------------
+# INSERT INTO daily_intakes ... SELECT ... FROM meal_reports GROUP BY user_id, date
+def insert_daily_totals():
+    totals = daily_totals().subquery()
+    columns = ["user_id", "date", *PERIOD_COLUMNS]
+    return insert(DailyIntake).from_select(
+        columns, select(*(totals.c[name] for name in columns))
+    )
+
+
+def rebuild_daily_intake(db: Session):
+    db.query(DailyIntake).delete()
+    result = db.execute(insert_daily_totals())
+    rebuild_period_intakes(db)
+    db.commit()
+    return result.rowcount
+
+
+# (user_id, date, *PERIOD_COLUMNS) 일별 행 → period_intakes insert 용 dict 목록
+#   날짜 → 주 / 월 변환이 DB 마다 달라 집계는 파이썬에서 (일별 행 수만큼만 읽음)
+def period_rows(daily_rows):
+    periods = {}
+    for user_id, day, *values in daily_rows:
+        for period, start in period_starts(day).items():
+            acc = periods.setdefault((user_id, period, start), [0] * (len(PERIOD_COLUMNS) + 1))
+            acc[0] += 1
+            for i, value in enumerate(values, start=1):
+                acc[i] += value or 0
+
+    return [
+        {"user_id": user_id, "period": period, "start": start,
+         "day_count": acc[0], **dict(zip(PERIOD_COLUMNS, acc[1:]))}
+        for (user_id, period, start), acc in periods.items()
+    ]
+
+
+# 주 / 월 누적을 daily_intakes 로부터 다시 계산 (commit 은 호출한 쪽에서)
+def rebuild_period_intakes(db: Session):
+    rows = period_rows(db.execute(select(
+        DailyIntake.user_id, DailyIntake.date,
+        *(getattr(DailyIntake, c) for c in PERIOD_COLUMNS),
+    )).all())
+
+    db.query(PeriodIntake).delete()
+    if rows:
+        db.execute(insert(PeriodIntake), rows)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from app.database.connection import Base, SessionLocal, engine
+    from app.database.models import user  # noqa: F401  (users FK 대상)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        count = rebuild_daily_intake(db)
+        print(f"[INFO] daily_intakes 재계산 완료 ({count}건)")
+    finally:
+        db.close()
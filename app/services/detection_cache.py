@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_MAX_ENTRIES = int(os.getenv("DETECTION_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("DETECTION_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.getenv("DETECTION_CACHE_TTL", str(24 * 3600)))
+# 비워두면 디스크 계층 사용 안 함 (예: ./app/data/detection_cache.sqlite3)
+CACHE_DISK_PATH = os.getenv("DETECTION_CACHE_PATH", "")
+
+
+# 저장 형식이 바뀌면 올림 (이전 형식 항목은 자연히 miss)
+CACHE_FORMAT = 2
+
+
+def make_cache_key(image_hash, model_version, conf, iou):
+    return f"v{CACHE_FORMAT}:{image_hash}:{model_version}:{conf:g}:{iou:g}"
+
+
+# -----------------------------
+# 탐지 결과 캐시
+#  - 메모리: LRU + TTL, 항목 수 / 바이트 상한
+#  - 디스크(선택): SQLite, 재시작 후에도 유지
+#  get / put 은 메모리만, load / store 는 디스크 I/O 포함 (스레드 풀에서 호출)
+# -----------------------------
+class DetectionCache:
+    def __init__(
+        self,
+        max_entries=CACHE_MAX_ENTRIES,
+        max_bytes=CACHE_MAX_BYTES,
+        ttl_seconds=CACHE_TTL_SECONDS,
+        disk_path=CACHE_DISK_PATH,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+
+        self._entries = OrderedDict()   # key -> (expires_at, size, detections)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS detections ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @property
+    def has_disk(self):
+        return self._db is not None
+
+    # -----------------------------
+    # 메모리 계층
+    # -----------------------------
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < now:
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return entry[2]
+
+    def put(self, key, detections, expires_at=None):
+        size = len(json.dumps(detections, ensure_ascii=False))
+        if size > self.max_bytes:
+            return
+        expires_at = expires_at or time.time() + self.ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, detections)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    # -----------------------------
+    # 디스크 계층 (블로킹 I/O)
+    # -----------------------------
+    def load(self, key):
+        if self._db is None:
+            return None
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or row[1] < time.time():
+            self.misses += 1
+            return None
+
+        detections = json.loads(row[0])
+        self.disk_hits += 1
+        self.put(key, detections, expires_at=row[1])
+        return detections
+
+    def store(self, key, detections):
+        self.put(key, detections)
+        if self._db is None:
+            return
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO detections (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(detections, ensure_ascii=False), time.time() + self.ttl),
+            )
+            self._db.execute("DELETE FROM detections WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    def record_miss(self):
+        self.misses += 1
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0,
+        }
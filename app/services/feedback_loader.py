@@ -1,17 +1,176 @@
 import json
 import os
+import threading
+import time
 
 FEEDBACK_PATH = os.path.join("app", "data", "feedback.json")
+# 파일 변경 확인(stat) 최소 간격
+FEEDBACK_RELOAD_INTERVAL = float(os.getenv("FEEDBACK_RELOAD_INTERVAL", "1.0"))
 
-recommendation_detail = {}
-
-try:
-    with open(FEEDBACK_PATH, "r", encoding="utf-8") as f:
-        recommendation_detail = json.load(f)
-    print("📁 feedback.json 로딩 완료")
-except FileNotFoundError:
-    print(f"⚠️ feedback.json 파일을 찾을 수 없습니다: {FEEDBACK_PATH}")
-except json.JSONDecodeError:
-    print("⚠️ feedback.json 형식 오류 (JSONDecodeError)")
-except Exception as e:
-    print(f"⚠️ feedback.json 로딩 실패: {e}")
+MEAL_TIMES = ("breakfast", "lunch", "dinner")
+ALL_MEALS = "all"
+# 대체식은 항목당 최대 2개만 사용
+MAX_SUBSTITUTES = 2
+LOOKUP_SAMPLE_EVERY = 16
+
+
+class FeedbackCatalogError(ValueError):
+    pass
+
+
+# -----------------------------
+# feedback.json 스키마 검사
+#   { nutrient: { level: { breakfast|lunch|dinner|all: [문자열, ...] } } }
+#   문제를 모두 모아 한 번에 보고
+# -----------------------------
+def validate_feedback(raw):
+    errors = []
+    if not isinstance(raw, dict):
+        raise FeedbackCatalogError("최상위는 객체여야 합니다.")
+
+    for nutrient, levels in raw.items():
+        if not isinstance(levels, dict) or not levels:
+            errors.append(f"{nutrient}: 단계(level) 객체가 필요합니다.")
+            continue
+        for level, sets in levels.items():
+            where = f"{nutrient}.{level}"
+            if not isinstance(sets, dict) or not sets:
+                errors.append(f"{where}: 식사 시간 객체가 필요합니다.")
+                continue
+            for meal_time, items in sets.items():
+                if meal_time not in MEAL_TIMES and meal_time != ALL_MEALS:
+                    errors.append(f"{where}.{meal_time}: 알 수 없는 식사 시간")
+                elif not isinstance(items, list) or not items:
+                    errors.append(f"{where}.{meal_time}: 비어 있지 않은 목록이 필요합니다.")
+                elif not all(isinstance(i, str) and i.strip() for i in items):
+                    errors.append(f"{where}.{meal_time}: 항목은 빈 문자열이 아니어야 합니다.")
+
+    if errors:
+        raise FeedbackCatalogError("; ".join(errors))
+
+
+# (nutrient, level, meal_time) → 대체식 목록, "all" 대체는 미리 반영
+def build_index(raw):
+    index = {}
+    for nutrient, levels in raw.items():
+        for level, sets in levels.items():
+            fallback = sets.get(ALL_MEALS)
+            for meal_time in (*MEAL_TIMES, ALL_MEALS):
+                items = sets.get(meal_time, fallback)
+                if items is not None:
+                    index[(nutrient, level, meal_time)] = items[:MAX_SUBSTITUTES]
+    return index
+
+
+# -----------------------------
+# 대체식 카탈로그
+#  - 로딩 시 스키마 검사 + 평탄화된 인덱스 생성
+#  - 파일 mtime 이 바뀌면 새 인덱스를 만든 뒤 통째로 교체 (검사 실패 시 기존 유지)
+# -----------------------------
+class FeedbackCatalog:
+    def __init__(self, path=FEEDBACK_PATH, reload_interval=FEEDBACK_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.data = {}
+        self._index = {}
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+        self.loaded_at = None
+        self.reloads = 0
+        self.last_reload_ms = None
+        self.last_error = None
+        self.lookups = 0
+        self.sampled_lookups = 0
+        self.lookup_ns = 0
+
+        try:
+            self.reload()
+            print("📁 feedback.json 로딩 완료")
+        except FileNotFoundError:
+            self.last_error = "file not found"
+            print(f"⚠️ feedback.json 파일을 찾을 수 없습니다: {self.path}")
+        except (ValueError, OSError) as e:
+            # JSONDecodeError / FeedbackCatalogError 포함, 파일이 고쳐지면 리로드됨
+            self.last_error = str(e)
+            self._mtime = self._current_mtime()
+            print(f"⚠️ feedback.json 로딩 실패: {e}")
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def reload(self):
+        started = time.perf_counter()
+        mtime = self._current_mtime()
+        with open(self.path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        validate_feedback(raw)
+        index = build_index(raw)
+
+        with self._lock:
+            self.data = raw
+            self._index = index
+            self._mtime = mtime
+        self.loaded_at = time.time()
+        self.reloads += 1
+        self.last_reload_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.last_error = None
+
+    # 파일이 바뀌었으면 리로드 (stat 은 reload_interval 에 최대 1번)
+    #   리포트 1건당 1번 호출하고 그 뒤 lookup 은 dict 조회만 함
+    def refresh(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return
+        try:
+            self.reload()
+            print("[INFO] feedback.json 리로드 완료")
+        except (ValueError, OSError) as e:
+            # 잘못된 파일이면 기존 인덱스를 그대로 사용
+            print(f"[WARN] feedback.json 리로드 실패: {e}")
+            self.last_error = str(e)
+            self._mtime = mtime
+
+    def lookup(self, nutrient, level, meal_time):
+        if meal_time not in MEAL_TIMES:
+            meal_time = ALL_MEALS
+        key = (nutrient, level, meal_time)
+
+        # 조회 시간은 LOOKUP_SAMPLE_EVERY 번에 1번만 측정
+        self.lookups += 1
+        if self.lookups % LOOKUP_SAMPLE_EVERY:
+            return self._index.get(key)
+        started = time.perf_counter_ns()
+        items = self._index.get(key)
+        self.lookup_ns += time.perf_counter_ns() - started
+        self.sampled_lookups += 1
+        return items
+
+    def __contains__(self, nutrient):
+        return nutrient in self.data
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "entries": len(self._index),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "last_reload_ms": self.last_reload_ms,
+            "last_error": self.last_error,
+            "lookups": self.lookups,
+            "avg_lookup_us": (
+                round(self.lookup_ns / self.sampled_lookups / 1000, 3) if self.sampled_lookups else 0
+            ),
+        }
+
+
+feedback_catalog = FeedbackCatalog()
@@ -0,0 +1,129 @@
+import operator
+
+# -----------------------------
+# 피드백 / 대체식 / 운동 추천 규칙표
+#  - 기준값 / 단계 / 문구는 여기서만 수정
+#  - 문구 템플릿 / 기준값은 모듈 로딩 시 compile_rules() 로 조회용 구조로 1회 변환
+# -----------------------------
+
+# 영양소별 문구 (주어는 조사까지 포함)
+NUTRIENTS = {
+    "protein": {"subject": "단백질이", "name": "단백질"},
+    "carbohydrates": {"subject": "탄수화물이", "name": "탄수화물"},
+    "fat": {"subject": "지방이", "name": "지방"},
+    "sugars": {"subject": "당류가", "name": "당류"},
+}
+
+# 코칭 문구: 권장량 대비 ±pct % 를 넘으면 출력 (퍼센트 절대값 상위 TOP_K 개만)
+TOP_K = 2
+COACH_RULE = {
+    "pct": 10,
+    "low": "{subject} 권장량 대비 {pct}% 부족해요.",
+    "high": "{subject} 권장량 대비 {pct}% 많아요.",
+}
+
+# 대체식 라벨 (부족 / 과다)
+SUBSTITUTE_LABEL = {"low": "{name} 보충", "high": "{name} 줄이기"}
+
+# 대체식 단계: g 차이가 low 미만이면 low_mild, high 초과면 high
+DETAIL_THRESHOLDS_G = {
+    "protein": {"low": -10, "high": 10},
+    "carbohydrates": {"low": -20, "high": 20},
+    "fat": {"low": -5, "high": 7},
+    "sugars": {"low": -5, "high": 10},
+}
+DETAIL_LEVELS = {"low": "low_mild", "high": "high"}
+
+# 운동 추천: 활동량 보정 후 칼로리 차이(adj)로 위에서부터 첫 번째 일치 규칙 사용
+#   messages 는 활동량별 문구, "*" 는 나머지 활동량
+ACTIVITY_BONUS = {
+    "sedentary": -50,
+    "low-active": 0,
+    "active": 50,
+    "very-active": 100,
+}
+EXERCISE_RULES = [
+    # 과다 섭취
+    {"when": (">", 500), "messages": {
+        "sedentary": "칼로리 섭취가 많이 높아요! 40–50분 빠르게 걷기 또는 가벼운 조깅을 추천해요.",
+        "low-active": "칼로리 섭취가 많이 높아요! 40–50분 빠르게 걷기 또는 가벼운 조깅을 추천해요.",
+        "*": "칼로리가 많이 높아요! 30–40분 러닝이나 인터벌 걷기를 추천해요.",
+    }},
+    {"when": (">", 250), "messages": {
+        "sedentary": "칼로리가 조금 높아요. 25–30분 빠르게 걷기만 해줘도 충분해요.",
+        "low-active": "20–25분 가벼운 조깅이나 빠른 걷기를 추천해요.",
+        "*": "20–30분 조깅 또는 사이클을 추천해요.",
+    }},
+    # 정상 범위
+    {"when": ("between", -200, 200), "messages": {
+        "sedentary": "칼로리는 적절해요! 15–20분 산책 정도면 충분해요.",
+        "*": "칼로리는 적절해요! 20–30분 가벼운 유산소를 추천해요.",
+    }},
+    # 부족
+    {"when": ("<", -500), "messages": {
+        "*": "칼로리가 많이 부족한 날이에요. 피로 누적될 수 있어 운동은 최소화하고 스트레칭 정도만 해주세요.",
+    }},
+    {"when": ("<", -250), "messages": {
+        "*": "칼로리가 조금 부족해요. 무리한 운동은 피하고 10–15분 가벼운 산책만 추천해요.",
+    }},
+]
+EXERCISE_DEFAULT = "칼로리 차이가 크지 않아 특별한 조정은 필요 없어요. 15–20분 가벼운 활동이면 충분해요."
+
+
+_OPS = {">": operator.gt, "<": operator.lt}
+
+
+def _matches(when, value):
+    if when[0] == "between":
+        return when[1] <= value <= when[2]
+    return _OPS[when[0]](value, when[1])
+
+
+def _split_template(template, nutrient):
+    prefix, suffix = template.format(pct="\0", **nutrient).split("\0")
+    return prefix, suffix
+
+
+# 운동 규칙: 위에서부터 첫 번째로 맞는 규칙의 (활동량별 문구, 기본 문구)
+#   규칙이 5개뿐이라 순서대로 비교 (NaN 은 어떤 규칙에도 맞지 않아 기본 문구)
+def match_exercise(adj):
+    for rule in EXERCISE_RULES:
+        if _matches(rule["when"], adj):
+            return rule["messages"], rule["messages"].get("*")
+    return {}, EXERCISE_DEFAULT
+
+
+class CompiledRules:
+    def __init__(self):
+        # nutrient → ((부족 앞, 뒤), (과다 앞, 뒤)) : 앞 + 수치 + 뒤
+        self.coach = {
+            n: (_split_template(COACH_RULE["low"], v), _split_template(COACH_RULE["high"], v))
+            for n, v in NUTRIENTS.items()
+        }
+        self.coach_pct = COACH_RULE["pct"]
+        # nutrient → (보충 라벨, 줄이기 라벨)
+        self.substitute_labels = {
+            n: (SUBSTITUTE_LABEL["low"].format(**v), SUBSTITUTE_LABEL["high"].format(**v))
+            for n, v in NUTRIENTS.items()
+        }
+        # nutrient → (low 기준, high 기준)
+        self.detail_thresholds = {
+            n: (t["low"], t["high"]) for n, t in DETAIL_THRESHOLDS_G.items()
+        }
+
+
+def compile_rules():
+    return CompiledRules()
+
+
+RULES = compile_rules()
+
+
+# 퍼센트 절대값 기준 상위 k 개 (코칭 문구 / 대체식이 같은 결과를 공유)
+#   항목이 5개뿐이라 heap 보다 정렬이 빠름, 동점은 입력 순서 유지
+def top_deviations(diff_pct_map, k=TOP_K):
+    return sorted(diff_pct_map.items(), key=_abs_value, reverse=True)[:k]
+
+
+def _abs_value(item):
+    return abs(item[1])
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+
+from app.services.metrics import observe_stage, registry
+from app.services.image_preprocess import ORIENTATION_OPS, reduce_flag, read_header
+from app.services.upload_service import UPLOAD_DIR, UPLOAD_URL_PREFIX, write_atomic
+
+load_dotenv()
+
+
+def _parse_sizes(raw):
+    sizes = {}
+    for part in raw.split(","):
+        name, _, px = part.strip().partition(":")
+        if name and px.isdigit() and int(px) > 0:
+            sizes[name] = int(px)
+    return sizes
+
+
+# 파생 이미지 이름 → 긴 변 픽셀 (예: "thumb:320,preview:1024")
+THUMBNAIL_SIZES = _parse_sizes(os.getenv("THUMBNAIL_SIZES", "thumb:320,preview:1024"))
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "webp").lower()   # webp | jpeg
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+# 목록 화면(/meal/list, /meal/history)에 쓰는 크기
+LIST_IMAGE_SIZE = os.getenv("THUMBNAIL_LIST_SIZE", "thumb")
+# 백그라운드 생성 스레드 수 (요청 처리용 스레드 풀과 분리)
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+# 대기 + 실행 중 작업 최대 수 (작업마다 업로드 원본 버퍼를 들고 있으므로 제한)
+THUMBNAIL_MAX_PENDING = int(os.getenv("THUMBNAIL_MAX_PENDING", "32"))
+
+if THUMBNAIL_FORMAT not in ("webp", "jpeg"):
+    print(f"[WARN] 지원하지 않는 THUMBNAIL_FORMAT={THUMBNAIL_FORMAT}, webp 사용")
+    THUMBNAIL_FORMAT = "webp"
+
+_EXT = ".webp" if THUMBNAIL_FORMAT == "webp" else ".jpg"
+_ENCODE_PARAMS = (
+    [cv2.IMWRITE_WEBP_QUALITY, THUMBNAIL_QUALITY] if THUMBNAIL_FORMAT == "webp"
+    else [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+)
+
+# 업로드 URL: /static/uploads/{sha256}{ext}
+_UPLOAD_NAME = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+$")
+
+
+def derivative_filename(sha256, size):
+    return f"{sha256}_{size}{_EXT}"
+
+
+def derivative_path(sha256, size):
+    return os.path.join(UPLOAD_DIR, derivative_filename(sha256, size))
+
+
+# 있는 것으로 확인된 파생 파일 (파일은 지워지지 않으므로 양성 결과만 기억)
+_known = set()
+_known_lock = threading.Lock()
+
+
+def _exists(path):
+    if path in _known:
+        return True
+    if os.path.exists(path):
+        with _known_lock:
+            _known.add(path)
+        return True
+    return False
+
+
+# -----------------------------
+# 원본 URL → 크기별 URL
+#  - 파생 파일이 아직 없으면 (예전 업로드) 원본 URL 그대로
+# -----------------------------
+def derivative_url(image_url, size):
+    if not image_url or size not in THUMBNAIL_SIZES:
+        return image_url
+    prefix, _, name = image_url.rpartition("/")
+    match = _UPLOAD_NAME.match(name)
+    if prefix != UPLOAD_URL_PREFIX or not match:
+        return image_url
+    sha256 = match.group(1)
+    if not _exists(derivative_path(sha256, size)):
+        return image_url
+    return f"{UPLOAD_URL_PREFIX}/{derivative_filename(sha256, size)}"
+
+
+def image_urls(image_url):
+    return {size: derivative_url(image_url, size) for size in THUMBNAIL_SIZES}
+
+
+# -----------------------------
+# 업로드 1장 → 크기별 파생 이미지 (스레드 풀에서 호출)
+#  - 가장 큰 크기 기준으로 IMREAD_REDUCED_* 디코드 1회 + EXIF 방향 보정
+#  - 큰 크기부터 INTER_AREA 로 차례로 줄여 인코딩
+#  - 이미 있는 크기는 건너뜀 (같은 해시 = 같은 결과)
+# -----------------------------
+def create_derivatives(sha256, content):
+    missing = {
+        size: px for size, px in THUMBNAIL_SIZES.items()
+        if not _exists(derivative_path(sha256, size))
+    }
+    if not missing:
+        return 0
+
+    header_size, orientation = read_header(content)
+    _, flag = reduce_flag(header_size, max(missing.values()))
+    img = cv2.imdecode(np.frombuffer(content, np.uint8), flag | cv2.IMREAD_IGNORE_ORIENTATION)
+    if img is None:
+        return 0
+    op = ORIENTATION_OPS.get(orientation)
+    if op is not None:
+        img = op(img)
+
+    written = 0
+    for size, px in sorted(missing.items(), key=lambda item: -item[1]):
+        h, w = img.shape[:2]
+        if max(h, w) > px:
+            scale = px / max(h, w)
+            img = cv2.resize(
+                img, (max(1, round(w * scale)), max(1, round(h * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+        ok, encoded = cv2.imencode(_EXT, img, _ENCODE_PARAMS)
+        if not ok:
+            print(f"[WARN] 썸네일 인코딩 실패: {sha256} {size}")
+            continue
+        path = derivative_path(sha256, size)
+        write_atomic(path, encoded.tobytes())
+        with _known_lock:
+            _known.add(path)
+        written += 1
+    return written
+
+
+# 요청 흐름에서 호출: 실패해도 분석 결과에는 영향 없음 (원본 URL 로 대체됨)
+def ensure_derivatives(upload):
+    try:
+        return create_derivatives(upload.sha256, upload.content)
+    except Exception as e:
+        print(f"[WARN] 썸네일 생성 실패 ({upload.sha256}): {e!r}")
+        return 0
+
+
+# -----------------------------
+# 리포트 저장 후 호출: 응답은 생성을 기다리지 않음
+#  - 끝나기 전까지 derivative_url 은 원본 URL 을 돌려줌
+#  - 전용 스레드 풀 (THUMBNAIL_WORKERS) 에서 실행, 소요 시간은 thumbnails 단계로 기록
+#  - 실행 중인 작업은 _pending 에 보관 (GC 방지), 종료 시 drain 으로 마무리
+#  - 이미 THUMBNAIL_MAX_PENDING 개가 밀려 있으면 버림 (원본 URL 로 대체, backfill 로 나중에 생성 가능)
+# -----------------------------
+_executor = None
+_pending = set()
+
+THUMBNAILS_DROPPED = registry.counter(
+    "thumbnails_dropped_total", "Background thumbnail jobs dropped because the queue was full."
+)
+
+
+def _generate(upload):
+    started = time.perf_counter()
+    ensure_derivatives(upload)
+    observe_stage("thumbnails", time.perf_counter() - started)
+
+
+def generate_in_background(upload):
+    global _executor
+    if all(_exists(derivative_path(upload.sha256, size)) for size in THUMBNAIL_SIZES):
+        return None
+    if len(_pending) >= THUMBNAIL_MAX_PENDING:
+        THUMBNAILS_DROPPED.inc()
+        return None
+    if _executor is None:
+        _executor = ThreadPoolExecutor(THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+    task = asyncio.get_running_loop().run_in_executor(_executor, _generate, upload)
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+    return task
+
+
+async def drain():
+    if _pending:
+        await asyncio.gather(*_pending, return_exceptions=True)
+
+
+def pending():
+    return len(_pending)
+
+
+# -----------------------------
+# 기존 업로드 일괄 생성
+#   python -m app.services.image_derivatives
+# -----------------------------
+def backfill():
+    created = 0
+    for name in sorted(os.listdir(UPLOAD_DIR)):
+        match = _UPLOAD_NAME.match(name)
+        if not match:
+            continue
+        with open(os.path.join(UPLOAD_DIR, name), "rb") as f:
+            content = f.read()
+        try:
+            created += create_derivatives(match.group(1), content)
+        except Exception as e:
+            print(f"[WARN] 썸네일 생성 실패 ({name}): {e!r}")
+    print(f"[INFO] 썸네일 {created}개 생성")
+
+
+if __name__ == "__main__":
+    backfill()
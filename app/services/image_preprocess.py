@@ -0,0 +1,133 @@
+import io
+import os
+import threading
+from collections import defaultdict
+
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 모델 입력 크기 (전처리 / 추론 백엔드 / 워밍업이 모두 이 값을 import)
+MODEL_IMGSZ = int(os.getenv("MODEL_IMGSZ", "640"))
+# 풀에 보관할 shape 별 최대 버퍼 수
+BUFFER_POOL_SIZE = int(os.getenv("IMAGE_BUFFER_POOL_SIZE", "4"))
+
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# EXIF Orientation(0x0112) → 보정 동작
+ORIENTATION_OPS = {
+    2: lambda im: cv2.flip(im, 1),
+    3: lambda im: cv2.rotate(im, cv2.ROTATE_180),
+    4: lambda im: cv2.flip(im, 0),
+    5: lambda im: cv2.flip(cv2.rotate(im, cv2.ROTATE_90_CLOCKWISE), 1),
+    6: lambda im: cv2.rotate(im, cv2.ROTATE_90_CLOCKWISE),
+    7: lambda im: cv2.flip(cv2.rotate(im, cv2.ROTATE_90_COUNTERCLOCKWISE), 1),
+    8: lambda im: cv2.rotate(im, cv2.ROTATE_90_COUNTERCLOCKWISE),
+}
+
+
+# -----------------------------
+# 리사이즈 결과용 버퍼 풀
+#  - 추론이 끝나면 release 로 돌려받아 다음 요청에서 재사용
+# -----------------------------
+class BufferPool:
+    def __init__(self, per_shape=BUFFER_POOL_SIZE):
+        self.per_shape = per_shape
+        self._free = defaultdict(list)
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape):
+        with self._lock:
+            free = self._free.get(shape)
+            if free:
+                self.reuses += 1
+                return free.pop()
+            self.allocations += 1
+        return np.empty(shape, dtype=np.uint8)
+
+    def release(self, buf):
+        with self._lock:
+            free = self._free[buf.shape]
+            if len(free) < self.per_shape:
+                free.append(buf)
+
+
+buffer_pool = BufferPool()
+
+
+class PreparedImage:
+    __slots__ = ("array", "original_size", "_pooled")
+
+    def __init__(self, array, original_size, pooled=False):
+        self.array = array
+        self.original_size = original_size   # (w, h), EXIF 보정 전
+        self._pooled = pooled
+
+    def release(self):
+        if self._pooled:
+            buffer_pool.release(self.array)
+            self._pooled = False
+
+
+def read_header(content):
+    # 픽셀 디코드 없이 크기 / EXIF 방향만 읽음 (Pillow 는 lazy 로딩)
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(content)) as im:
+            orientation = im.getexif().get(0x0112, 1)
+            return im.size, orientation
+    except Exception:
+        return None, 1
+
+
+def reduce_flag(size, target):
+    if size is None:
+        return 1, cv2.IMREAD_COLOR
+    longest = max(size)
+    for factor, flag in _REDUCED_FLAGS:
+        if longest // factor >= target:
+            return factor, flag
+    return 1, cv2.IMREAD_COLOR
+
+
+# -----------------------------
+# 디코드 + 축소 + 방향 보정
+#  1) 헤더로 원본 크기 확인 → JPEG 은 IMREAD_REDUCED_* 로 디코드 단계에서 1/2~1/8 축소
+#  2) 긴 변이 target 보다 크면 풀 버퍼에 INTER_AREA 리사이즈
+#  3) EXIF Orientation 적용
+# -----------------------------
+def prepare_image(content, target=MODEL_IMGSZ):
+    size, orientation = read_header(content)
+    _, flag = reduce_flag(size, target)
+
+    np_buf = np.frombuffer(content, np.uint8)
+    img = cv2.imdecode(np_buf, flag | cv2.IMREAD_IGNORE_ORIENTATION)
+    if img is None:
+        return None
+
+    pooled = False
+    h, w = img.shape[:2]
+    if max(h, w) > target:
+        scale = target / max(h, w)
+        shape = (max(1, round(h * scale)), max(1, round(w * scale)), 3)
+        dst = buffer_pool.acquire(shape)
+        img = cv2.resize(img, (shape[1], shape[0]), dst=dst, interpolation=cv2.INTER_AREA)
+        pooled = True
+
+    op = ORIENTATION_OPS.get(orientation)
+    if op is not None:
+        rotated = op(img)
+        if pooled:
+            buffer_pool.release(img)
+            pooled = False
+        img = rotated
+
+    return PreparedImage(img, size, pooled)
@@ -0,0 +1,275 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from app.services.detection_cache import make_cache_key
+from app.services.image_preprocess import prepare_image
+from app.services.metrics import observe_stage
+
+load_dotenv()
+
+MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH", "8"))
+MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "32"))
+WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+
+
+class SchedulerOverloaded(Exception):
+    pass
+
+
+class ImageDecodeError(Exception):
+    pass
+
+
+# -----------------------------
+# 추론 스케줄러
+#  - 디코드 / 추론은 전용 스레드 풀에서 실행 (이벤트 루프 블로킹 X)
+#  - 동시에 들어온 요청은 max_batch / max_wait 안에서 묶어 한 번에 추론
+#  - 대기 중인 요청이 max_queue 를 넘으면 SchedulerOverloaded (→ 503)
+# -----------------------------
+class InferenceScheduler:
+    def __init__(
+        self,
+        model,
+        model_factory=None,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_wait_ms=MAX_WAIT_MS,
+        max_queue=MAX_QUEUE,
+        workers=WORKERS,
+        cache=None,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_queue = max(1, max_queue)
+        self.workers = max(1, workers)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="inference"
+        )
+        # YOLO 객체는 스레드 안전하지 않으므로 워커 스레드마다 1개씩 사용
+        self._spare_models = [model]
+        self.model_version = getattr(model, "version", "unknown")
+        self.cache = cache
+        self._model_factory = model_factory
+        self._model_lock = threading.Lock()
+        self._local = threading.local()
+
+        self._queue = None
+        self._dispatcher = None
+        self._slots = None
+        self.pending = 0
+        self.batches = 0
+        self.batched_images = 0
+
+    # -----------------------------
+    # 공개 API
+    # -----------------------------
+    async def analyze(self, content, conf=0.25, iou=0.45, image_hash=None):
+        loop = asyncio.get_running_loop()
+
+        # 같은 이미지 + 같은 모델/파라미터면 추론 생략
+        key = None
+        if self.cache is not None and image_hash:
+            key = make_cache_key(image_hash, self.model_version, conf, iou)
+            cached = self.cache.get(key)
+            if cached is None and self.cache.has_disk:
+                cached = await loop.run_in_executor(None, self.cache.load, key)
+            elif cached is None:
+                self.cache.record_miss()
+            if cached is not None:
+                return cached
+
+        if self.pending >= self.max_queue:
+            raise SchedulerOverloaded()
+
+        self.pending += 1
+        try:
+            # 디코드 단계에서 모델 입력 크기로 축소 (EXIF 방향 보정 포함)
+            prepared = await loop.run_in_executor(self._executor, _timed_prepare, content)
+            if prepared is None:
+                raise ImageDecodeError()
+
+            self._ensure_dispatcher()
+            fut = loop.create_future()
+            self._queue.put_nowait((prepared, conf, iou, fut))
+            detections = await fut
+        finally:
+            self.pending -= 1
+
+        if key is not None:
+            if self.cache.has_disk:
+                await loop.run_in_executor(None, self.cache.store, key, detections)
+            else:
+                self.cache.put(key, detections)
+        return detections
+
+    # 여러 이미지를 한 번에 큐에 넣어 같은 배치(forward)로 묶음
+    #  이미지 순서대로 탐지 결과 또는 예외(ImageDecodeError 등)를 반환
+    async def analyze_many(self, contents, conf=0.25, iou=0.45, image_hashes=None):
+        loop = asyncio.get_running_loop()
+        image_hashes = image_hashes or [None] * len(contents)
+        results = [None] * len(contents)
+
+        keys = [None] * len(contents)
+        todo = []
+        for i, image_hash in enumerate(image_hashes):
+            if self.cache is not None and image_hash:
+                keys[i] = make_cache_key(image_hash, self.model_version, conf, iou)
+                cached = self.cache.get(keys[i])
+                if cached is None and self.cache.has_disk:
+                    cached = await loop.run_in_executor(None, self.cache.load, keys[i])
+                elif cached is None:
+                    self.cache.record_miss()
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            todo.append(i)
+
+        if not todo:
+            return results
+        if self.pending + len(todo) > self.max_queue:
+            raise SchedulerOverloaded()
+
+        self.pending += len(todo)
+        try:
+            prepared = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, _timed_prepare, contents[i])
+                for i in todo
+            ))
+
+            self._ensure_dispatcher()
+            waiting = []
+            for i, image in zip(todo, prepared):
+                if image is None:
+                    results[i] = ImageDecodeError()
+                    continue
+                fut = loop.create_future()
+                self._queue.put_nowait((image, conf, iou, fut))
+                waiting.append((i, fut))
+
+            outcomes = await asyncio.gather(
+                *(fut for _, fut in waiting), return_exceptions=True
+            )
+        finally:
+            self.pending -= len(todo)
+
+        for (i, _), detections in zip(waiting, outcomes):
+            results[i] = detections
+            if keys[i] is None or isinstance(detections, Exception):
+                continue
+            if self.cache.has_disk:
+                await loop.run_in_executor(None, self.cache.store, keys[i], detections)
+            else:
+                self.cache.put(keys[i], detections)
+        return results
+
+    def stats(self):
+        return {
+            "pending": self.pending,
+            "max_queue": self.max_queue,
+            "batches": self.batches,
+            "images": self.batched_images,
+            "avg_batch_size": (
+                round(self.batched_images / self.batches, 2) if self.batches else 0
+            ),
+        }
+
+    def shutdown(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        self._executor.shutdown(wait=False)
+
+    # -----------------------------
+    # 내부 구현
+    # -----------------------------
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _collect_batch(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+
+            # conf / iou 가 같은 요청끼리만 한 배치로 묶을 수 있음
+            groups = {}
+            for item in batch:
+                groups.setdefault((item[1], item[2]), []).append(item)
+
+            for (conf, iou), items in groups.items():
+                await self._slots.acquire()
+                loop.create_task(self._run_batch(items, conf, iou))
+
+    async def _run_batch(self, items, conf, iou):
+        loop = asyncio.get_running_loop()
+        try:
+            images = [item[0].array for item in items]
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._predict, images, conf, iou
+                )
+            finally:
+                # 추론이 끝난 리사이즈 버퍼는 풀로 반환
+                for item in items:
+                    item[0].release()
+            self.batches += 1
+            self.batched_images += len(items)
+            for item, detections in zip(items, results):
+                if not item[3].done():
+                    item[3].set_result(detections)
+        except Exception as e:
+            for item in items:
+                if not item[3].done():
+                    item[3].set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _get_model(self):
+        model = getattr(self._local, "model", None)
+        if model is None:
+            with self._model_lock:
+                if self._spare_models:
+                    model = self._spare_models.pop()
+                elif self._model_factory is not None:
+                    model = self._model_factory()
+                else:
+                    raise RuntimeError("추론 워커용 모델이 부족합니다.")
+            self._local.model = model
+        return model
+
+    def _predict(self, images, conf, iou):
+        model = self._get_model()
+        started = time.perf_counter()
+        results = model.predict_batch(images, conf=conf, iou=iou, dedup=True)
+        observe_stage("model_forward", time.perf_counter() - started)
+        return results
+
+
+# 디코드 + 축소 시간 기록 (추론 스레드 풀에서 실행)
+def _timed_prepare(content):
+    started = time.perf_counter()
+    prepared = prepare_image(content)
+    observe_stage("decode", time.perf_counter() - started)
+    return prepared
@@ -0,0 +1,70 @@
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import defer, noload, selectinload
+
+from app.database.models.meal import MealReport
+
+
+# 하루치 식단 (ix_meal_reports_user_date_time 사용)
+def meals_for_day(user_id: int, day):
+    return (
+        select(MealReport)
+        .where(MealReport.user_id == user_id, MealReport.meal_date == day)
+        .order_by(MealReport.meal_time.asc(), MealReport.id.asc())
+    )
+
+
+# 날짜별 섭취 합계 (DB 에서 SUM ... GROUP BY)
+#   user_id 를 생략하면 전체 유저, start / end 는 meal_date 기준 포함 범위
+def daily_totals(user_id: int = None, start=None, end=None):
+    stmt = select(
+        MealReport.user_id,
+        MealReport.date,
+        func.count(MealReport.id).label("meal_count"),
+        func.coalesce(func.sum(MealReport.total_calories), 0.0).label("total_calories"),
+        func.coalesce(func.sum(MealReport.carbohydrate), 0.0).label("carbohydrate"),
+        func.coalesce(func.sum(MealReport.protein), 0.0).label("protein"),
+        func.coalesce(func.sum(MealReport.fat), 0.0).label("fat"),
+        func.coalesce(func.sum(MealReport.sugar), 0.0).label("sugar"),
+    ).where(MealReport.user_id.isnot(None))
+
+    if user_id is not None:
+        stmt = stmt.where(MealReport.user_id == user_id)
+    if start is not None:
+        stmt = stmt.where(MealReport.meal_date >= start)
+    if end is not None:
+        stmt = stmt.where(MealReport.meal_date <= end)
+
+    return stmt.group_by(MealReport.user_id, MealReport.date)
+
+
+# 식단 기록 (최신순, 키셋 페이지네이션)
+#   after = 이전 페이지 마지막 행의 (meal_date, meal_time, id), start / end 는 포함 범위
+#   with_items / with_feedback 이 False 면 meal_items 로딩 / feedback 컬럼 생략
+#   limit + 1 개를 가져와 다음 페이지 존재 여부 판단
+def meal_history(
+    user_id: int, start=None, end=None, after=None, limit: int = 20,
+    with_items: bool = False, with_feedback: bool = False,
+):
+    stmt = select(MealReport).where(
+        MealReport.user_id == user_id,
+        MealReport.meal_date.isnot(None),
+        MealReport.meal_time.isnot(None),
+    )
+    if start is not None:
+        stmt = stmt.where(MealReport.meal_date >= start)
+    if end is not None:
+        stmt = stmt.where(MealReport.meal_date <= end)
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(MealReport.meal_date, MealReport.meal_time, MealReport.id) < tuple_(*after)
+        )
+
+    stmt = stmt.options(
+        selectinload(MealReport.meal_items) if with_items else noload(MealReport.meal_items)
+    )
+    if not with_feedback:
+        stmt = stmt.options(defer(MealReport.feedback))
+
+    return stmt.order_by(
+        MealReport.meal_date.desc(), MealReport.meal_time.desc(), MealReport.id.desc()
+    ).limit(limit + 1)
@@ -0,0 +1,307 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from dotenv import load_dotenv
+from starlette.routing import Mount
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# 초 단위 지연 버킷 (1ms ~ 10s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# DB 쿼리는 대부분 ms 이하라 더 촘촘하게
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return str(int(value))
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# -----------------------------
+# 히스토그램 / 카운터 (Prometheus text format 으로 출력)
+#  - observe 는 버킷 1개만 +1 (누적합은 출력할 때 계산)
+#  - 라벨 값 조합마다 시리즈 1개, 라벨은 위치 인자로 전달
+# -----------------------------
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}   # 라벨 값 → [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)}", cumulative
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)}", total
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)}", count
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            snapshot = list(self._values.items())
+        for labels, value in snapshot:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)}", value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    # 스크레이프 시점에 값을 읽는 게이지 (기존 stats() 재사용)
+    #   fn() → {라벨 값 튜플: 값} 또는 숫자 1개
+    def gauge(self, name, help, fn, labelnames=(), type="gauge"):
+        self._collectors.append((name, help, type, tuple(labelnames), fn))
+
+    # 기존 stats() dict 의 숫자 항목을 그대로 노출 (항목마다 메트릭 1개)
+    #   counters → {prefix}_{키}_total (누적 값), gauges → {prefix}_{키} (현재 값)
+    #   labelnames 를 주면 fn() → {라벨 값 튜플: stats dict}
+    def stats(self, prefix, help, fn, counters=(), gauges=(), labelnames=()):
+        for keys, type, suffix in ((counters, "counter", "_total"), (gauges, "gauge", "")):
+            for key in keys:
+                self.gauge(
+                    f"{prefix}_{key}{suffix}", f"{help} ({key})",
+                    _stats_field(fn, key, labelnames), labelnames, type,
+                )
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{key} {_format_value(value)}" for key, value in metric.samples())
+
+        for name, help, type, labelnames, fn in self._collectors:
+            try:
+                values = fn()
+            except Exception as e:
+                print(f"[WARN] 메트릭 수집 실패 ({name}): {e!r}")
+                continue
+            if values is None:
+                continue
+            if not isinstance(values, dict):
+                values = {(): values}
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            for labels, value in values.items():
+                if value is not None:
+                    lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _stats_field(fn, key, labelnames):
+    def read():
+        stats = fn()
+        if stats is None:
+            return None
+        if labelnames:
+            return {labels: s.get(key) for labels, s in stats.items()}
+        return stats.get(key)
+    return read
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "meal_analyze_stage_seconds", "Time spent in each /meal/analyze stage.", ("stage",)
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_seconds", "SQL statement execution time.", ("engine", "operation"), QUERY_BUCKETS
+)
+DB_QUERY_ERRORS = registry.counter(
+    "db_query_errors_total", "SQL statements that raised.", ("engine", "operation")
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+
+
+# -----------------------------
+# 단계별 시간 측정
+#   stages = StageTimer(timings)
+#   with stages.stage("nutrition"): ...
+#  - timings dict (작업 상태 / 응답용) 와 히스토그램에 같이 기록
+# -----------------------------
+class _Stage:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class StageTimer:
+    def __init__(self, timings=None):
+        self.timings = {} if timings is None else timings
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        if METRICS_ENABLED:
+            STAGE_SECONDS.observe(seconds, name)
+
+
+def observe_stage(name, seconds):
+    if METRICS_ENABLED:
+        STAGE_SECONDS.observe(seconds, name)
+
+
+# -----------------------------
+# DB 쿼리 시간 (엔진 이벤트)
+#  - before/after_cursor_execute 사이 시간을 SQL 첫 단어(SELECT / INSERT ...)별로 기록
+# -----------------------------
+_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "CREATE", "DROP", "ALTER", "BEGIN")
+
+
+_operation_cache = {}
+
+
+def _operation(statement):
+    # 같은 SQL 문자열이 반복되므로 결과를 기억 (개수 제한)
+    op = _operation_cache.get(statement)
+    if op is None:
+        head = statement.lstrip()[:6].upper()
+        op = next((o for o in _OPERATIONS if head.startswith(o)), "OTHER")
+        if len(_operation_cache) < 2048:
+            _operation_cache[statement] = op
+    return op
+
+
+def instrument_engine(sync_engine, label):
+    if not METRICS_ENABLED:
+        return
+    from sqlalchemy import event
+
+    # 시작 시각은 실행 컨텍스트에 보관 (conn.info 보다 접근 비용이 적음)
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - started, label, _operation(statement))
+
+    def on_error(context):
+        DB_QUERY_ERRORS.inc(label, _operation(context.statement or ""))
+
+    event.listen(sync_engine, "before_cursor_execute", before)
+    event.listen(sync_engine, "after_cursor_execute", after)
+    event.listen(sync_engine, "handle_error", on_error)
+
+
+# -----------------------------
+# 요청 지연 미들웨어 (순수 ASGI, BaseHTTPMiddleware 보다 오버헤드 적음)
+#  - 라벨은 URL 이 아닌 라우트 템플릿 (/meal/report/{meal_id}) → 시리즈 수 고정
+#  - 마운트 (/static) 는 마운트 경로, 매칭되는 라우트가 없으면 "unmatched"
+# -----------------------------
+def _route_label(scope):
+    path = getattr(scope.get("route"), "path", None)
+    if path is not None:
+        return path
+    # 마운트된 앱은 FastAPI 버전에 따라 scope 에 route 가 남지 않음 → 경로 접두어로 확인
+    request_path = scope.get("path", "")
+    for route in getattr(scope.get("app"), "routes", ()):
+        if isinstance(route, Mount) and request_path.startswith(route.path + "/"):
+            return route.path
+    return "unmatched"
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                _route_label(scope),
+                status[0],
+            )
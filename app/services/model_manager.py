@@ -0,0 +1,159 @@
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+
+from app.services.detection_cache import DetectionCache
+from app.services.image_preprocess import MODEL_IMGSZ
+from app.services.inference_scheduler import InferenceScheduler
+
+load_dotenv()
+
+# eager: 서버 시작(lifespan) 시 로딩 / lazy: 첫 분석 요청 시 로딩
+MODEL_LOAD = os.getenv("MODEL_LOAD", "eager").lower()
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")
+
+
+# -----------------------------
+# 모델 수명 관리
+#  - 로딩 / 워밍업 / 준비 상태 / 시간 측정
+#  - ultralytics(torch) import 는 load() 때 처음 일어남
+# -----------------------------
+class ModelManager:
+    def __init__(self, mode=MODEL_LOAD, warmup=MODEL_WARMUP, imgsz=MODEL_IMGSZ):
+        self.mode = mode
+        self.warmup_enabled = warmup
+        self.imgsz = imgsz
+
+        self.model = None
+        self.detection_cache = None
+        self.scheduler = None
+        self.error = None
+
+        self.state = "idle"      # idle → (preloaded) → loading → warming → ready / failed
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.first_request_seconds = None
+
+        self._lock = threading.Lock()
+        self._async_lock = None
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def _load_weights(self):
+        from app.services.ai_service import FoodAIModel
+
+        self.state = "loading"
+        start = time.perf_counter()
+        try:
+            self.model = FoodAIModel()
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            print(f"[WARN] AI model init failed: {e}")
+            return False
+        self.load_seconds = time.perf_counter() - start
+        return True
+
+    # -----------------------------
+    # 멀티 워커 (gunicorn preload_app) 용: fork 전 마스터에서 가중치만 로딩
+    #  - 워밍업 / 스케줄러(스레드 풀)는 fork 후 각 워커의 load() 에서
+    #    (fork 전에 추론 스레드 풀이 뜨면 자식에서 멈출 수 있음)
+    #  - 스레드 풀을 세션 생성 시 띄우는 onnxruntime 은 preload 불가 → 워커별 로딩
+    # -----------------------------
+    def preload(self):
+        from app.services.ai_service import MODEL_BACKEND, FORK_SAFE_BACKENDS
+
+        if MODEL_BACKEND not in FORK_SAFE_BACKENDS:
+            print(f"[WARN] MODEL_BACKEND={MODEL_BACKEND} 는 fork 전 로딩을 지원하지 않아 워커별로 로딩합니다.")
+            return False
+        with self._lock:
+            if self.model is not None or self.state == "failed":
+                return self.model is not None
+            if not self._load_weights():
+                return False
+            self.state = "preloaded"
+            print(f"[INFO] AI 모델 preload 완료 ({self.load_seconds:.2f}s, pid {os.getpid()})")
+            return True
+
+    # fork 후 워커마다 추론 스레드 수 조정 (코어 수 / 워커 수)
+    def set_threads(self, threads):
+        set_threads = getattr(getattr(self.model, "backend", None), "set_threads", None)
+        if set_threads is not None:
+            set_threads(threads)
+
+    def load(self):
+        with self._lock:
+            if self.state in ("ready", "failed"):
+                return self.scheduler
+
+            from app.services.ai_service import FoodAIModel
+
+            # preload 된 가중치가 있으면 그대로 사용 (fork 로 공유된 페이지)
+            if self.model is None and not self._load_weights():
+                return None
+
+            if self.warmup_enabled:
+                self.state = "warming"
+                self._warmup()
+
+            self.detection_cache = DetectionCache()
+            self.scheduler = InferenceScheduler(
+                self.model, model_factory=FoodAIModel, cache=self.detection_cache
+            )
+            self.state = "ready"
+            print(
+                f"[INFO] AI 모델 초기화 완료 (load {self.load_seconds:.2f}s, "
+                f"warmup {self.warmup_seconds or 0:.2f}s)"
+            )
+            return self.scheduler
+
+    def _warmup(self):
+        # 합성 이미지로 1회 추론 → 그래프 / 메모리 할당 비용을 미리 지불
+        start = time.perf_counter()
+        dummy = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+        try:
+            self.model.predict_batch([dummy], conf=0.25, iou=0.45)
+        except Exception as e:
+            print(f"[WARN] 모델 워밍업 실패: {e}")
+        self.warmup_seconds = time.perf_counter() - start
+
+    async def get_scheduler(self):
+        if self.state in ("ready", "failed"):
+            return self.scheduler
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, self.load)
+
+    def record_request(self, seconds):
+        if self.first_request_seconds is None:
+            self.first_request_seconds = seconds
+
+    def shutdown(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "mode": self.mode,
+            "error": self.error,
+            "load_seconds": _round(self.load_seconds),
+            "warmup_seconds": _round(self.warmup_seconds),
+            "first_request_seconds": _round(self.first_request_seconds),
+        }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+model_manager = ModelManager()
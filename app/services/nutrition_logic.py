@@ -1,4 +1,6 @@
-from app.services.feedback_loader import recommendation_detail
+from app.services.feedback_rules import (
+    ACTIVITY_BONUS, DETAIL_LEVELS, RULES, match_exercise, top_deviations
+)
 
 ACTIVITY_FACTOR = {
     "sedentary": 1.2,
@@ -31,6 +33,36 @@ def calculate_bmi(weight, height):
     return bmi, status
 
 
+# 프로필 기준 하루 권장량 (프로필 저장 시 1회 계산해 User 에 보관)
+MACRO_RATIO = {
+    "carbohydrates": (0.60, 4),
+    "protein": (0.15, 4),
+    "fat": (0.25, 9),
+    "sugars": (0.10, 4),
+}
+
+#   성별 / 활동량이 비어 있거나 모르는 값이면 분석 API 와 같은 기본값 (여성 식, 계수 1.2)
+#   키 / 몸무게 / 나이가 없거나 키가 0 이하면 계산할 수 없으므로 None
+def calculate_targets(sex, weight, height, age, activity):
+    if weight is None or height is None or age is None or height <= 0:
+        return None
+
+    bmr = calculate_bmr(sex, weight, height, age)
+    tdee = calculate_tdee(bmr, activity)
+    bmi, bmi_status = calculate_bmi(weight, height)
+
+    targets = {
+        "bmr": bmr,
+        "tdee": tdee,
+        "bmi": bmi,
+        "bmi_status": bmi_status,
+        "calories": tdee,
+    }
+    for nutrient, (ratio, kcal_per_g) in MACRO_RATIO.items():
+        targets[nutrient] = tdee * ratio / kcal_per_g
+    return targets
+
+
 
 # 3. 퍼센트 차이 계산
 
@@ -40,92 +72,58 @@ def diff_pct(actual, rec):
     return (actual - rec) / rec * 100
 
 
+# 권장량 대비 섭취율 (목표 ±ADHERENCE_TOLERANCE_PCT % 이내면 ok)
+ADHERENCE_TOLERANCE_PCT = 10
 
-# 4. 운동 추천
-
-def recommend_exercise(diff_cal, activity):
-    activity_bonus = {
-        "sedentary": -50,
-        "low-active": 0,
-        "active": 50,
-        "very-active": 100
-    }
-    adj = diff_cal - activity_bonus.get(activity, 0)
-
-    # 과다 섭취
-    if adj > 500:
-        if activity in ["sedentary", "low-active"]:
-            return "칼로리 섭취가 많이 높아요! 40–50분 빠르게 걷기 또는 가벼운 조깅을 추천해요."
-        else:
-            return "칼로리가 많이 높아요! 30–40분 러닝이나 인터벌 걷기를 추천해요."
-
-    if adj > 250:
-        if activity == "sedentary":
-            return "칼로리가 조금 높아요. 25–30분 빠르게 걷기만 해줘도 충분해요."
-        elif activity == "low-active":
-            return "20–25분 가벼운 조깅이나 빠른 걷기를 추천해요."
-        else:
-            return "20–30분 조깅 또는 사이클을 추천해요."
+def adherence(actual, rec):
+    if not rec:
+        return None
+    diff = diff_pct(actual, rec)
+    if abs(diff) <= ADHERENCE_TOLERANCE_PCT:
+        status = "ok"
+    else:
+        status = "low" if diff < 0 else "high"
+    return {"pct": round(actual / rec * 100, 1), "status": status}
 
-    # 정상 범위
-    if -200 <= adj <= 200:
-        if activity == "sedentary":
-            return "칼로리는 적절해요! 15–20분 산책 정도면 충분해요."
-        else:
-            return "칼로리는 적절해요! 20–30분 가벼운 유산소를 추천해요."
 
-    # 부족
-    if adj < -500:
-        return "칼로리가 많이 부족한 날이에요. 피로 누적될 수 있어 운동은 최소화하고 스트레칭 정도만 해주세요."
 
-    if adj < -250:
-        return "칼로리가 조금 부족해요. 무리한 운동은 피하고 10–15분 가벼운 산책만 추천해요."
+# 4. 운동 추천 (규칙표: feedback_rules.EXERCISE_RULES)
 
-    return "칼로리 차이가 크지 않아 특별한 조정은 필요 없어요. 15–20분 가벼운 활동이면 충분해요."
+def recommend_exercise(diff_cal, activity):
+    adj = diff_cal - ACTIVITY_BONUS.get(activity, 0)
+    messages, default = match_exercise(adj)
+    return messages.get(activity, default)
 
 
 # 5. 문구 (퍼센트 기반 Top2)
+#   top 을 넘기면 다시 정렬하지 않음 (format_substitutes 와 공유)
 
-def generate_coach_text(diff_pct_map, bmi, bmi_status, exercise_text):
+def generate_coach_text(diff_pct_map, bmi, bmi_status, exercise_text, top=None):
     text = []
     text.append("오늘의 식단 리포트")
 
-    # 퍼센트 절대값 기준 top2 추출
-    sorted_items = sorted(diff_pct_map.items(), key=lambda x: abs(x[1]), reverse=True)
-    top2 = sorted_items[:2]
-
-    for nutrient, pct in top2:
-        rounded = round(pct, 1)
-
-        if nutrient == "protein":
-            if pct < -10:
-                text.append(f"단백질이 권장량 대비 {abs(rounded)}% 부족해요.")
-            elif pct > 10:
-                text.append(f"단백질이 권장량 대비 {rounded}% 많아요.")
-
-        elif nutrient == "carbohydrates":
-            if pct < -10:
-                text.append(f"탄수화물이 권장량 대비 {abs(rounded)}% 부족해요.")
-            elif pct > 10:
-                text.append(f"탄수화물이 권장량 대비 {rounded}% 많아요.")
+    if top is None:
+        top = top_deviations(diff_pct_map)
 
-        elif nutrient == "fat":
-            if pct < -10:
-                text.append(f"지방이 권장량 대비 {abs(rounded)}% 부족해요.")
-            elif pct > 10:
-                text.append(f"지방이 권장량 대비 {rounded}% 많아요.")
+    for nutrient, pct in top:
+        templates = RULES.coach.get(nutrient)
+        if templates is None:
+            continue
 
-        elif nutrient == "sugars":
-            if pct < -10:
-                text.append(f"당류가 권장량 대비 {abs(rounded)}% 부족해요.")
-            elif pct > 10:
-                text.append(f"당류가 권장량 대비 {rounded}% 많아요.")
+        if pct < -RULES.coach_pct:
+            prefix, suffix = templates[0]
+            text.append(prefix + str(abs(round(pct, 1))) + suffix)
+        elif pct > RULES.coach_pct:
+            prefix, suffix = templates[1]
+            text.append(prefix + str(round(pct, 1)) + suffix)
 
-    # BMI 정보는 간단한 문장만
-    text.append(f"\n BMI는 {round(bmi,1)}로 '{bmi_status}' 범주예요. \n")
+    # BMI 정보는 간단한 문장만 (권장량을 계산하지 못한 프로필은 생략)
+    if bmi is not None:
+        text.append(f"\n BMI는 {round(bmi,1)}로 '{bmi_status}' 범주예요. \n")
 
     # 운동 문구
-    text.append(exercise_text)
+    if exercise_text:
+        text.append(exercise_text)
 
     return " ".join(text)
 
@@ -134,33 +132,23 @@ def generate_coach_text(diff_pct_map, bmi, bmi_status, exercise_text):
 # 6. 대체식 추천 (퍼센트 Top2 기준)
 
 
-def format_substitutes(diff_pct_map, subs):
+def format_substitutes(diff_pct_map, subs, top=None):
     lines = ["대체식 추천:"]
 
-    # 퍼센트 절대값 기준 top2
-    sorted_items = sorted(diff_pct_map.items(), key=lambda x: abs(x[1]), reverse=True)
-    top2 = sorted_items[:2]
+    if top is None:
+        top = top_deviations(diff_pct_map)
 
     count = 0
-    for nutrient, pct in top2:
+    for nutrient, pct in top:
         if nutrient not in subs:
             continue
 
-        if nutrient == "protein":
-            label = "단백질 보충" if pct < 0 else "단백질 줄이기"
-        elif nutrient == "carbohydrates":
-            label = "탄수화물 보충" if pct < 0 else "탄수화물 줄이기"
-        elif nutrient == "fat":
-            label = "지방 보충" if pct < 0 else "지방 줄이기"
-        elif nutrient == "sugars":
-            label = "당류 보충" if pct < 0 else "당류 줄이기"
+        labels = RULES.substitute_labels[nutrient]
+        label = labels[0] if pct < 0 else labels[1]
 
         lines.append(f"{label}: {', '.join(subs[nutrient])}\n")
         count += 1
 
-        if count == 2:
-            break
-
     if count == 0:
         lines.append("대체식 추천이 필요할 만큼 큰 편차는 없어요!")
 
@@ -168,38 +156,27 @@ def format_substitutes(diff_pct_map, subs):
 
 
 
-# 7. 대체식 추천 로직 (변경 없음)
+# 7. 대체식 추천 로직 (규칙표: feedback_rules.DETAIL_THRESHOLDS_G)
+#   catalog: feedback_loader.FeedbackCatalog ((nutrient, level, meal_time) 인덱스)
 
-def recommend_by_detail(diff_g, recommendation_detail, meal_time):
+def recommend_by_detail(diff_g, catalog, meal_time):
     recommendations = {}
+    catalog.refresh()
 
     for nutrient, g_value in diff_g.items():
-        level = None
-        if nutrient == "protein":
-            if g_value < -10: level = "low_mild"
-            if g_value > 10: level = "high"
-        if nutrient == "carbohydrates":
-            if g_value < -20: level = "low_mild"
-            if g_value > 20: level = "high"
-        if nutrient == "fat":
-            if g_value < -5: level = "low_mild"
-            if g_value > 7: level = "high"
-        if nutrient == "sugars":
-            if g_value < -5: level = "low_mild"
-            if g_value > 10: level = "high"
-
-        if not level:
+        bounds = RULES.detail_thresholds.get(nutrient)
+        if bounds is None:
             continue
 
-        if nutrient not in recommendation_detail:
+        if g_value < bounds[0]:
+            level = DETAIL_LEVELS["low"]
+        elif g_value > bounds[1]:
+            level = DETAIL_LEVELS["high"]
+        else:
             continue
 
-        sets = recommendation_detail[nutrient].get(level, {})
-        if meal_time in sets:
-            recommendations[nutrient] = sets[meal_time][:2]
-        elif "all" in sets:
-            recommendations[nutrient] = sets["all"][:2]
+        items = catalog.lookup(nutrient, level, meal_time)
+        if items is not None:
+            recommendations[nutrient] = items
 
     return recommendations
-
-
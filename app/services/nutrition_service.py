@@ -1,11 +1,154 @@
 import json
+import os
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
 
 NUTRITION_PATH = "./app/data/food_nutrition.json"
 
+# class_matrix 열 순서
+NUTRIENT_FIELDS = ("calories_kcal", "carbohydrates_g", "protein_g", "fat_g", "sugars_g")
+
+
+# -----------------------------
+# 음식 1개 영양 레코드 (불변, tuple 기반)
+# -----------------------------
+class FoodNutrition(NamedTuple):
+    name: str
+    serving_size_g: float
+    calories_kcal: float
+    carbohydrates_g: float
+    sugars_g: float
+    protein_g: float
+    fat_g: float
+
+    # 기존 dict 기반 호출부 호환용 (info.get("calories_kcal", 0))
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+def _to_record(name: str, raw: dict) -> FoodNutrition:
+    return FoodNutrition(
+        name=name,
+        serving_size_g=float(raw.get("serving_size_g", 0) or 0),
+        calories_kcal=float(raw.get("calories_kcal", 0) or 0),
+        carbohydrates_g=float(raw.get("carbohydrates_g", 0) or 0),
+        sugars_g=float(raw.get("sugars_g", 0) or 0),
+        protein_g=float(raw.get("protein_g", 0) or 0),
+        fat_g=float(raw.get("fat_g", 0) or 0),
+    )
+
+
+# -----------------------------
+# 영양 카탈로그
+#  - 시작 시 1회 로딩, 이름 → 레코드 dict 로 O(1) 조회
+#  - 파일 mtime 이 바뀌면 다음 조회 때 새 dict 로 통째로 교체
+# -----------------------------
+class NutritionCatalog:
+    def __init__(self, path: str = NUTRITION_PATH):
+        self.path = path
+        self._records: Dict[str, FoodNutrition] = {}
+        self._mtime: Optional[float] = None
+        self._class_matrices = {}
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def reload(self) -> None:
+        mtime = self._current_mtime()
+        with open(self.path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        records = {name: _to_record(name, info) for name, info in raw.items()}
+
+        with self._lock:
+            self._records = records
+            self._mtime = mtime
+            self._class_matrices = {}
+        print(f"[INFO] 영양 카탈로그 로딩 완료 ({len(records)}개)")
+
+    def _maybe_reload(self) -> None:
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return
+        try:
+            self.reload()
+        except (OSError, ValueError) as e:
+            # 파일이 쓰이는 중이면 기존 데이터를 그대로 사용
+            print(f"[WARN] 영양 카탈로그 리로드 실패: {e}")
+            self._mtime = mtime
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._records
+
+    def names(self) -> List[str]:
+        return list(self._records)
+
+    def get(self, name: str) -> Optional[FoodNutrition]:
+        self._maybe_reload()
+        return self._records.get(name)
+
+    def get_many(self, labels: Iterable[str]) -> Dict[str, Optional[FoodNutrition]]:
+        # mtime 확인은 배치당 1회만
+        self._maybe_reload()
+        records = self._records
+        return {name: records.get(name) for name in labels}
+
+    # -----------------------------
+    # 모델 class id 로 바로 조회하는 영양 행렬
+    #  - 행 i = class i 의 NUTRIENT_FIELDS, 마지막 행 = 0 (카탈로그에 없는 음식)
+    #  - 모델 names 객체별로 1회 생성, 카탈로그 리로드 시 다시 생성
+    # -----------------------------
+    def class_matrix(self, class_names):
+        self._maybe_reload()
+        cached = self._class_matrices.get(id(class_names))
+        if cached is not None and cached[0] is class_names:
+            return cached[1], cached[2]
+
+        items = class_names.items() if isinstance(class_names, dict) else enumerate(class_names)
+        items = list(items)
+        size = max((i for i, _ in items), default=-1) + 2
+        matrix = np.zeros((size, len(NUTRIENT_FIELDS)), dtype=np.float64)
+        known = np.zeros(size, dtype=bool)
+        for class_id, name in items:
+            record = self._records.get(name)
+            if record is not None:
+                matrix[class_id] = [getattr(record, f) for f in NUTRIENT_FIELDS]
+                known[class_id] = True
+
+        matrix.setflags(write=False)
+        known.setflags(write=False)
+        self._class_matrices[id(class_names)] = (class_names, matrix, known)
+        return matrix, known
+
+    # class id 배열 → (항목별 영양 (k, 5), 합계 (5,), 카탈로그 존재 여부 (k,))
+    def nutrition_for_classes(self, class_ids, class_names, serving=1.0):
+        matrix, known = self.class_matrix(class_names)
+        missing_row = len(matrix) - 1
+        ids = np.asarray(class_ids, dtype=np.int64)
+        ids = np.where((ids >= 0) & (ids < missing_row), ids, missing_row)
+
+        rows = matrix[ids]
+        per_item = rows * serving
+        totals = np.full(len(ids), serving) @ rows
+        return per_item, totals, known[ids]
+
+
+nutrition_catalog = NutritionCatalog()
+
+
 def load_nutrition_data():
     with open(NUTRITION_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
+
 def get_nutrition_for_food(food_name: str):
-    data = load_nutrition_data()
-    return data.get(food_name)
+    return nutrition_catalog.get(food_name)
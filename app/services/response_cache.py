@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+load_dotenv()
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+# 매번 ETag 로 재검증 (변경 없으면 304)
+REVALIDATE = "private, no-cache"
+# 한 번 저장되면 바뀌지 않는 응답 (/meal/report/{id})
+IMMUTABLE = "private, max-age=31536000, immutable"
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "cache_control")
+
+    def __init__(self, body, etag, cache_control=REVALIDATE):
+        self.body = body
+        self.etag = etag
+        self.cache_control = cache_control
+
+
+# -----------------------------
+# 직렬화된 JSON 응답 캐시 + ETag
+#  - 키: ("dashboard", user_id, day, profile_version, meal_count)
+#        ("meal_list", user_id, day, meal_count) / ("report", user_id, meal_id)
+#  - meal_count 는 요청마다 DB (daily_intakes) 에서 읽은 값 → 식사가 저장되면 키가 바뀌므로
+#    저장 직전에 조회한 응답이 늦게 put 되거나 다른 워커가 저장해도 예전 응답을 돌려주지 않음
+#  - invalidate_day 는 저장한 워커에서 예전 항목을 바로 지우는 메모리 정리용
+#  - 프로세스별 메모리 캐시 (워커끼리 공유 X, ETag 는 내용 해시라 워커가 달라도 같음)
+# -----------------------------
+class ResponseCache:
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    # 직렬화 + ETag 만 (캐시에 넣지 않음)
+    @staticmethod
+    def build(payload, cache_control=REVALIDATE):
+        body = json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        return CachedResponse(body, etag, cache_control)
+
+    # Cache-Control 도 항목에 같이 저장 → 캐시 적중 시 처음 응답과 같은 헤더
+    def put(self, key, payload, cache_control=REVALIDATE):
+        entry = self.build(payload, cache_control)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_day(self, user_id, day):
+        day = str(day)
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[0] in ("dashboard", "meal_list") and key[1] == user_id and key[2] == day
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def respond(self, request: Request, entry):
+        headers = {"ETag": entry.etag, "Cache-Control": entry.cache_control}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self.not_modified += 1
+                self.bytes_saved += len(entry.body)
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+            "invalidations": self.invalidations,
+        }
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # 약한 비교 (W/ 접두어 무시)
+    tags = (t.strip() for t in header.split(","))
+    return any((t[2:] if t.startswith("W/") else t) == etag for t in tags)
+
+
+response_cache = ResponseCache()
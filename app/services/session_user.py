@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_async_db, get_db
+from app.database.models.user import User
+
+load_dotenv()
+
+SESSION_COOKIE = "session_id"
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "10000"))
+# 다른 워커에서 프로필이 바뀐 경우 최대 이 시간까지 이전 값이 보일 수 있음
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "60"))
+
+
+# 요청 처리에 쓰는 프로필 값 (세션 / 스레드 / 비동기 작업 사이에 그대로 넘겨도 안전)
+class UserProfile(NamedTuple):
+    id: int
+    session_id: str
+    name: Optional[str]
+    age: Optional[int]
+    gender: Optional[str]
+    height: Optional[float]
+    weight: Optional[float]
+    activity: Optional[str]
+    completed: bool
+    profile_version: int
+    bmr: Optional[float]
+    bmi: Optional[float]
+    bmi_status: Optional[str]
+    target_calories: Optional[float]
+    target_carbohydrates: Optional[float]
+    target_protein: Optional[float]
+    target_fat: Optional[float]
+    target_sugars: Optional[float]
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(**{field: getattr(user, field) for field in cls._fields})
+
+
+# -----------------------------
+# 세션 → 프로필 캐시 (프로세스별, LRU + TTL)
+#  - 프로필 저장(create_or_update_user) 시 해당 세션 항목 삭제
+#  - 프로필이 없는 / 미완료 세션은 저장하지 않음
+# -----------------------------
+class ProfileCache:
+    def __init__(self, max_entries=PROFILE_CACHE_MAX_ENTRIES, ttl=PROFILE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # session_id → (만료 시각, UserProfile)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[session_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, profile):
+        with self._lock:
+            self._entries[profile.session_id] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(profile.session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id):
+        with self._lock:
+            if self._entries.pop(session_id, None) is not None:
+                self.invalidations += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0,
+            "invalidations": self.invalidations,
+        }
+
+
+profile_cache = ProfileCache()
+
+
+def _session_id(request: Request):
+    session_id = request.cookies.get(SESSION_COOKIE)
+    if not session_id:
+        raise HTTPException(status_code=401, detail="No session cookie")
+    return session_id
+
+
+def _remember(user):
+    if user is None or not user.completed:
+        return None
+    profile = UserProfile.from_user(user)
+    profile_cache.put(profile)
+    return profile
+
+
+# -----------------------------
+# 세션 쿠키 → 프로필 (캐시 미적중 시 session_id 인덱스로 1행 조회)
+#  - 쿠키가 없으면 401, 프로필이 없거나 미완료면 None
+# -----------------------------
+def load_session_user(request: Request, db: Session = Depends(get_db)):
+    session_id = _session_id(request)
+    profile = profile_cache.get(session_id)
+    if profile is not None:
+        return profile
+    user = db.execute(select(User).where(User.session_id == session_id)).scalars().first()
+    return _remember(user)
+
+
+async def load_session_user_async(request: Request, db: AsyncSession = Depends(get_async_db)):
+    session_id = _session_id(request)
+    profile = profile_cache.get(session_id)
+    if profile is not None:
+        return profile
+    result = await db.execute(select(User).where(User.session_id == session_id))
+    return _remember(result.scalars().first())
+
+
+# 프로필이 없으면 404 (분석 / 기록 API)
+async def require_session_user(profile=Depends(load_session_user_async)):
+    if profile is None:
+        raise HTTPException(404, "유저 정보가 없습니다.")
+    return profile
@@ -0,0 +1,66 @@
+import os
+import re
+import threading
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from app.services.response_cache import etag_matches
+
+# 내용 해시로 이름 붙은 파일은 절대 바뀌지 않으므로 1년 + immutable
+STATIC_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+# {sha256}.ext (원본) / {sha256}_{size}.ext (썸네일)
+_HASHED_NAME = re.compile(r"^([0-9a-f]{64}(?:_[A-Za-z0-9]+)?)\.[a-z0-9]+$")
+
+
+def _hashed_etag(name):
+    # 확장자를 뺀 파일명이 곧 내용 해시 (+ 크기)
+    match = _HASHED_NAME.match(name)
+    return f'"{match.group(1)}"' if match else None
+
+
+# -----------------------------
+# /static 마운트
+#  - 업로드 / 썸네일: 해시 기반 ETag + immutable Cache-Control
+#  - 그 외 파일은 Starlette 기본 동작 (mtime/size ETag)
+#  - 전송 바이트 / 304 횟수 집계 (/metrics 의 static_files_*)
+# -----------------------------
+class ImmutableStaticFiles(StaticFiles):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.not_modified = 0
+        self.bytes_served = 0
+        self.bytes_saved = 0
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        etag = _hashed_etag(os.path.basename(full_path))
+        if etag is None:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["etag"] = etag
+        response.headers["cache-control"] = STATIC_IMMUTABLE
+
+        request_headers = Headers(scope=scope)
+        with self._lock:
+            if etag_matches(request_headers.get("if-none-match"), etag):
+                self.not_modified += 1
+                self.bytes_saved += stat_result.st_size
+                return NotModifiedResponse(response.headers)
+            self.responses += 1
+            self.bytes_served += stat_result.st_size
+        return response
+
+    def stats(self):
+        return {
+            "responses": self.responses,
+            "not_modified": self.not_modified,
+            "bytes_served": self.bytes_served,
+            "bytes_saved": self.bytes_saved,
+        }
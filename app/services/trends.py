@@ -0,0 +1,139 @@
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.database.models.intake import DailyIntake, PeriodIntake
+from app.services.daily_intake import period_starts
+from app.services.nutrition_logic import adherence
+
+# 응답 키 (nutrition_logic 권장량 키) → 누적 테이블 컬럼
+NUTRIENTS = (
+    ("calories", "total_calories"),
+    ("carbohydrates", "carbohydrate"),
+    ("protein", "protein"),
+    ("fat", "fat"),
+    ("sugars", "sugar"),
+)
+
+
+def user_targets(user):
+    return {
+        "calories": user.target_calories,
+        "carbohydrates": user.target_carbohydrates,
+        "protein": user.target_protein,
+        "fat": user.target_fat,
+        "sugars": user.target_sugars,
+    }
+
+
+def _values(row, divisor=1):
+    if row is None or not divisor:
+        return {key: 0.0 for key, _ in NUTRIENTS}
+    return {key: round(getattr(row, column) / divisor, 1) for key, column in NUTRIENTS}
+
+
+def _adherence(values, targets):
+    return {key: adherence(values[key], targets[key]) for key, _ in NUTRIENTS}
+
+
+# 기록된 날 기준 하루 평균 + 권장량 대비
+def _summary(rows, days, targets):
+    average = {
+        key: round(sum(getattr(r, column) for r in rows) / days, 1) if days else 0.0
+        for key, column in NUTRIENTS
+    }
+    return {"logged_days": days, "average": average, "adherence": _adherence(average, targets)}
+
+
+# 최근 days 일 (기록 없는 날은 0 으로 채움)
+def daily_trend(db: Session, user, today: date, days: int, targets):
+    start = today - timedelta(days=days - 1)
+    rows = (
+        db.query(DailyIntake)
+        .filter(
+            DailyIntake.user_id == user.id,
+            DailyIntake.date >= start.isoformat(),
+            DailyIntake.date <= today.isoformat(),
+        )
+        .all()
+    )
+    by_date = {r.date: r for r in rows}
+
+    series = []
+    for i in range(days):
+        day = (start + timedelta(days=i)).isoformat()
+        row = by_date.get(day)
+        values = _values(row)
+        series.append({
+            "date": day,
+            "meal_count": row.meal_count if row else 0,
+            **values,
+            "adherence": _adherence(values, targets) if row else None,
+        })
+
+    summary = _summary(rows, len(rows), targets)
+    summary["on_target_days"] = sum(
+        1 for p in series
+        if p["adherence"] and p["adherence"]["calories"]
+        and p["adherence"]["calories"]["status"] == "ok"
+    )
+    return {"series": series, **summary}
+
+
+def _week_starts(today, count):
+    this_week = date.fromisoformat(period_starts(today)["week"])
+    return [(this_week - timedelta(weeks=i)).isoformat() for i in reversed(range(count))]
+
+
+def _month_starts(today, count):
+    year, month = today.year, today.month
+    starts = []
+    for _ in range(count):
+        starts.append(date(year, month, 1).isoformat())
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+# 최근 count 주 / 개월 (값은 기록된 날 기준 하루 평균)
+def period_trend(db: Session, user, period: str, starts, targets):
+    rows = (
+        db.query(PeriodIntake)
+        .filter(
+            PeriodIntake.user_id == user.id,
+            PeriodIntake.period == period,
+            PeriodIntake.start >= starts[0],
+        )
+        .all()
+    )
+    by_start = {r.start: r for r in rows}
+
+    series = []
+    for start in starts:
+        row = by_start.get(start)
+        values = _values(row, row.day_count if row else 0)
+        series.append({
+            "start": start,
+            "logged_days": row.day_count if row else 0,
+            "meal_count": row.meal_count if row else 0,
+            **values,
+            "adherence": _adherence(values, targets) if row and row.day_count else None,
+        })
+
+    logged = [r for r in rows if r.start in set(starts)]
+    return {"series": series, **_summary(logged, sum(r.day_count for r in logged), targets)}
+
+
+# -----------------------------
+# 일 / 주 / 월 추이
+#  - daily_intakes / period_intakes 누적 테이블만 조회 (기간 길이만큼의 행)
+#  - MealReport 는 읽지 않으므로 기록이 많아져도 응답 시간 일정
+# -----------------------------
+def build_trends(db: Session, user, today: date, days=30, weeks=12, months=6):
+    targets = user_targets(user)
+    return {
+        "date": today.isoformat(),
+        "targets": {k: round(v) if v is not None else None for k, v in targets.items()},
+        "daily": daily_trend(db, user, today, days, targets),
+        "weekly": period_trend(db, user, "week", _week_starts(today, weeks), targets),
+        "monthly": period_trend(db, user, "month", _month_starts(today, months), targets),
+    }
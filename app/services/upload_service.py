@@ -0,0 +1,121 @@
+import hashlib
+import os
+import uuid
+from typing import NamedTuple
+
+from dotenv import load_dotenv
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.services.image_preprocess import read_header
+
+load_dotenv()
+
+UPLOAD_DIR = "./app/static/uploads"
+UPLOAD_URL_PREFIX = "/static/uploads"
+CHUNK_SIZE = 256 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+
+class EmptyUploadError(Exception):
+    pass
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+class InvalidImageError(Exception):
+    pass
+
+
+class StoredUpload(NamedTuple):
+    sha256: str
+    path: str
+    url: str
+    content: memoryview   # 디코드에 그대로 넘기는 버퍼 (복사 X)
+    created: bool         # False 면 같은 이미지가 이미 저장돼 있던 것
+
+
+def _guess_ext(buf) -> str:
+    head = bytes(buf[:12])
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG"):
+        return ".png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+        return ".heic"
+    return ".bin"
+
+
+def write_atomic(path: str, buf) -> None:
+    # 같은 해시가 동시에 들어와도 임시 파일 → rename 이라 깨진 파일이 보이지 않음
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            for start in range(0, len(buf), CHUNK_SIZE):
+                f.write(buf[start:start + CHUNK_SIZE])
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _validate_and_write(path: str, buf) -> None:
+    size, _ = read_header(buf)
+    if size is None:
+        raise InvalidImageError()
+    write_atomic(path, buf)
+
+
+# 헤더는 정상이지만 디코드에 실패한 업로드 삭제 (이번 요청에서 새로 저장한 경우만)
+def discard_upload(upload: StoredUpload) -> None:
+    if upload.created:
+        try:
+            os.remove(upload.path)
+        except FileNotFoundError:
+            pass
+
+
+# -----------------------------
+# 업로드 저장 (content-addressed)
+#  - 청크 단위로 읽으면서 SHA-256 계산
+#  - 파일명은 내용 해시 → 동일 이미지는 한 번만 저장, 이름 충돌 없음
+#  - 이미지 헤더를 읽을 수 없으면 저장하지 않음 (InvalidImageError)
+#  - 헤더 확인 / 디스크 쓰기는 스레드 풀에서 (이벤트 루프 블로킹 X)
+# -----------------------------
+async def store_upload(file: UploadFile) -> StoredUpload:
+    hasher = hashlib.sha256()
+    buf = bytearray()
+
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        buf += chunk
+        if len(buf) > MAX_UPLOAD_BYTES:
+            raise UploadTooLargeError()
+
+    if not buf:
+        raise EmptyUploadError()
+
+    digest = hasher.hexdigest()
+    filename = f"{digest}{_guess_ext(buf)}"
+    path = os.path.join(UPLOAD_DIR, filename)
+
+    created = not os.path.exists(path)
+    if created:
+        await run_in_threadpool(_validate_and_write, path, buf)
+
+    return StoredUpload(
+        sha256=digest,
+        path=path,
+        url=f"{UPLOAD_URL_PREFIX}/{filename}",
+        content=memoryview(buf),
+        created=created,
+    )
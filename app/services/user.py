@@ -1,10 +1,29 @@
 from sqlalchemy.orm import Session
 from app.database.models.user import User
 from app.schemas.user import UserCreate
+from app.services.nutrition_logic import calculate_targets
+from app.services.session_user import profile_cache
 
 def get_user_by_session(db: Session, session_id: str):
     return db.query(User).filter(User.session_id == session_id).first()
 
+# 프로필 기준 권장량을 User 에 저장 (대시보드 / 분석이 같은 값을 읽음)
+def apply_targets(user: User):
+    targets = calculate_targets(
+        user.gender, user.weight, user.height, user.age, user.activity
+    )
+    targets = targets or {}
+    user.bmr = targets.get("bmr")
+    user.bmi = targets.get("bmi")
+    user.bmi_status = targets.get("bmi_status")
+    user.target_calories = targets.get("calories")
+    user.target_carbohydrates = targets.get("carbohydrates")
+    user.target_protein = targets.get("protein")
+    user.target_fat = targets.get("fat")
+    user.target_sugars = targets.get("sugars")
+    user.profile_version = (user.profile_version or 0) + 1
+    return user
+
 def create_or_update_user(db: Session, session_id: str, user_data: UserCreate):
     user = get_user_by_session(db, session_id)
     if user:
@@ -28,6 +47,9 @@ def create_or_update_user(db: Session, session_id: str, user_data: UserCreate):
         )
         db.add(user)
 
+    apply_targets(user)
     db.commit()
     db.refresh(user)
+    # 다음 요청에서 새 프로필 / 권장량을 읽도록 캐시 삭제
+    profile_cache.invalidate(session_id)
     return user
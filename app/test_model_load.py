@@ -3,6 +3,7 @@ from app.services.ai_service import FoodAIModel
 try:
     ai = FoodAIModel()
     print("!!모델 로드 성공!")
-    print("클래스 목록:", ai.model.names)
+    print("백엔드:", ai.backend.name)
+    print("클래스 목록:", ai.names)
 except Exception as e:
     print("모델 로드 실패:", e)
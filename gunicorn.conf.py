@@ -0,0 +1,86 @@
+# 멀티 워커 실행 설정
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# 테이블 생성 / 마이그레이션은 preload 여부와 관계없이 마스터 on_starting 에서 1회
+#   (워커는 DB_INIT_ON_STARTUP=false 를 물려받아 lifespan 에서 건너뜀)
+#
+# MODEL_PRELOAD=true (기본)
+#   - preload_app 으로 마스터가 앱을 import
+#   - when_ready 에서 모델 가중치를 마스터에 로딩 → fork 후 워커들이 copy-on-write 로 공유
+#   - 워밍업 / 추론 스레드 풀 / DB 커넥션은 워커마다 따로 (fork 후 생성)
+#   - onnx / onnx-int8 백엔드는 fork 전 로딩이 불가능해 워커별로 로딩됨
+# MODEL_PRELOAD=false
+#   - 워커마다 앱 import + 모델 로딩 (워커 수만큼 가중치 메모리 사용)
+#
+# 워커 수별 메모리 / 처리량: python -m app.benchmarks.multiworker
+# 워커 간 작업 조회 / 캐시 일관성: python -m app.benchmarks.multiworker_consistency --url ...
+#
+# 기본 워커 수는 코어 수 (WEB_CONCURRENCY 로 변경)
+#   워커 간에 공유되는 상태는 DB 에 있음
+#   - 비동기 분석 작업 (mode=async): analysis_jobs 테이블 → 어느 워커에서나 조회 / SSE
+#   - 대시보드 / 식사 목록 캐시: 키에 DB 의 오늘 식사 수 포함 → 다른 워커의 저장도 바로 반영
+#   워커별로 남는 것
+#   - 세션 프로필 캐시 (PROFILE_CACHE_TTL 초 동안 다른 워커의 프로필 수정이 늦게 보일 수 있음)
+#   - 검출 결과 / 응답 캐시 메모리, /metrics 수치
+
+import gc
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+preload_app = os.getenv("MODEL_PRELOAD", "true").lower() in ("1", "true", "yes")
+
+# 워커 1개당 추론 스레드 수 (기본: 코어 수 / 워커 수)
+INFERENCE_THREADS_PER_WORKER = int(
+    os.getenv("INFERENCE_THREADS_PER_WORKER", str(max(1, multiprocessing.cpu_count() // workers)))
+)
+
+
+# 마스터: 시작 직후 (워커 fork 전)
+def on_starting(server):
+    from app.database.connection import engine
+    from app.database.migrations import init_db
+
+    init_db(engine)
+    # 마이그레이션에 쓴 커넥션은 fork 전에 닫음 (워커에 소켓을 물려주지 않음)
+    engine.dispose()
+    os.environ["DB_INIT_ON_STARTUP"] = "false"
+
+
+# 마스터: 앱 preload 이후, 워커 fork 직전
+def when_ready(server):
+    if not preload_app:
+        return
+    from app.services.model_manager import model_manager
+
+    model_manager.preload()
+    # 지금까지 만든 객체를 GC 추적에서 제외
+    #   (워커에서 GC 가 객체 헤더를 건드리면 공유 페이지가 복사됨)
+    gc.freeze()
+
+
+# 워커: fork 직후
+def post_fork(server, worker):
+    # 이후 torch 를 import 하는 경우 (preload 안 함) 에도 같은 스레드 수 적용
+    os.environ.setdefault("OMP_NUM_THREADS", str(INFERENCE_THREADS_PER_WORKER))
+
+    from app.database.connection import engine
+
+    # 마스터에서 열린 커넥션이 남아 있어도 닫지 않고 버림 (마스터 소유 소켓)
+    engine.dispose(close=False)
+    if not preload_app:
+        return
+
+    from app.services.model_manager import model_manager
+
+    model_manager.set_threads(INFERENCE_THREADS_PER_WORKER)
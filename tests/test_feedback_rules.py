@@ -0,0 +1,249 @@
+# 피드백 규칙표 골든 테스트
+#   python -m pytest -q tests/test_feedback_rules.py   (저장소 루트에서 실행, feedback.json 상대 경로)
+#
+# 규칙표(feedback_rules) 로 바꾸기 전 if/elif 구현을 아래에 그대로 두고,
+# 경계값 / 랜덤 입력 전체에서 문구가 글자 단위로 같은지 확인한다.
+
+import itertools
+import math
+import random
+
+import pytest
+
+from app.services.feedback_loader import feedback_catalog
+from app.services.nutrition_logic import (
+    format_substitutes, generate_coach_text, recommend_by_detail, recommend_exercise
+)
+from app.services.feedback_rules import top_deviations
+
+NUTRIENTS = ["calories", "carbohydrates", "protein", "fat", "sugars"]
+ACTIVITIES = ["sedentary", "low-active", "active", "very-active", None]
+MEAL_TIMES = ["breakfast", "lunch", "dinner"]
+RANDOM_CASES = 5000
+
+
+# ---------------------------------------------------
+# 변경 전 구현 (기준값)
+# ---------------------------------------------------
+def legacy_recommend_exercise(diff_cal, activity):
+    activity_bonus = {
+        "sedentary": -50,
+        "low-active": 0,
+        "active": 50,
+        "very-active": 100
+    }
+    adj = diff_cal - activity_bonus.get(activity, 0)
+
+    # 과다 섭취
+    if adj > 500:
+        if activity in ["sedentary", "low-active"]:
+            return "칼로리 섭취가 많이 높아요! 40–50분 빠르게 걷기 또는 가벼운 조깅을 추천해요."
+        else:
+            return "칼로리가 많이 높아요! 30–40분 러닝이나 인터벌 걷기를 추천해요."
+
+    if adj > 250:
+        if activity == "sedentary":
+            return "칼로리가 조금 높아요. 25–30분 빠르게 걷기만 해줘도 충분해요."
+        elif activity == "low-active":
+            return "20–25분 가벼운 조깅이나 빠른 걷기를 추천해요."
+        else:
+            return "20–30분 조깅 또는 사이클을 추천해요."
+
+    # 정상 범위
+    if -200 <= adj <= 200:
+        if activity == "sedentary":
+            return "칼로리는 적절해요! 15–20분 산책 정도면 충분해요."
+        else:
+            return "칼로리는 적절해요! 20–30분 가벼운 유산소를 추천해요."
+
+    # 부족
+    if adj < -500:
+        return "칼로리가 많이 부족한 날이에요. 피로 누적될 수 있어 운동은 최소화하고 스트레칭 정도만 해주세요."
+
+    if adj < -250:
+        return "칼로리가 조금 부족해요. 무리한 운동은 피하고 10–15분 가벼운 산책만 추천해요."
+
+    return "칼로리 차이가 크지 않아 특별한 조정은 필요 없어요. 15–20분 가벼운 활동이면 충분해요."
+
+
+def legacy_generate_coach_text(diff_pct_map, bmi, bmi_status, exercise_text):
+    text = []
+    text.append("오늘의 식단 리포트")
+
+    # 퍼센트 절대값 기준 top2 추출
+    sorted_items = sorted(diff_pct_map.items(), key=lambda x: abs(x[1]), reverse=True)
+    top2 = sorted_items[:2]
+
+    for nutrient, pct in top2:
+        rounded = round(pct, 1)
+
+        if nutrient == "protein":
+            if pct < -10:
+                text.append(f"단백질이 권장량 대비 {abs(rounded)}% 부족해요.")
+            elif pct > 10:
+                text.append(f"단백질이 권장량 대비 {rounded}% 많아요.")
+
+        elif nutrient == "carbohydrates":
+            if pct < -10:
+                text.append(f"탄수화물이 권장량 대비 {abs(rounded)}% 부족해요.")
+            elif pct > 10:
+                text.append(f"탄수화물이 권장량 대비 {rounded}% 많아요.")
+
+        elif nutrient == "fat":
+            if pct < -10:
+                text.append(f"지방이 권장량 대비 {abs(rounded)}% 부족해요.")
+            elif pct > 10:
+                text.append(f"지방이 권장량 대비 {rounded}% 많아요.")
+
+        elif nutrient == "sugars":
+            if pct < -10:
+                text.append(f"당류가 권장량 대비 {abs(rounded)}% 부족해요.")
+            elif pct > 10:
+                text.append(f"당류가 권장량 대비 {rounded}% 많아요.")
+
+    # BMI 정보는 간단한 문장만
+    text.append(f"\n BMI는 {round(bmi,1)}로 '{bmi_status}' 범주예요. \n")
+
+    # 운동 문구
+    text.append(exercise_text)
+
+    return " ".join(text)
+
+
+def legacy_format_substitutes(diff_pct_map, subs):
+    lines = ["대체식 추천:"]
+
+    # 퍼센트 절대값 기준 top2
+    sorted_items = sorted(diff_pct_map.items(), key=lambda x: abs(x[1]), reverse=True)
+    top2 = sorted_items[:2]
+
+    count = 0
+    for nutrient, pct in top2:
+        if nutrient not in subs:
+            continue
+
+        if nutrient == "protein":
+            label = "단백질 보충" if pct < 0 else "단백질 줄이기"
+        elif nutrient == "carbohydrates":
+            label = "탄수화물 보충" if pct < 0 else "탄수화물 줄이기"
+        elif nutrient == "fat":
+            label = "지방 보충" if pct < 0 else "지방 줄이기"
+        elif nutrient == "sugars":
+            label = "당류 보충" if pct < 0 else "당류 줄이기"
+
+        lines.append(f"{label}: {', '.join(subs[nutrient])}\n")
+        count += 1
+
+        if count == 2:
+            break
+
+    if count == 0:
+        lines.append("대체식 추천이 필요할 만큼 큰 편차는 없어요!")
+
+    return "".join(lines)
+
+
+def legacy_recommend_by_detail(diff_g, recommendation_detail, meal_time):
+    recommendations = {}
+
+    for nutrient, g_value in diff_g.items():
+        level = None
+        if nutrient == "protein":
+            if g_value < -10: level = "low_mild"
+            if g_value > 10: level = "high"
+        if nutrient == "carbohydrates":
+            if g_value < -20: level = "low_mild"
+            if g_value > 20: level = "high"
+        if nutrient == "fat":
+            if g_value < -5: level = "low_mild"
+            if g_value > 7: level = "high"
+        if nutrient == "sugars":
+            if g_value < -5: level = "low_mild"
+            if g_value > 10: level = "high"
+
+        if not level:
+            continue
+
+        if nutrient not in recommendation_detail:
+            continue
+
+        sets = recommendation_detail[nutrient].get(level, {})
+        if meal_time in sets:
+            recommendations[nutrient] = sets[meal_time][:2]
+        elif "all" in sets:
+            recommendations[nutrient] = sets["all"][:2]
+
+    return recommendations
+
+
+# ---------------------------------------------------
+# 입력 생성
+# ---------------------------------------------------
+def _edge_values(bounds):
+    values = set()
+    for b in bounds:
+        values.update((b - 0.05, b, b + 0.05))
+    return sorted(values)
+
+
+def cases():
+    rng = random.Random(0)
+    pct_edges = _edge_values([-10, 10, 0]) + [float("inf"), -100.0]
+    g_edges = _edge_values([-20, -10, -5, 5, 7, 10, 20])
+    cal_edges = _edge_values([-500, -250, -200, 200, 250, 500]) + [-550, 50, 600]
+
+    # 경계값 조합
+    for pct, g, cal in itertools.product(pct_edges, g_edges, cal_edges):
+        for activity in ACTIVITIES:
+            diff_pct_map = {n: pct * (i + 1) / 3 for i, n in enumerate(NUTRIENTS)}
+            diff_g = {n: g for n in NUTRIENTS}
+            diff_g["calories"] = cal
+            yield diff_pct_map, diff_g, activity, MEAL_TIMES[int(abs(cal)) % 3]
+
+    # 랜덤 (동점 포함)
+    for _ in range(RANDOM_CASES):
+        diff_pct_map = {n: round(rng.uniform(-80, 80), rng.choice([0, 1, 3])) for n in NUTRIENTS}
+        diff_g = {n: rng.uniform(-40, 40) for n in NUTRIENTS}
+        diff_g["calories"] = rng.uniform(-900, 900)
+        yield diff_pct_map, diff_g, rng.choice(ACTIVITIES), rng.choice(MEAL_TIMES)
+
+
+def legacy_feedback(diff_pct_map, diff_g, activity, meal_time):
+    exercise = legacy_recommend_exercise(diff_g["calories"], activity)
+    subs = legacy_recommend_by_detail(diff_g, feedback_catalog.data, meal_time)
+    return (
+        legacy_generate_coach_text(diff_pct_map, 22.4, "정상", exercise)
+        + "\n" + legacy_format_substitutes(diff_pct_map, subs)
+    )
+
+
+def new_feedback(diff_pct_map, diff_g, activity, meal_time):
+    exercise = recommend_exercise(diff_g["calories"], activity)
+    top = top_deviations(diff_pct_map)
+    subs = recommend_by_detail(diff_g, feedback_catalog, meal_time)
+    return (
+        generate_coach_text(diff_pct_map, 22.4, "정상", exercise, top=top)
+        + "\n" + format_substitutes(diff_pct_map, subs, top=top)
+    )
+
+
+def test_feedback_matches_legacy():
+    checked = 0
+    for args in cases():
+        diff_pct_map, diff_g, activity, meal_time = args
+        old = legacy_feedback(*args)
+        assert new_feedback(*args) == old, args
+        # 기본 인자(top=None) 경로도 같은 결과
+        wrapped = (
+            generate_coach_text(diff_pct_map, 22.4, "정상", recommend_exercise(diff_g["calories"], activity))
+            + "\n" + format_substitutes(diff_pct_map, recommend_by_detail(diff_g, feedback_catalog, meal_time))
+        )
+        assert wrapped == old, args
+        checked += 1
+    assert checked > RANDOM_CASES
+
+
+@pytest.mark.parametrize("activity", ACTIVITIES)
+def test_exercise_boundaries_match_legacy(activity):
+    for diff_cal in _edge_values([-550, -500, -250, -200, 200, 250, 500]) + [math.nan, math.inf, -math.inf]:
+        assert recommend_exercise(diff_cal, activity) == legacy_recommend_exercise(diff_cal, activity), diff_cal